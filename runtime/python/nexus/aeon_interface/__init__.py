@@ -1 +1,29 @@
-# AEON Interface files will be here
+"""
+NEXUS v2 - AEON Interface
+Status, probes and commands over the daemon's control socket.
+
+Standard library only, so probes start without importing the daemon.
+"""
+
+from .client import NexusClient, AsyncNexusClient, NexusError, init_interfaces, get_client
+from .status import StatusInterface, get_status, watch_status
+from .live import LivenessProbe, check_liveness, check_readiness, check_critical_modules
+from .command import CommandInterface, execute_command, execute_batch
+
+__all__ = [
+    "NexusClient",
+    "AsyncNexusClient",
+    "NexusError",
+    "init_interfaces",
+    "get_client",
+    "StatusInterface",
+    "get_status",
+    "watch_status",
+    "LivenessProbe",
+    "check_liveness",
+    "check_readiness",
+    "check_critical_modules",
+    "CommandInterface",
+    "execute_command",
+    "execute_batch",
+]
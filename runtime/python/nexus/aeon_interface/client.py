@@ -0,0 +1,354 @@
+"""
+NEXUS v2 - AEON Control Client
+Addresses Review: Probes spawned a Python process importing the whole package
+
+Two clients for the daemon's control socket, both keeping one connection
+open across calls:
+
+- NexusClient: blocking, for CLIs and scripts
+- AsyncNexusClient: asyncio, pipelines concurrent calls on one connection
+
+Both can also follow stream ops such as "subscribe", which answer one
+request with a series of events.
+
+Standard library only (see protocol.py).
+"""
+
+import asyncio
+import itertools
+import threading
+import weakref
+
+try:
+    from . import protocol
+except ImportError:  # run as a script from the interface directory
+    import protocol
+
+
+class NexusError(Exception):
+    """Error returned by the daemon for a request"""
+    
+    def __init__(self, message, error_type=None):
+        super().__init__(message)
+        self.error_type = error_type
+
+
+def _result(response):
+    if response.get("ok"):
+        return response.get("result")
+    raise NexusError(response.get("error", "unknown error"), response.get("type"))
+
+
+class NexusClient:
+    """
+    Blocking control-socket client.
+    
+    The connection is opened lazily and reused; a call on a connection
+    the daemon has closed reconnects once before failing.
+    """
+    
+    def __init__(self, path=None, timeout=5.0):
+        self.path = protocol.socket_path(path)
+        self.timeout = timeout
+        self._sock = None
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+    
+    def call(self, op, params=None, timeout=None):
+        """
+        Send one request and wait for its response, up to timeout seconds
+        (default: the client's timeout).
+        
+        Raises:
+            NexusError: The daemon rejected or failed the request
+            OSError: The daemon is not reachable
+        """
+        with self._lock:
+            for attempt in (0, 1):
+                fresh = self._sock is None
+                try:
+                    sock = self._connect()
+                    sock.settimeout(timeout or self.timeout)
+                    request_id = next(self._ids)
+                    sock.sendall(protocol.encode({"id": request_id, "op": op, "params": params or {}}))
+                    response = protocol.recv_frame(sock)
+                    if response is None:
+                        raise ConnectionError("Connection closed by daemon")
+                    return _result(response)
+                except OSError as e:
+                    # A stale connection gets one reconnect; timeouts and
+                    # failures on a fresh connection are final
+                    self.close()
+                    if fresh or attempt or not isinstance(e, ConnectionError):
+                        raise
+    
+    def stream(self, op="subscribe", params=None):
+        """
+        Follow a stream op on a dedicated connection, yielding its events.
+        
+        Closing the generator closes the connection, which ends the
+        stream on the daemon.
+        
+        Raises:
+            NexusError: The daemon rejected or failed the stream
+            OSError: The daemon is not reachable or hung up
+        """
+        sock = protocol.connect(self.path, self.timeout)
+        try:
+            sock.sendall(protocol.encode({"id": 1, "op": op, "params": params or {}}))
+            # Events arrive only on change - an idle stream is not a timeout
+            sock.settimeout(None)
+            while True:
+                message = protocol.recv_frame(sock)
+                if message is None:
+                    raise ConnectionError("Connection closed by daemon")
+                if "event" in message:
+                    yield message["event"]
+                    continue
+                _result(message)
+                return
+        finally:
+            sock.close()
+    
+    def close(self):
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            finally:
+                self._sock = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
+    def _connect(self):
+        if self._sock is None:
+            self._sock = protocol.connect(self.path, self.timeout)
+        return self._sock
+
+
+class AsyncNexusClient:
+    """
+    asyncio control-socket client with request pipelining.
+    
+    Concurrent call()s share one connection: each request is written as
+    soon as it is made and a reader task resolves responses by id, in
+    whatever order the daemon completes them.
+    """
+    
+    def __init__(self, path=None, timeout=5.0):
+        self.path = protocol.socket_path(path)
+        self.timeout = timeout
+        self._reader = None
+        self._writer = None
+        self._reader_task = None
+        self._pending = {}
+        self._streams = {}
+        self._ids = itertools.count(1)
+        self._connect_lock = None
+    
+    async def call(self, op, params=None, timeout=None):
+        """
+        Send one request and await its response.
+        
+        Raises:
+            NexusError: The daemon rejected or failed the request
+            OSError: The daemon is not reachable
+            asyncio.TimeoutError: No response within timeout
+        """
+        await self._ensure_connected()
+        
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        
+        try:
+            self._writer.write(protocol.encode({"id": request_id, "op": op, "params": params or {}}))
+            await self._writer.drain()
+            response = await asyncio.wait_for(future, timeout or self.timeout)
+        finally:
+            self._pending.pop(request_id, None)
+        
+        return _result(response)
+    
+    async def subscribe(self, op="subscribe", params=None):
+        """
+        Follow a stream op, yielding its events.
+        
+        The stream shares the connection with concurrent calls. Leaving
+        the loop early sends a cancel so the daemon stops the stream.
+        
+        Raises:
+            NexusError: The daemon rejected or failed the stream
+            ConnectionError: The connection dropped mid-stream
+        """
+        await self._ensure_connected()
+        
+        request_id = next(self._ids)
+        queue = asyncio.Queue()
+        self._streams[request_id] = queue
+        finished = False
+        
+        try:
+            self._writer.write(protocol.encode({"id": request_id, "op": op, "params": params or {}}))
+            await self._writer.drain()
+            
+            while True:
+                message = await queue.get()
+                if isinstance(message, Exception):
+                    finished = True
+                    raise message
+                if "event" in message:
+                    yield message["event"]
+                    continue
+                finished = True
+                _result(message)
+                return
+        finally:
+            self._streams.pop(request_id, None)
+            if not finished and self.connected:
+                self._writer.write(protocol.encode(
+                    {"id": next(self._ids), "op": "cancel", "params": {"id": request_id}}
+                ))
+    
+    async def close(self):
+        if self._reader_task:
+            self._reader_task.cancel()
+            try:
+                await self._reader_task
+            except asyncio.CancelledError:
+                pass
+            self._reader_task = None
+        
+        if self._writer:
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except Exception:
+                pass
+            self._writer = None
+        
+        self._fail_pending(ConnectionError("Client closed"))
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+    
+    @property
+    def connected(self):
+        return self._writer is not None and not self._writer.is_closing()
+    
+    async def _ensure_connected(self):
+        if self.connected:
+            return
+        
+        if self._connect_lock is None:
+            self._connect_lock = asyncio.Lock()
+        
+        async with self._connect_lock:
+            if self.connected:
+                return
+            
+            self._reader, self._writer = await asyncio.wait_for(
+                asyncio.open_unix_connection(self.path), self.timeout
+            )
+            self._reader_task = asyncio.create_task(self._read_loop())
+    
+    async def _read_loop(self):
+        try:
+            while True:
+                message = await protocol.read_frame(self._reader)
+                if message is None:
+                    break
+                self._dispatch(message)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self._fail_pending(e)
+        finally:
+            if self._writer:
+                self._writer.close()
+                self._writer = None
+            self._fail_pending(ConnectionError("Connection closed by daemon"))
+    
+    def _dispatch(self, message):
+        queue = self._streams.get(message.get("id"))
+        if queue is not None:
+            queue.put_nowait(message)
+            return
+        
+        future = self._pending.get(message.get("id"))
+        if future is not None and not future.done():
+            future.set_result(message)
+    
+    def _fail_pending(self, error):
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(error)
+        self._pending.clear()
+        
+        for queue in self._streams.values():
+            queue.put_nowait(error)
+        self._streams.clear()
+
+
+class LocalClient:
+    """Same call() interface, dispatching straight into an in-process daemon"""
+    
+    def __init__(self, daemon):
+        self.daemon = daemon
+    
+    async def call(self, op, params=None, timeout=None):
+        try:
+            return await self.daemon.control.dispatch(op, params or {})
+        except NexusError:
+            raise
+        except Exception as e:
+            raise NexusError(str(e), type(e).__name__)
+    
+    async def subscribe(self, op="subscribe", params=None):
+        stream = self.daemon.control.stream(op, params or {})
+        try:
+            async for event in stream:
+                yield event
+        finally:
+            await stream.aclose()
+    
+    async def close(self):
+        pass
+
+
+_local_daemon = None
+_clients = weakref.WeakKeyDictionary()
+
+
+def init_interfaces(daemon):
+    """
+    Serve the interface functions from an in-process daemon instead of
+    the control socket (for code running inside the NEXUS process).
+    """
+    global _local_daemon
+    _local_daemon = daemon
+
+
+def get_client(path=None):
+    """
+    Shared client for the running event loop.
+    
+    In-process daemons (init_interfaces) are called directly; otherwise
+    one AsyncNexusClient per loop keeps its connection across calls.
+    """
+    if _local_daemon is not None:
+        return LocalClient(_local_daemon)
+    
+    loop = asyncio.get_running_loop()
+    clients = _clients.setdefault(loop, {})
+    key = protocol.socket_path(path)
+    client = clients.get(key)
+    if client is None:
+        client = clients[key] = AsyncNexusClient(key)
+    return client
@@ -1 +1,141 @@
-# Command interface
+"""
+NEXUS v2 - AEON Command Interface
+
+    result = await execute_command("reload_module", {
+        "module_id": "vitals/heartbeat-client",
+        "strategy": "graceful"
+    })
+    # {"success": true, "result": {...}}
+
+    # Many commands in one request, ordered by the daemon against the
+    # dependency graph (independent commands run concurrently)
+    result = await execute_batch([
+        {"op": "configure", "params": {"module_id": "a/x", "key": "k", "value": 1}},
+        {"op": "reload_module", "params": {"module_id": "a/x"}},
+        {"op": "stop_module", "params": {"module_id": "b/y"}},
+    ])
+    # {"success": false, "results": [{"op", "success", ...}, ...], "succeeded": 2, "failed": 1}
+
+CLI:
+
+    python command.py reload_module '{"module_id": "vitals/heartbeat-client"}'
+    python command.py batch '[{"op": "stop_module", "params": {...}}, ...]'
+"""
+
+import asyncio
+
+try:
+    from .client import NexusClient, NexusError, get_client
+except ImportError:  # run as a script from the interface directory
+    from client import NexusClient, NexusError, get_client
+
+
+DEFAULT_TIMEOUT = 5.0
+# The daemon stops a module with a 30s timeout; reload and start may also
+# spawn a worker process (worker_timeout_s, 60s by default)
+STOP_TIMEOUT = 30.0
+LIFECYCLE_TIMEOUT = 120.0
+
+
+def command_timeout(command_type, params=None):
+    """
+    How long to wait for the daemon's answer to one command. Lifecycle
+    commands outlast the default; a batch gets the sum of its commands,
+    since they may run one after another.
+    """
+    params = params or {}
+    if command_type == "batch":
+        commands = params.get("commands") or []
+        timeouts = [command_timeout(c.get("op"), c.get("params")) for c in commands if isinstance(c, dict)]
+        return sum(timeouts) or DEFAULT_TIMEOUT
+    if command_type == "stop_module":
+        return float(params.get("timeout", STOP_TIMEOUT)) + DEFAULT_TIMEOUT
+    if command_type in ("reload_module", "start_module"):
+        return LIFECYCLE_TIMEOUT
+    return DEFAULT_TIMEOUT
+
+
+def _unreachable(error):
+    if isinstance(error, asyncio.TimeoutError):
+        return {"success": False, "error": "Daemon did not answer in time"}
+    return {"success": False, "error": f"Daemon not reachable: {error}"}
+
+
+class CommandInterface:
+    """Command execution against one daemon"""
+
+    def __init__(self, client=None):
+        self._client = client
+
+    @property
+    def client(self):
+        return self._client or get_client()
+
+    async def execute_command(self, command_type, params=None):
+        """Run one command; failures are reported, not raised"""
+        try:
+            result = await self.client.call(command_type, params or {}, timeout=command_timeout(command_type, params))
+        except NexusError as e:
+            return {"success": False, "error": str(e), "error_type": e.error_type}
+        except (OSError, asyncio.TimeoutError) as e:
+            return _unreachable(e)
+        return {"success": True, "result": result}
+
+    async def execute_batch(self, commands):
+        """
+        Run a list of {"op", "params"} commands in one request.
+
+        success is True only if every command succeeded; results holds
+        one entry per command, in order. Commands that depend on a failed
+        command are skipped (skipped: true).
+        """
+        params = {"commands": list(commands)}
+        try:
+            result = await self.client.call("batch", params, timeout=command_timeout("batch", params))
+        except NexusError as e:
+            return {"success": False, "error": str(e), "error_type": e.error_type}
+        except (OSError, asyncio.TimeoutError) as e:
+            return _unreachable(e)
+        return {"success": result["failed"] == 0, **result}
+
+
+async def execute_command(command_type, params=None):
+    return await CommandInterface().execute_command(command_type, params)
+
+
+async def execute_batch(commands):
+    return await CommandInterface().execute_batch(commands)
+
+
+def main(argv=None):
+    import json
+    import sys
+
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        print("usage: command.py <command> ['<json params>']", file=sys.stderr)
+        return 2
+
+    params = json.loads(argv[1]) if len(argv) > 1 else {}
+    if argv[0] == "batch" and isinstance(params, list):
+        params = {"commands": params}
+
+    try:
+        with NexusClient() as client:
+            result = {"success": True, "result": client.call(argv[0], params, timeout=command_timeout(argv[0], params))}
+            if argv[0] == "batch":
+                result = {"success": result["result"]["failed"] == 0, **result["result"]}
+    except NexusError as e:
+        result = {"success": False, "error": str(e), "error_type": e.error_type}
+    except OSError as e:
+        result = _unreachable(e)
+
+    if argv[0] == "get_metrics" and result["success"]:
+        print(result["result"])
+    else:
+        print(json.dumps(result, indent=2, default=str))
+    return 0 if result["success"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1 +1,98 @@
-# Live interface
+"""
+NEXUS v2 - AEON Liveness/Readiness Probes
+
+    result = await check_liveness()
+    result = await check_readiness()
+
+CLI (exit code 0 = ok, 1 = failed):
+
+    python live.py liveness|readiness|critical
+
+Liveness reads the daemon's memory-mapped stamp (stamp.py) and never
+touches the socket; the socket client is only imported for readiness.
+"""
+
+try:
+    from . import stamp
+except ImportError:  # run as a script from the interface directory
+    import stamp
+
+
+def _client_module():
+    try:
+        from . import client
+    except ImportError:
+        import client
+    return client
+
+
+class LivenessProbe:
+    """Probe calls against one daemon"""
+
+    def __init__(self, client=None, stamp_path=None):
+        self._client = client
+        self.stamp_path = stamp_path
+
+    @property
+    def client(self):
+        return self._client or _client_module().get_client()
+
+    async def check_liveness(self):
+        """Liveness from the stamp file - no round trip to the daemon"""
+        return stamp.check_liveness(self.stamp_path)
+
+    async def check_readiness(self):
+        return await self.client.call("check_readiness")
+
+    async def check_critical_modules(self):
+        return await self.client.call("check_critical_modules")
+
+
+async def check_liveness():
+    return await LivenessProbe().check_liveness()
+
+
+async def check_readiness():
+    return await LivenessProbe().check_readiness()
+
+
+async def check_critical_modules():
+    return await LivenessProbe().check_critical_modules()
+
+
+_PROBES = {
+    "readiness": ("check_readiness", "ready"),
+    "critical": ("check_critical_modules", "ready"),
+}
+
+
+def main(argv=None):
+    import json
+    import sys
+
+    argv = sys.argv[1:] if argv is None else argv
+    probe = argv[0] if argv else "liveness"
+
+    if probe == "liveness":
+        result = stamp.check_liveness()
+        print(json.dumps(result))
+        return 0 if result["live"] else 1
+
+    if probe not in _PROBES:
+        print("usage: live.py [liveness|readiness|critical]", file=sys.stderr)
+        return 2
+
+    op, key = _PROBES[probe]
+    try:
+        with _client_module().NexusClient(timeout=2.0) as client:
+            result = client.call(op)
+    except Exception as e:
+        print(json.dumps({key: False, "error": str(e)}))
+        return 1
+
+    print(json.dumps(result))
+    return 0 if result.get(key) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,115 @@
+"""
+NEXUS v2 - AEON Control Protocol
+Addresses Review: aeon_interface had no transport to the daemon
+
+Frames on the control socket are a 4-byte big-endian length followed by
+a UTF-8 JSON object:
+    
+    request:   {"id": 7, "op": "get_status", "params": {...}}
+    response:  {"id": 7, "ok": true, "result": {...}}
+               {"id": 7, "ok": false, "error": "...", "type": "ValueError"}
+
+Requests carry an id so a client can pipeline several on one connection
+and match responses as they complete.
+
+Standard library only - this file is imported by the probe CLIs, which
+must start without loading the nexus package.
+"""
+
+import json
+import os
+import socket
+import struct
+
+HEADER = struct.Struct(">I")
+MAX_FRAME = 16 * 1024 * 1024
+
+SOCKET_ENV = "NEXUS_CONTROL_SOCKET"
+DEFAULT_SOCKET_PATH = "~/.nexus/nexus.sock"
+
+
+class ProtocolError(Exception):
+    """Malformed or oversized frame"""
+
+
+def socket_path(path=None):
+    """Control socket path: explicit, $NEXUS_CONTROL_SOCKET, or the default"""
+    return os.path.expanduser(path or os.environ.get(SOCKET_ENV) or DEFAULT_SOCKET_PATH)
+
+
+def encode(message):
+    """Serialize one message into a frame"""
+    payload = json.dumps(message, separators=(",", ":"), default=str).encode("utf-8")
+    if len(payload) > MAX_FRAME:
+        raise ProtocolError(f"Frame too large: {len(payload)} bytes")
+    return HEADER.pack(len(payload)) + payload
+
+
+def decode(payload):
+    """Parse a frame payload"""
+    try:
+        message = json.loads(payload)
+    except ValueError as e:
+        raise ProtocolError(f"Invalid frame: {e}")
+    if not isinstance(message, dict):
+        raise ProtocolError("Frame is not a JSON object")
+    return message
+
+
+async def read_frame(reader):
+    """
+    Read one message from an asyncio StreamReader.
+    
+    Returns None on a clean EOF between frames.
+    """
+    try:
+        header = await reader.readexactly(HEADER.size)
+    except Exception as e:
+        if getattr(e, "partial", None) == b"":
+            return None
+        raise
+    
+    (length,) = HEADER.unpack(header)
+    if length > MAX_FRAME:
+        raise ProtocolError(f"Frame too large: {length} bytes")
+    return decode(await reader.readexactly(length))
+
+
+def recv_frame(sock):
+    """Read one message from a blocking socket (None on EOF)"""
+    header = _recv_exactly(sock, HEADER.size)
+    if header is None:
+        return None
+    
+    (length,) = HEADER.unpack(header)
+    if length > MAX_FRAME:
+        raise ProtocolError(f"Frame too large: {length} bytes")
+    
+    payload = _recv_exactly(sock, length)
+    if payload is None:
+        raise ConnectionError("Connection closed mid-frame")
+    return decode(payload)
+
+
+def connect(path=None, timeout=5.0):
+    """Open a blocking connection to the control socket"""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(socket_path(path))
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+def _recv_exactly(sock, n):
+    buf = bytearray()
+    while len(buf) < n:
+        chunk = sock.recv(n - len(buf))
+        if not chunk:
+            if buf:
+                raise ConnectionError("Connection closed mid-frame")
+            return None
+        buf += chunk
+    return bytes(buf)
@@ -0,0 +1,126 @@
+"""
+NEXUS v2 - Liveness Stamp
+Addresses Review: A liveness probe had to import the whole package
+
+The daemon keeps a small memory-mapped file updated from its event loop.
+Probes read it with one open()/read() - no socket, no daemon round trip,
+and nothing imported beyond os/struct/time - so a stale stamp means the
+loop (or the process) is stuck.
+
+Layout (little endian, 64 bytes):
+    
+    magic "NXLV" | seq u32 | pid u64 | state u32 | pad u32 |
+    stamp f64 (time.time) | interval f64 | started f64
+
+seq is a seqlock: odd while the daemon is writing, and bumped to the
+next even value only after the fields are written. Readers read seq,
+then the fields, then seq again, and retry unless both reads returned
+the same even value.
+"""
+
+import os
+import struct
+import time
+
+LAYOUT = struct.Struct("<4sIQIIddd")
+SIZE = 64
+MAGIC = b"NXLV"
+
+STATE_STOPPED = 0
+STATE_STARTING = 1
+STATE_RUNNING = 2
+
+STAMP_ENV = "NEXUS_LIVENESS_FILE"
+DEFAULT_STAMP_PATH = "~/.nexus/nexus.live"
+
+
+def stamp_path(path=None):
+    """Stamp file path: explicit, $NEXUS_LIVENESS_FILE, or the default"""
+    return os.path.expanduser(path or os.environ.get(STAMP_ENV) or DEFAULT_STAMP_PATH)
+
+
+def read_stamp(path=None, retries=5):
+    """
+    Read the raw stamp.
+    
+    Returns:
+        dict with pid, state, stamp, interval, started - or None if the
+        file is missing, foreign or mid-write on every retry
+    """
+    try:
+        # Unbuffered, so every read sees the file as it is now
+        with open(stamp_path(path), "rb", buffering=0) as f:
+            for _ in range(retries):
+                before = _read_seq(f)
+                if before is None:
+                    return None
+                if before & 1:
+                    continue
+                
+                data = f.read(LAYOUT.size)
+                if len(data) < LAYOUT.size:
+                    return None
+                magic, seq, pid, state, _, stamp, interval, started = LAYOUT.unpack(data)
+                if magic != MAGIC:
+                    return None
+                if seq != before or _read_seq(f) != before:
+                    continue
+                
+                return {
+                    "pid": pid,
+                    "state": state,
+                    "stamp": stamp,
+                    "interval": interval,
+                    "started": started,
+                }
+    except OSError:
+        return None
+    return None
+
+
+def _read_seq(f):
+    """seq at offset 4, leaving the file at offset 0"""
+    f.seek(4)
+    data = f.read(4)
+    f.seek(0)
+    if len(data) < 4:
+        return None
+    return struct.unpack("<I", data)[0]
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def check_liveness(path=None, max_age=None):
+    """
+    Liveness from the stamp, in the spec's response format.
+    
+    Alive means: the owning process exists and its loop refreshed the
+    stamp within max_age (default: three stamp intervals).
+    """
+    stamp = read_stamp(path)
+    now = time.time()
+    
+    if stamp is None:
+        return {"live": False, "timestamp": now, "daemon_running": False, "error": "no liveness stamp"}
+    
+    if max_age is None:
+        max_age = 3 * stamp["interval"]
+    
+    age = now - stamp["stamp"]
+    running = stamp["state"] != STATE_STOPPED and _pid_alive(stamp["pid"])
+    
+    return {
+        "live": running and age <= max_age,
+        "timestamp": stamp["stamp"],
+        "daemon_running": running and stamp["state"] == STATE_RUNNING,
+        "age_seconds": round(age, 6),
+        "pid": stamp["pid"],
+    }
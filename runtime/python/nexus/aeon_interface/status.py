@@ -1 +1,104 @@
-# Status interface
+"""
+NEXUS v2 - AEON Status Interface
+Read-only daemon and module status over the control socket.
+
+    from aeon.interfaces.python.nexus import get_status
+
+    status = await get_status()
+    module = await get_status("vitals/heartbeat-client")
+
+    async for update in watch_status(interval=1.0):
+        ...  # snapshot first, then delta batches
+"""
+
+try:
+    from .client import NexusClient, get_client
+except ImportError:  # run as a script from the interface directory
+    from client import NexusClient, get_client
+
+
+class StatusInterface:
+    """Status queries against one daemon"""
+
+    def __init__(self, client=None):
+        self._client = client
+
+    @property
+    def client(self):
+        return self._client or get_client()
+
+    async def get_status(self, max_age=None):
+        """Full daemon status (health served from cache up to max_age)"""
+        params = {} if max_age is None else {"max_age": max_age}
+        return await self.client.call("get_status", params)
+
+    async def get_module_status(self, module_id, max_age=None):
+        """Status of one module"""
+        params = {"module_id": module_id}
+        if max_age is not None:
+            params["max_age"] = max_age
+        return await self.client.call("get_status", params)
+
+    async def watch(self, metrics=True, interval=0.0):
+        """
+        Follow status changes: one snapshot, then delta batches.
+
+        Args:
+            metrics: Include metric changes
+            interval: Minimum seconds between batches; changes in
+                between are coalesced to their latest value
+        """
+        params = {"metrics": metrics, "interval": interval}
+        async for update in self.client.subscribe("subscribe", params):
+            yield update
+
+
+async def get_status(module_id=None, max_age=None):
+    """Daemon status, or one module's status when module_id is given"""
+    status = StatusInterface()
+    if module_id:
+        return await status.get_module_status(module_id, max_age)
+    return await status.get_status(max_age)
+
+
+async def watch_status(metrics=True, interval=0.0):
+    """Follow daemon status changes (see StatusInterface.watch)"""
+    async for update in StatusInterface().watch(metrics, interval):
+        yield update
+
+
+def main(argv=None):
+    import json
+    import sys
+
+    argv = sys.argv[1:] if argv is None else argv
+
+    if argv and argv[0] == "--watch":
+        # One JSON line per update until interrupted
+        interval = float(argv[1]) if len(argv) > 1 else 1.0
+        try:
+            with NexusClient() as client:
+                for update in client.stream("subscribe", {"interval": interval}):
+                    print(json.dumps(update, default=str), flush=True)
+        except KeyboardInterrupt:
+            return 0
+        except Exception as e:
+            print(json.dumps({"error": str(e)}))
+            return 1
+        return 0
+
+    params = {"module_id": argv[0]} if argv else {}
+
+    try:
+        with NexusClient() as client:
+            result = client.call("get_status", params)
+    except Exception as e:
+        print(json.dumps({"error": str(e)}))
+        return 1
+
+    print(json.dumps(result, indent=2, default=str))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
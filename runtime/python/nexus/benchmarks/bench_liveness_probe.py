@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+NEXUS v2 - liveness probe benchmark
+
+Measures, against an in-process stamp writer and control socket:
+
+- probe latency: reading the mmap'd liveness stamp vs. a check_liveness
+  round trip over the control socket (blocking client, reused connection)
+- CLI startup: wall time of `live.py liveness` (stamp only) and
+  `live.py readiness` (socket) as fresh processes, next to the time to
+  import the full nexus package
+
+Usage:
+    python benchmarks/bench_liveness_probe.py [iterations]
+"""
+
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from nexus.aeon_interface import stamp
+from nexus.aeon_interface.client import NexusClient
+from nexus.core.control import ControlServer
+from nexus.core.liveness import LivenessStamp
+
+
+LIVE_PY = Path(__file__).resolve().parent.parent / "aeon_interface" / "live.py"
+
+
+def _serve(tmp: str, ready: threading.Event, stop: threading.Event):
+    """Run a stamp writer and control server on a private loop"""
+    async def run():
+        writer = LivenessStamp(os.path.join(tmp, "nexus.live"), interval=0.5)
+        server = ControlServer(os.path.join(tmp, "nexus.sock"))
+        
+        async def check_liveness(params):
+            return {"live": True, "timestamp": time.time(), "daemon_running": True}
+        
+        async def check_readiness(params):
+            return {"ready": True, "timestamp": time.time(), "details": {}}
+        
+        server.register("check_liveness", check_liveness)
+        server.register("check_readiness", check_readiness)
+        
+        await writer.start()
+        await server.start()
+        ready.set()
+        while not stop.is_set():
+            await asyncio.sleep(0.05)
+        await server.stop()
+        await writer.stop()
+    
+    asyncio.run(run())
+
+
+def _per_call_us(fn, iterations: int) -> float:
+    for _ in range(min(1000, iterations)):
+        fn()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def _process_ms(args, env, runs: int = 10) -> str:
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        proc = subprocess.run(args, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        samples.append((time.perf_counter() - start) * 1000)
+    
+    median = f"{statistics.median(samples):8.1f} ms"
+    # live.py exits 1 when the probe fails - only a crash is worth flagging
+    return median if proc.returncode in (0, 1) else f"{median} (exit {proc.returncode})"
+
+
+def main(iterations: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        ready, stop = threading.Event(), threading.Event()
+        thread = threading.Thread(target=_serve, args=(tmp, ready, stop), daemon=True)
+        thread.start()
+        ready.wait(5)
+        
+        stamp_file = os.path.join(tmp, "nexus.live")
+        socket_file = os.path.join(tmp, "nexus.sock")
+        env = dict(os.environ, NEXUS_LIVENESS_FILE=stamp_file, NEXUS_CONTROL_SOCKET=socket_file)
+        
+        stamp_us = _per_call_us(lambda: stamp.check_liveness(stamp_file), iterations)
+        with NexusClient(socket_file) as client:
+            socket_us = _per_call_us(lambda: client.call("check_liveness"), iterations)
+        
+        python = [sys.executable]
+        bare_ms = _process_ms(python + ["-c", "pass"], env)
+        liveness_ms = _process_ms(python + [str(LIVE_PY), "liveness"], env)
+        readiness_ms = _process_ms(python + [str(LIVE_PY), "readiness"], env)
+        full_ms = _process_ms(python + ["-c", "import nexus"], env)
+        
+        stop.set()
+        thread.join(5)
+    
+    print(f"liveness probe latency x {iterations}")
+    print(f"  stamp read (mmap file):      {stamp_us:8.1f} us/probe")
+    print(f"  control socket round trip:   {socket_us:8.1f} us/probe")
+    print("process wall time (median of 10)")
+    print(f"  python -c pass:              {bare_ms}")
+    print(f"  live.py liveness (stamp):    {liveness_ms}")
+    print(f"  live.py readiness (socket):  {readiness_ms}")
+    print(f"  python -c 'import nexus':    {full_ms}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+NEXUS v2 - heartbeat receiver benchmark
+
+N peers heartbeat every `interval` seconds, spread evenly over the
+interval. Partway through the run the last 1% of peers go silent. Two
+modes:
+
+- replay (default): the receiver is measured apart from the senders.
+  Datagrams are encoded up front, with arrival jitter, and delivered on
+  a virtual clock to the same receive path as the
+  vitals/heartbeat-receiver module: decode_beat() per datagram, one
+  handler call per 1 ms wake-up feeding a PhiAccrualDetector, and
+  evaluate() every interval. Only that path is timed, so the CPU share
+  is what one core needs for this load. The kernel UDP receive is not
+  included.
+- --udp: end to end. Sender processes send real UDP datagrams to a
+  HeartbeatListener. The senders compete with the receiver for the same
+  cores, so on a box with fewer cores than senders + 1, lost beats (and
+  the false suspicions they cause) mostly measure that contention.
+
+The benchmark reports:
+
+- receiver CPU, as a share of one core
+- beats received vs sent
+- detector tick time (median / max)
+- false suspicions among the peers that kept beating
+- time until the silent peers were suspected
+
+Usage:
+    python benchmarks/bench_phi_receiver.py [peers] [seconds] [interval] [jitter_ms]
+    python benchmarks/bench_phi_receiver.py --udp [peers] [seconds] [interval] [senders]
+"""
+
+import asyncio
+import multiprocessing
+import random
+import socket
+import statistics
+import sys
+import time
+
+from nexus.core.timers import TimerService
+from nexus.modules.vitals.detector import PhiAccrualDetector
+from nexus.modules.vitals.protocol import decode_beat, encode_beat
+from nexus.modules.vitals.transport import HeartbeatListener
+
+
+SLICES = 20
+WAKEUP = 0.001
+
+
+def _send(address, peers, interval, start, stop, kill_at, killed, sent):
+    """Sender process: spread each round of beats over SLICES sub-ticks"""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    slices = [peers[i::SLICES] for i in range(SLICES)]
+    step = interval / SLICES
+    seq = 0
+    count = 0
+    
+    while time.monotonic() < start:
+        time.sleep(0.001)
+    while True:
+        seq += 1
+        round_start = start + (seq - 1) * interval
+        if round_start >= stop:
+            break
+        alive_only = round_start >= kill_at
+        for index, chunk in enumerate(slices):
+            delay = round_start + index * step - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            for peer in chunk:
+                if alive_only and peer in killed:
+                    continue
+                try:
+                    sock.sendto(encode_beat(peer, seq, 0.0), address)
+                    count += 1
+                except BlockingIOError:
+                    pass
+    sent.value = count
+
+
+def _detector(count: int, interval: float) -> PhiAccrualDetector:
+    # Tolerate one lost datagram per peer before suspecting it
+    return PhiAccrualDetector(
+        expected_interval=interval,
+        min_std=interval / 5,
+        acceptable_pause=interval,
+        max_peers=count
+    )
+
+
+def replay(count: int, seconds: float, interval: float, jitter: float):
+    """Receive path on a virtual clock; only the receiver's work is timed"""
+    detector = _detector(count, interval)
+    rng = random.Random(1)
+    
+    peers = [f"peer-{i:05d}" for i in range(count)]
+    kill = max(1, count // 100)
+    killed = set(peers[-kill:])
+    kill_at = seconds * 0.6
+    phases = [(i % SLICES) * interval / SLICES for i in range(count)]
+    
+    suspected_at = {}
+    ticks = []
+    received = sent = 0
+    cpu = 0.0
+    
+    def on_beats(beats, now):
+        heartbeat = detector.heartbeat
+        for peer, seq, _ in beats:
+            heartbeat(peer, seq, now)
+    
+    # (arrival, datagram) not yet delivered; jitter may carry beats into
+    # the next round
+    pending = []
+    rounds = int(seconds / interval)
+    for seq in range(1, rounds + 1):
+        round_start = (seq - 1) * interval
+        round_end = round_start + interval
+        
+        # Senders: not timed
+        for index, peer in enumerate(peers):
+            if round_start >= kill_at and peer in killed:
+                continue
+            pending.append((round_start + phases[index] + rng.expovariate(1.0 / jitter), encode_beat(peer, seq, 0.0)))
+            sent += 1
+        pending.sort(key=lambda item: item[0])
+        split = 0
+        while split < len(pending) and pending[split][0] < round_end:
+            split += 1
+        due, pending = pending[:split], pending[split:]
+        
+        # Receiver: one wake-up per WAKEUP drains what arrived before it,
+        # then the detector tick at the end of the round
+        started = time.process_time()
+        position = 0
+        wakeup = round_start + WAKEUP
+        while position < len(due):
+            beats = []
+            while position < len(due) and due[position][0] <= wakeup:
+                beat, _ = decode_beat(due[position][1])
+                beats.append(beat)
+                position += 1
+            if beats:
+                on_beats(beats, wakeup)
+                received += len(beats)
+            wakeup += WAKEUP
+        
+        tick_started = time.perf_counter()
+        for peer, is_suspected, _ in detector.evaluate(round_end):
+            if is_suspected:
+                suspected_at.setdefault(peer, round_end)
+        ticks.append(time.perf_counter() - tick_started)
+        cpu += time.process_time() - started
+    
+    # Still in flight when the run ends
+    sent -= len(pending)
+    print(f"{count} peers every {interval}s for {seconds}s (replay, {jitter * 1000:.1f} ms mean jitter)")
+    _report(cpu, rounds * interval, received, sent, ticks, suspected_at, killed, kill_at)
+
+
+async def udp(count: int, seconds: float, interval: float, senders: int):
+    """End to end: sender processes, real UDP, HeartbeatListener"""
+    loop = asyncio.get_running_loop()
+    detector = _detector(count, interval)
+    
+    def on_beats(beats, now):
+        for peer, seq, _ in beats:
+            detector.heartbeat(peer, seq, now)
+    
+    listener = HeartbeatListener("udp://127.0.0.1:0", on_beats)
+    await listener.open()
+    await listener.start()
+    address = listener.bound_address
+    
+    peers = [f"peer-{i:05d}" for i in range(count)]
+    kill = max(1, count // 100)
+    killed = set(peers[-kill:])
+    start = time.monotonic() + 1.0
+    stop = start + seconds
+    kill_at = start + seconds * 0.6
+    
+    suspected_at = {}
+    ticks = []
+    
+    def tick():
+        t = time.perf_counter()
+        now = loop.time()
+        for peer, is_suspected, _ in detector.evaluate(now):
+            if is_suspected:
+                suspected_at.setdefault(peer, now)
+        ticks.append(time.perf_counter() - t)
+    
+    timers = TimerService()
+    timers.call_every(interval, tick)
+    
+    sent = [multiprocessing.Value("q", 0) for _ in range(senders)]
+    procs = [
+        multiprocessing.Process(
+            target=_send,
+            args=(address, peers[i::senders], interval, start, stop, kill_at, killed, sent[i]),
+            daemon=True
+        )
+        for i in range(senders)
+    ]
+    for proc in procs:
+        proc.start()
+    
+    # Measure after one second of warm-up, until the senders stop
+    await asyncio.sleep(start + 1.0 - loop.time())
+    ticks.clear()
+    cpu_start, wall_start = time.process_time(), time.perf_counter()
+    await asyncio.sleep(stop - loop.time())
+    cpu = time.process_time() - cpu_start
+    wall = time.perf_counter() - wall_start
+    
+    for proc in procs:
+        await loop.run_in_executor(None, proc.join)
+    timers.close()
+    await listener.close()
+    
+    print(f"{count} peers every {interval}s for {seconds}s (udp, {senders} sender processes)")
+    _report(cpu, wall, listener.received, sum(value.value for value in sent), ticks, suspected_at, killed, kill_at)
+
+
+def _report(cpu, wall, received, sent, ticks, suspected_at, killed, kill_at):
+    false_positives = sum(1 for peer in suspected_at if peer not in killed)
+    detection = [(suspected_at[peer] - kill_at) * 1000 for peer in killed if peer in suspected_at]
+    
+    print(f"  receiver cpu      {cpu / wall * 100:5.1f}% of one core")
+    print(f"  beats             {received} received / {sent} sent "
+          f"({(1 - received / max(sent, 1)) * 100:.2f}% lost)")
+    print(f"  detector tick     median {statistics.median(ticks) * 1000:.2f} ms  max {max(ticks) * 1000:.2f} ms")
+    print(f"  false suspicions  {false_positives}")
+    if detection:
+        print(f"  silent peers      {len(detection)}/{len(killed)} suspected after "
+              f"median {statistics.median(detection):.0f} ms  max {max(detection):.0f} ms")
+    else:
+        print(f"  silent peers      0/{len(killed)} suspected")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    end_to_end = "--udp" in args
+    args = [arg for arg in args if arg != "--udp"]
+    count = int(args[0]) if len(args) > 0 else 10_000
+    seconds = float(args[1]) if len(args) > 1 else 10.0
+    interval = float(args[2]) if len(args) > 2 else 0.1
+    if end_to_end:
+        asyncio.run(udp(count, seconds, interval, int(args[3]) if len(args) > 3 else 2))
+    else:
+        replay(count, seconds, interval, (float(args[3]) if len(args) > 3 else 2.0) / 1000)
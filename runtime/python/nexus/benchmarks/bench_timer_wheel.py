@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+NEXUS v2 - timer service benchmark
+
+Runs N periodic jobs (random phase, fixed interval) two ways:
+
+- wheel: one TimerService, N call_every() timers
+- tasks: N tasks each doing `while True: await asyncio.sleep(interval)`
+
+and reports setup time, memory allocated by setup, process CPU time per
+second of wall time while running, callbacks fired and median/max
+lateness against each job's ideal schedule.
+
+Usage:
+    python benchmarks/bench_timer_wheel.py [timers] [seconds] [interval]
+"""
+
+import asyncio
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+from nexus.core.timers import TimerService
+
+
+class _Job:
+    """Per-job bookkeeping shared by both variants"""
+    
+    __slots__ = ("due", "interval", "fired", "lateness")
+    
+    def __init__(self, due: float, interval: float):
+        self.due = due
+        self.interval = interval
+        self.fired = 0
+        self.lateness = 0.0
+    
+    def __call__(self):
+        now = asyncio.get_running_loop().time()
+        self.lateness = max(self.lateness, now - self.due)
+        self.fired += 1
+        self.due += self.interval
+
+
+def _setup_wheel(jobs, service):
+    loop = asyncio.get_running_loop()
+    for job in jobs:
+        service.call_every(job.interval, job, first=job.due - loop.time())
+
+
+def _setup_tasks(jobs):
+    async def run(job):
+        loop = asyncio.get_running_loop()
+        await asyncio.sleep(job.due - loop.time())
+        while True:
+            job()
+            await asyncio.sleep(job.interval)
+    
+    return [asyncio.create_task(run(job)) for job in jobs]
+
+
+async def _bench(kind: str, count: int, seconds: float, interval: float):
+    loop = asyncio.get_running_loop()
+    start = loop.time() + 0.5
+    jobs = [_Job(start + random.uniform(0, interval), interval) for _ in range(count)]
+    service = TimerService()
+    tasks = []
+    
+    tracemalloc.start()
+    setup_start = time.perf_counter()
+    if kind == "wheel":
+        _setup_wheel(jobs, service)
+    else:
+        tasks = _setup_tasks(jobs)
+    setup_ms = (time.perf_counter() - setup_start) * 1000
+    setup_kb = tracemalloc.get_traced_memory()[0] / 1024
+    tracemalloc.stop()
+    
+    await asyncio.sleep(start - loop.time())
+    cpu_start, wall_start = time.process_time(), time.perf_counter()
+    await asyncio.sleep(seconds)
+    cpu = time.process_time() - cpu_start
+    wall = time.perf_counter() - wall_start
+    
+    service.close()
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    
+    fired = sum(job.fired for job in jobs)
+    lateness = [job.lateness * 1000 for job in jobs if job.fired]
+    print(
+        f"  {kind:5}  setup {setup_ms:7.1f} ms  {setup_kb:8.0f} KiB  "
+        f"cpu {cpu / wall * 100:5.1f}%  fired {fired:7d}  "
+        f"worst lateness median {statistics.median(lateness):6.2f} ms  max {max(lateness):6.2f} ms"
+    )
+
+
+async def main(count: int, seconds: float, interval: float):
+    print(f"{count} periodic jobs, every {interval}s, for {seconds}s")
+    await _bench("wheel", count, seconds, interval)
+    await _bench("tasks", count, seconds, interval)
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    asyncio.run(main(
+        int(args[0]) if len(args) > 0 else 10_000,
+        float(args[1]) if len(args) > 1 else 5.0,
+        float(args[2]) if len(args) > 2 else 1.0
+    ))
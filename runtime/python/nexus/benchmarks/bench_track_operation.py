@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+NEXUS v2 - _track_operation micro-benchmark
+
+Compares the per-call cost of BaseModule._track_operation (pre-bound
+metric handles) with the previous implementation, which resolved every
+metric by name through increment()/histogram() inside an
+@asynccontextmanager.
+
+Usage:
+    python benchmarks/bench_track_operation.py [iterations]
+"""
+
+import asyncio
+import sys
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Dict
+
+from nexus.core.module import BaseModule, ModuleManifest, ModuleState
+
+
+class _BenchModule(BaseModule):
+    """Minimal concrete module - only _track_operation is exercised"""
+    
+    @classmethod
+    def get_manifest(cls) -> ModuleManifest:
+        return ModuleManifest(id="bench/track-operation", group="bench", version="0.0.0")
+    
+    async def init(self, context: Dict[str, Any]):
+        self._set_state(ModuleState.LOADED)
+    
+    async def load(self, context: Dict[str, Any]):
+        pass
+    
+    async def start(self):
+        self._set_state(ModuleState.STARTED)
+    
+    async def stop(self):
+        self._set_state(ModuleState.STOPPED)
+    
+    async def unload(self):
+        self._set_state(ModuleState.UNLOADED)
+    
+    async def health(self) -> Dict[str, Any]:
+        return {"status": "healthy", "ready": True, "live": True, "details": {}}
+    
+    @asynccontextmanager
+    async def _track_operation_by_name(self, operation: str):
+        """Previous implementation, kept here as the baseline"""
+        start = time.time()
+        self.metrics.increment(f"{operation}_total")
+        
+        try:
+            yield
+            self.metrics.increment(f"{operation}_success")
+        except Exception as e:
+            self.metrics.increment(f"{operation}_error")
+            self.logger.error(f"{operation} failed: {e}", exc_info=True)
+            raise
+        finally:
+            duration = time.time() - start
+            self.metrics.histogram(f"{operation}_duration_seconds", duration)
+
+
+async def _run(track, iterations: int) -> float:
+    """Return ns/op for `iterations` empty tracked operations"""
+    for _ in range(1000):  # warm-up, also creates the series
+        async with track("heartbeat_send"):
+            pass
+    
+    start = time.perf_counter_ns()
+    for _ in range(iterations):
+        async with track("heartbeat_send"):
+            pass
+    return (time.perf_counter_ns() - start) / iterations
+
+
+async def main(iterations: int):
+    module = _BenchModule(_BenchModule.get_manifest())
+    
+    before = await _run(module._track_operation_by_name, iterations)
+    after = await _run(module._track_operation, iterations)
+    
+    print(f"_track_operation x {iterations}")
+    print(f"  before (by name):  {before:8.0f} ns/op")
+    print(f"  after  (handles):  {after:8.0f} ns/op")
+    print(f"  speedup:           {before / after:8.2f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000))
@@ -1,6 +1,13 @@
 """NEXUS v2 Core - Enterprise-Grade Module System"""
 
 from .module import BaseModule, ModuleManifest, ModuleState, SecurityContext, MetricsCollector
+from .metrics import Histogram, QuantileSketch, MetricsRegistry, get_registry
+from .health import HealthTable
+from .timers import Timer, TimerService
+from .bus import MessageBus, Subscription
+from .rpc import RpcRouter, RpcChannel, RpcError, RpcTimeout
+from .ring import RingChannel
+from .isolation import ProcessModuleProxy
 from .config import ConfigurationManager, SecretProvider, VaultSecretProvider, FileSecretProvider
 from .loader import ModuleLoader, StateStore, FileStateStore
 from .resolver import DependencyResolver
@@ -11,6 +18,21 @@ __all__ = [
     "ModuleState",
     "SecurityContext",
     "MetricsCollector",
+    "Histogram",
+    "QuantileSketch",
+    "MetricsRegistry",
+    "get_registry",
+    "HealthTable",
+    "Timer",
+    "TimerService",
+    "MessageBus",
+    "Subscription",
+    "RpcRouter",
+    "RpcChannel",
+    "RpcError",
+    "RpcTimeout",
+    "RingChannel",
+    "ProcessModuleProxy",
     "ConfigurationManager",
     "SecretProvider",
     "VaultSecretProvider",
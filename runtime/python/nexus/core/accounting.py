@@ -0,0 +1,228 @@
+"""
+NEXUS v2 - Per-Module Resource Accounting
+Addresses Review: _resource_usage declared but never populated
+
+CPU time is attributed by wrapping module coroutines (background tasks
+and lifecycle calls) so every step is bracketed with time.thread_time().
+Nested accounted coroutines subtract their time from the caller, so each
+CPU second lands on exactly one module.
+
+Memory is attributed from tracemalloc snapshots, filtered by the source
+files of each module's package. tracemalloc is costly, so it is off by
+default and sampled at a configurable interval when enabled.
+"""
+
+import asyncio
+import inspect
+import logging
+import threading
+import time
+import tracemalloc
+from collections.abc import Coroutine
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+
+logger = logging.getLogger(__name__)
+
+_cpu_accounting = True
+_local = threading.local()
+
+
+def set_cpu_accounting(enabled: bool):
+    """Enable or disable CPU attribution for newly wrapped coroutines"""
+    global _cpu_accounting
+    _cpu_accounting = enabled
+
+
+def cpu_accounting_enabled() -> bool:
+    return _cpu_accounting
+
+
+class AccountedCoroutine(Coroutine):
+    """
+    Coroutine wrapper that charges thread CPU time per step to a usage dict.
+    
+    Registered as a collections.abc.Coroutine, so asyncio.create_task()
+    and await accept it like the coroutine it wraps.
+    """
+    
+    __slots__ = ("_coro", "_usage")
+    
+    def __init__(self, coro, usage: Dict[str, float]):
+        self._coro = coro
+        self._usage = usage
+    
+    def _step(self, method, *args):
+        stack = getattr(_local, "stack", None)
+        if stack is None:
+            stack = _local.stack = []
+        
+        start = time.thread_time()
+        stack.append(0.0)
+        try:
+            return method(*args)
+        finally:
+            elapsed = time.thread_time() - start
+            nested = stack.pop()
+            self._usage["cpu_seconds"] += elapsed - nested
+            if stack:
+                stack[-1] += elapsed
+    
+    def send(self, value):
+        return self._step(self._coro.send, value)
+    
+    def throw(self, *args):
+        return self._step(self._coro.throw, *args)
+    
+    def close(self):
+        return self._coro.close()
+    
+    def __await__(self):
+        return self
+    
+    def __iter__(self):
+        return self
+    
+    def __next__(self):
+        return self.send(None)
+    
+    @property
+    def cr_frame(self):
+        return getattr(self._coro, "cr_frame", None)
+    
+    @property
+    def cr_running(self):
+        return getattr(self._coro, "cr_running", False)
+    
+    @property
+    def cr_code(self):
+        return getattr(self._coro, "cr_code", None)
+    
+    @property
+    def cr_await(self):
+        return getattr(self._coro, "cr_await", None)
+    
+    def __repr__(self):
+        return f"<AccountedCoroutine {self._coro!r}>"
+
+
+def account_coroutine(coro, usage: Dict[str, float]):
+    """Wrap coro for CPU accounting, or return it unchanged when disabled"""
+    if not _cpu_accounting:
+        return coro
+    return AccountedCoroutine(coro, usage)
+
+
+def module_source_patterns(module_class: type) -> List[str]:
+    """
+    tracemalloc filename patterns covering a module's package.
+    
+    A module that is a package (its class lives in __init__.py) covers the
+    whole directory; a single-file module covers just that file.
+    """
+    try:
+        source = Path(inspect.getfile(module_class))
+    except (TypeError, OSError):
+        return []
+    
+    if source.name == "__init__.py":
+        return [str(source.parent / "*")]
+    return [str(source)]
+
+
+class ResourceAccountant:
+    """
+    Periodic sampler that publishes per-module resource usage.
+    
+    Every interval it copies accumulated CPU time into metrics and, when
+    memory accounting is enabled, attributes live traced allocations to
+    modules by source file.
+    """
+    
+    def __init__(
+        self,
+        instances: Callable[[], Iterable],
+        interval: float = 10.0,
+        memory: bool = False,
+        memory_frames: int = 4
+    ):
+        self._instances = instances
+        self.interval = interval
+        self.memory = memory
+        self.memory_frames = memory_frames
+        
+        self._task: Optional[asyncio.Task] = None
+        self._started_tracemalloc = False
+        self._patterns: Dict[type, List[str]] = {}
+    
+    async def start(self):
+        """Start sampling"""
+        if self._task:
+            return
+        
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start(self.memory_frames)
+            self._started_tracemalloc = True
+        
+        self._task = asyncio.create_task(self._sample_loop(), name="nexus_resource_accounting")
+        logger.info(
+            f"Resource accounting started (interval: {self.interval}s, "
+            f"memory: {'on' if self.memory else 'off'})"
+        )
+    
+    async def stop(self):
+        """Stop sampling (and tracemalloc if this accountant started it)"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+    
+    async def _sample_loop(self):
+        while True:
+            try:
+                self.sample()
+            except Exception as e:
+                logger.error(f"Resource sampling failed: {e}", exc_info=True)
+            await asyncio.sleep(self.interval)
+    
+    def sample(self):
+        """Take one sample and publish it to every module"""
+        instances = list(self._instances())
+        memory = self._sample_memory(instances) if self.memory and tracemalloc.is_tracing() else {}
+        
+        for instance in instances:
+            usage = instance._resource_usage
+            if instance.manifest.id in memory:
+                usage["memory_mb"] = memory[instance.manifest.id] / (1024 * 1024)
+            
+            instance.metrics.gauge("resource_cpu_seconds", usage["cpu_seconds"])
+            instance.metrics.gauge("resource_memory_mb", usage["memory_mb"])
+    
+    def _sample_memory(self, instances: List) -> Dict[str, int]:
+        """Traced bytes per module ID"""
+        snapshot = tracemalloc.take_snapshot()
+        result = {}
+        
+        for instance in instances:
+            module_class = type(instance)
+            patterns = self._patterns.get(module_class)
+            if patterns is None:
+                patterns = self._patterns[module_class] = module_source_patterns(module_class)
+            if not patterns:
+                continue
+            
+            filtered = snapshot.filter_traces([
+                tracemalloc.Filter(True, pattern, all_frames=True)
+                for pattern in patterns
+            ])
+            result[instance.manifest.id] = sum(trace.size for trace in filtered.traces)
+        
+        return result
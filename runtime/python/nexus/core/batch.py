@@ -0,0 +1,176 @@
+"""
+NEXUS v2 - Batched Commands
+Addresses Review: Bulk lifecycle changes took one round trip per module
+
+A batch is a list of control commands ({"op", "params"}) executed in a
+single request. The batch is planned against the module dependency graph
+so that commands run in parallel unless an ordering constraint links them:
+
+- commands on the same module run in the order given
+- start/reload of related modules run dependencies first
+- stops of related modules run dependents first
+- mixed lifecycle ops on related modules run in the order given
+
+Commands that do not name a module_id have no ordering constraints. If a
+command fails, every command ordered after it is skipped, but unrelated
+commands still run.
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set
+
+
+logger = logging.getLogger(__name__)
+
+# Lifecycle ops and the direction they walk the dependency graph:
+# +1 dependencies first, -1 dependents first
+LIFECYCLE_ORDER = {
+    "start_module": 1,
+    "reload_module": 1,
+    "stop_module": -1,
+}
+
+Dispatch = Callable[[str, Dict[str, Any]], Awaitable[Any]]
+
+
+def plan_batch(
+    commands: List[Dict[str, Any]],
+    dependencies: Callable[[str], Iterable[str]]
+) -> List[Set[int]]:
+    """
+    Compute ordering constraints for a batch.
+    
+    Args:
+        commands: [{"op": ..., "params": {...}}, ...]
+        dependencies: module_id -> ids of the modules it depends on
+    
+    Returns:
+        For each command, the indices of commands that must finish first.
+        Falls back to strictly sequential order if the constraints
+        conflict (a cycle).
+    """
+    targets = [(command.get("params") or {}).get("module_id") for command in commands]
+    closure: Dict[str, Set[str]] = {}
+    
+    def depends_on(module_id: str) -> Set[str]:
+        """Transitive dependencies (memoized)"""
+        if module_id in closure:
+            return closure[module_id]
+        closure[module_id] = seen = set()
+        stack = list(dependencies(module_id))
+        while stack:
+            dep = stack.pop()
+            if dep in seen:
+                continue
+            seen.add(dep)
+            stack.extend(dependencies(dep))
+        return seen
+    
+    before: List[Set[int]] = [set() for _ in commands]
+    
+    for j, b in enumerate(targets):
+        if not b:
+            continue
+        for i in range(j):
+            a = targets[i]
+            if not a:
+                continue
+            if a == b:
+                before[j].add(i)
+                continue
+            
+            op_a, op_b = commands[i].get("op"), commands[j].get("op")
+            if op_a not in LIFECYCLE_ORDER or op_b not in LIFECYCLE_ORDER:
+                continue
+            
+            b_needs_a = a in depends_on(b)
+            a_needs_b = b in depends_on(a)
+            if not (b_needs_a or a_needs_b):
+                continue
+            
+            direction = LIFECYCLE_ORDER[op_a]
+            if direction != LIFECYCLE_ORDER[op_b]:
+                before[j].add(i)
+            elif (direction > 0) == b_needs_a:
+                before[j].add(i)
+            else:
+                before[i].add(j)
+    
+    if _has_cycle(before):
+        logger.warning("Batch ordering constraints conflict - running sequentially")
+        return [{i - 1} if i else set() for i in range(len(commands))]
+    return before
+
+
+def _has_cycle(before: List[Set[int]]) -> bool:
+    """Kahn's algorithm over the prerequisite sets"""
+    remaining = [len(deps) for deps in before]
+    dependents: List[List[int]] = [[] for _ in before]
+    for j, deps in enumerate(before):
+        for i in deps:
+            dependents[i].append(j)
+    
+    ready = [j for j, n in enumerate(remaining) if n == 0]
+    visited = 0
+    while ready:
+        i = ready.pop()
+        visited += 1
+        for j in dependents[i]:
+            remaining[j] -= 1
+            if remaining[j] == 0:
+                ready.append(j)
+    return visited != len(before)
+
+
+async def run_batch(
+    commands: List[Dict[str, Any]],
+    dispatch: Dispatch,
+    dependencies: Callable[[str], Iterable[str]],
+    plan: Optional[List[Set[int]]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Execute a batch according to its plan.
+    
+    Returns:
+        One result per command, in input order:
+        {"op", "success": True, "result"} or
+        {"op", "success": False, "error", "error_type"[, "skipped": True]}
+    """
+    if plan is None:
+        plan = plan_batch(commands, dependencies)
+    
+    tasks: List[asyncio.Task] = []
+    
+    async def execute(index: int) -> Dict[str, Any]:
+        command = commands[index]
+        op = command.get("op")
+        
+        for prerequisite in sorted(plan[index]):
+            if not (await tasks[prerequisite])["success"]:
+                failed_op = commands[prerequisite].get("op")
+                return {
+                    "op": op,
+                    "success": False,
+                    "skipped": True,
+                    "error": f"Skipped: prerequisite command {prerequisite} ({failed_op}) did not succeed",
+                    "error_type": "BatchSkipped",
+                }
+        
+        try:
+            result = await dispatch(op, command.get("params") or {})
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            return {"op": op, "success": False, "error": str(e), "error_type": type(e).__name__}
+        return {"op": op, "success": True, "result": result}
+    
+    for index in range(len(commands)):
+        tasks.append(asyncio.ensure_future(execute(index)))
+    
+    try:
+        return list(await asyncio.gather(*tasks))
+    except asyncio.CancelledError:
+        for task in tasks:
+            task.cancel()
+        raise
@@ -0,0 +1,343 @@
+"""
+NEXUS v2 - Message Bus
+Addresses Review: provides/consumes were declared but never wired
+
+In-process pub/sub keyed by the topic names modules declare in their
+manifests: a module publishes on its `provides` topics and subscribes to
+its `consumes` topics.
+
+- Zero-copy fan-out: every subscriber receives the same message object.
+  Messages must be treated as immutable once published.
+- Every subscription has a bounded queue and its own delivery task, so
+  a slow consumer never delays the publisher or other consumers. What
+  happens when the queue is full is the subscription's overflow policy:
+
+      block        publish() waits for space (publish_nowait() drops)
+      drop_oldest  the oldest queued message is discarded
+      coalesce     a queued message with the same key is replaced
+
+- Delivery is batched: the handler receives a list with everything
+  queued since its last call, up to batch_size messages.
+- Per-topic metrics (topic label) on the "bus" collector:
+  nexus_bus_published_total, _delivered_total, _dropped_total,
+  _coalesced_total and _delivery_lag_seconds, the time from publish to
+  handler call.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from .metrics import MetricsCollector
+
+
+logger = logging.getLogger(__name__)
+
+OVERFLOW_POLICIES = ("block", "drop_oldest", "coalesce")
+
+LAG_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+# (published_at, message), shared by all subscribers of one publish
+_Envelope = Tuple[float, Any]
+
+Handler = Callable[[List[Any]], Any]
+
+
+class _Topic:
+    """Subscribers and pre-bound metric handles of one topic"""
+    
+    __slots__ = ("name", "subscriptions", "published", "delivered", "dropped", "coalesced", "lag")
+    
+    def __init__(self, name: str, metrics: MetricsCollector):
+        labels = {"topic": name}
+        self.name = name
+        self.subscriptions: List["Subscription"] = []
+        self.published = metrics.counter("published_total", labels)
+        self.delivered = metrics.counter("delivered_total", labels)
+        self.dropped = metrics.counter("dropped_total", labels)
+        self.coalesced = metrics.counter("coalesced_total", labels)
+        self.lag = metrics.histogram_handle("delivery_lag_seconds", labels)
+
+
+class Subscription:
+    """
+    One consumer of a topic: a bounded queue drained by a delivery task.
+    
+    Created by MessageBus.subscribe(); call close() (or
+    MessageBus.unsubscribe_owner()) to stop delivery.
+    """
+    
+    def __init__(
+        self,
+        bus: "MessageBus",
+        topic: _Topic,
+        handler: Handler,
+        owner: Optional[str],
+        queue_size: int,
+        overflow: str,
+        batch_size: int,
+        key: Optional[Callable[[Any], Any]]
+    ):
+        self.topic = topic.name
+        self.owner = owner
+        self.queue_size = queue_size
+        self.overflow = overflow
+        self.batch_size = batch_size
+        self.delivered = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.closed = False
+        
+        self._bus = bus
+        self._topic = topic
+        self._handler = handler
+        self._key = key
+        # coalesce keeps one slot per key, in arrival order
+        self._queue: Deque[_Envelope] = deque()
+        self._latest: Dict[Any, _Envelope] = {}
+        self._ready = asyncio.Event()
+        self._space = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+    
+    @property
+    def pending(self) -> int:
+        return len(self._latest) if self.overflow == "coalesce" else len(self._queue)
+    
+    def close(self):
+        """Stop delivery; queued messages are discarded"""
+        if self.closed:
+            return
+        self.closed = True
+        self._bus._detach(self)
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self._queue.clear()
+        self._latest.clear()
+        # Release publishers blocked on this subscription
+        self._space.set()
+    
+    # Publisher side
+    
+    def _offer(self, envelope: _Envelope) -> bool:
+        """Queue without waiting; False only for a full "block" queue"""
+        if self.overflow == "coalesce":
+            key = self._key(envelope[1]) if self._key else None
+            previous = self._latest.get(key)
+            if previous is not None:
+                # Keep the original queue position and publish time
+                self._latest[key] = (previous[0], envelope[1])
+                self.coalesced += 1
+                self._topic.coalesced.inc()
+                return True
+            if len(self._latest) >= self.queue_size:
+                del self._latest[next(iter(self._latest))]
+                self._count_drop()
+            self._latest[key] = envelope
+        
+        elif len(self._queue) >= self.queue_size:
+            if self.overflow == "block":
+                return False
+            self._queue.popleft()
+            self._count_drop()
+            self._queue.append(envelope)
+        
+        else:
+            self._queue.append(envelope)
+        
+        self._ready.set()
+        return True
+    
+    async def _put(self, envelope: _Envelope):
+        """Queue, waiting for space ("block" policy)"""
+        while not self.closed and not self._offer(envelope):
+            self._space.clear()
+            await self._space.wait()
+    
+    def _count_drop(self):
+        self.dropped += 1
+        self._topic.dropped.inc()
+    
+    # Consumer side
+    
+    def _take(self) -> List[_Envelope]:
+        if self.overflow == "coalesce":
+            if len(self._latest) <= self.batch_size:
+                batch = list(self._latest.values())
+                self._latest.clear()
+            else:
+                batch = [self._latest.pop(next(iter(self._latest))) for _ in range(self.batch_size)]
+        else:
+            queue = self._queue
+            batch = [queue.popleft() for _ in range(min(len(queue), self.batch_size))]
+        self._space.set()
+        return batch
+    
+    async def _run(self):
+        topic = self._topic
+        while True:
+            while not self.pending:
+                self._ready.clear()
+                await self._ready.wait()
+            
+            batch = self._take()
+            topic.lag.observe(time.monotonic() - batch[0][0])
+            try:
+                result = self._handler([message for _, message in batch])
+                if asyncio.iscoroutine(result):
+                    await result
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Subscriber {self.owner or '?'} failed on topic {self.topic}: {e}", exc_info=True)
+            self.delivered += len(batch)
+            topic.delivered.inc(len(batch))
+
+
+class MessageBus:
+    """
+    Daemon-level topic bus.
+    
+    Usage:
+        sub = bus.subscribe("vitals.peer.suspicion", handle_batch, owner="alerts/pager")
+        bus.publish_nowait("vitals.peer.suspicion", event)
+    """
+    
+    def __init__(self, metrics: Optional[MetricsCollector] = None):
+        self.metrics = metrics or MetricsCollector("bus")
+        self._topics: Dict[str, _Topic] = {}
+        self._owners: Dict[Optional[str], List[Subscription]] = {}
+        for name, help_text in (
+            ("published_total", "Messages published per topic"),
+            ("delivered_total", "Messages handed to subscriber handlers per topic"),
+            ("dropped_total", "Messages discarded by full subscriber queues per topic"),
+            ("coalesced_total", "Messages replaced by a newer one with the same key per topic"),
+            ("delivery_lag_seconds", "Time from publish to delivery of the oldest message in a batch"),
+        ):
+            self.metrics.describe(name, help_text)
+        self.metrics.configure_histogram("delivery_lag_seconds", buckets=LAG_BUCKETS, quantiles=(0.5, 0.99))
+    
+    def subscribe(
+        self,
+        topic: str,
+        handler: Handler,
+        owner: Optional[str] = None,
+        queue_size: int = 1024,
+        overflow: str = "drop_oldest",
+        batch_size: int = 64,
+        key: Optional[Callable[[Any], Any]] = None,
+        spawn: Optional[Callable] = None
+    ) -> Subscription:
+        """
+        Deliver messages published on topic to handler(messages).
+        
+        Args:
+            topic: Topic name
+            handler: Called with a list of 1..batch_size messages; may be
+                a coroutine function
+            owner: Module id, for unsubscribe_owner()
+            queue_size: Max queued messages (distinct keys for coalesce)
+            overflow: "block", "drop_oldest" or "coalesce"
+            batch_size: Max messages per handler call
+            key: coalesce key function (default: one slot - latest wins)
+            spawn: Task factory for the delivery task, e.g. a module's
+                _spawn_background_task (default asyncio.create_task)
+        """
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"overflow must be one of {OVERFLOW_POLICIES}")
+        if queue_size < 1 or batch_size < 1:
+            raise ValueError("queue_size and batch_size must be >= 1")
+        
+        subscription = Subscription(
+            self, self._topic(topic), handler, owner, queue_size, overflow, batch_size, key
+        )
+        spawn = spawn or (lambda coro, name=None: asyncio.create_task(coro, name=name))
+        subscription._task = spawn(subscription._run(), name=f"bus_{topic}_{owner or 'anon'}")
+        
+        self._topics[topic].subscriptions.append(subscription)
+        self._owners.setdefault(owner, []).append(subscription)
+        return subscription
+    
+    def publish_nowait(self, topic: str, message: Any) -> int:
+        """
+        Fan message out without waiting; returns how many subscribers
+        queued it. A full "block" subscriber misses the message (counted
+        as dropped).
+        """
+        entry = self._topic(topic)
+        entry.published.inc()
+        envelope = (time.monotonic(), message)
+        
+        queued = 0
+        for subscription in entry.subscriptions:
+            if subscription._offer(envelope):
+                queued += 1
+            else:
+                subscription._count_drop()
+        return queued
+    
+    async def publish(self, topic: str, message: Any) -> int:
+        """Fan message out, waiting for space in full "block" subscribers"""
+        entry = self._topic(topic)
+        entry.published.inc()
+        envelope = (time.monotonic(), message)
+        
+        blocked = [s for s in entry.subscriptions if not s._offer(envelope)]
+        for subscription in blocked:
+            await subscription._put(envelope)
+        return len(entry.subscriptions)
+    
+    def unsubscribe_owner(self, owner: str) -> int:
+        """Close every subscription registered by owner; returns how many"""
+        subscriptions = self._owners.pop(owner, [])
+        for subscription in subscriptions:
+            subscription.close()
+        return len(subscriptions)
+    
+    def close(self):
+        for owner in list(self._owners):
+            self.unsubscribe_owner(owner)
+    
+    def topics(self) -> Dict[str, Dict[str, Any]]:
+        """Per-topic subscriber state"""
+        return {
+            name: {
+                "published": entry.published.value,
+                "delivered": entry.delivered.value,
+                "dropped": entry.dropped.value,
+                "coalesced": entry.coalesced.value,
+                "lag_p99_seconds": entry.lag.histogram.quantile(0.99),
+                "subscribers": [
+                    {
+                        "owner": s.owner,
+                        "overflow": s.overflow,
+                        "pending": s.pending,
+                        "delivered": s.delivered,
+                        "dropped": s.dropped,
+                        "coalesced": s.coalesced,
+                    }
+                    for s in entry.subscriptions
+                ],
+            }
+            for name, entry in self._topics.items()
+        }
+    
+    # Internal
+    
+    def _topic(self, name: str) -> _Topic:
+        entry = self._topics.get(name)
+        if entry is None:
+            entry = self._topics[name] = _Topic(name, self.metrics)
+        return entry
+    
+    def _detach(self, subscription: Subscription):
+        entry = self._topics.get(subscription.topic)
+        if entry is not None and subscription in entry.subscriptions:
+            entry.subscriptions.remove(subscription)
+        owned = self._owners.get(subscription.owner)
+        if owned is not None and subscription in owned:
+            owned.remove(subscription)
+            if not owned:
+                del self._owners[subscription.owner]
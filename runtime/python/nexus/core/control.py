@@ -0,0 +1,244 @@
+"""
+NEXUS v2 - Control Socket Server
+Addresses Review: aeon_interface stubs had nothing to talk to
+
+An asyncio server on a Unix domain socket speaking the length-prefixed
+JSON protocol from aeon_interface/protocol.py. Each request on a
+connection runs as its own task, so clients may pipeline; responses are
+written as requests complete and matched by id.
+
+Stream ops answer one request with a series of event frames
+({"id", "ok": true, "event": ...}) and a final response frame when the
+stream ends. A client stops a stream early by sending the reserved
+"cancel" op with {"id": <request id>}. Each event is written only after
+the previous one drained, so a slow reader holds the stream back rather
+than growing the socket buffer.
+"""
+
+import asyncio
+import functools
+import logging
+import os
+from pathlib import Path
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, Set
+
+from ..aeon_interface import protocol
+
+
+logger = logging.getLogger(__name__)
+
+ControlHandler = Callable[[Dict[str, Any]], Awaitable[Any]]
+StreamHandler = Callable[[Dict[str, Any]], AsyncIterator[Any]]
+
+CANCEL_OP = "cancel"
+
+
+class ControlServer:
+    """
+    Unix-socket request/response server.
+    
+    Handlers are registered per op and receive the request params; their
+    return value is sent back as the result, and exceptions become error
+    responses carrying the exception type.
+    """
+    
+    def __init__(self, path: Optional[str] = None, mode: int = 0o600):
+        self.path = Path(protocol.socket_path(path))
+        self.mode = mode
+        
+        self._handlers: Dict[str, ControlHandler] = {}
+        self._streams: Dict[str, StreamHandler] = {}
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._connections: Set[asyncio.Task] = set()
+    
+    def register(self, op: str, handler: ControlHandler):
+        """Register an async handler for an op"""
+        self._handlers[op] = handler
+    
+    def register_stream(self, op: str, handler: StreamHandler):
+        """Register a stream op: handler(params) returns an async iterator of events"""
+        self._streams[op] = handler
+    
+    @property
+    def ops(self):
+        return sorted(list(self._handlers) + list(self._streams))
+    
+    async def dispatch(self, op: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        Run an op in-process, without the socket.
+        
+        Raises:
+            ValueError: Unknown op
+        """
+        handler = self._handlers.get(op)
+        if handler is None:
+            raise ValueError(f"Unknown op: {op}")
+        return await handler(params or {})
+    
+    def stream(self, op: str, params: Optional[Dict[str, Any]] = None) -> AsyncIterator[Any]:
+        """
+        Open a stream op in-process, without the socket.
+        
+        Raises:
+            ValueError: Unknown stream op
+        """
+        handler = self._streams.get(op)
+        if handler is None:
+            raise ValueError(f"Unknown stream op: {op}")
+        return handler(params or {})
+    
+    @property
+    def is_running(self) -> bool:
+        return self._server is not None
+    
+    async def start(self):
+        """Bind the socket and start serving"""
+        if self._server:
+            return
+        
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.path.is_socket():
+            # Stale socket from a previous run - refuse to steal a live one
+            try:
+                _, writer = await asyncio.open_unix_connection(str(self.path))
+                writer.close()
+                raise RuntimeError(f"Control socket {self.path} is in use")
+            except (ConnectionRefusedError, FileNotFoundError):
+                self.path.unlink()
+        
+        self._server = await asyncio.start_unix_server(self._handle_client, path=str(self.path))
+        os.chmod(self.path, self.mode)
+        logger.info(f"Control socket listening on {self.path}")
+    
+    async def stop(self):
+        """Stop serving, close connections and remove the socket"""
+        if not self._server:
+            return
+        
+        self._server.close()
+        for task in list(self._connections):
+            task.cancel()
+        if self._connections:
+            await asyncio.gather(*self._connections, return_exceptions=True)
+        await self._server.wait_closed()
+        self._server = None
+        
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+        
+        logger.info("Control socket stopped")
+    
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        connection = asyncio.current_task()
+        self._connections.add(connection)
+        requests: Set[asyncio.Task] = set()
+        streams: Dict[Any, asyncio.Task] = {}
+        
+        try:
+            while True:
+                message = await protocol.read_frame(reader)
+                if message is None:
+                    break
+                
+                if message.get("op") == CANCEL_OP:
+                    self._cancel(message, streams, writer)
+                    continue
+                
+                if message.get("op") in self._streams:
+                    task = asyncio.create_task(self._serve_stream(message, writer))
+                    streams[message.get("id")] = task
+                    task.add_done_callback(functools.partial(self._forget_stream, streams, message.get("id")))
+                else:
+                    task = asyncio.create_task(self._serve(message, writer))
+                requests.add(task)
+                task.add_done_callback(requests.discard)
+            
+            # Client half-closed: finish outstanding requests, drop streams
+            for task in streams.values():
+                task.cancel()
+            if requests:
+                await asyncio.gather(*requests, return_exceptions=True)
+        
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except protocol.ProtocolError as e:
+            logger.warning(f"Control client protocol error: {e}")
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.error(f"Control connection failed: {e}", exc_info=True)
+        finally:
+            for task in list(requests):
+                task.cancel()
+            self._connections.discard(connection)
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except Exception:
+                pass
+    
+    async def _serve(self, message: Dict[str, Any], writer: asyncio.StreamWriter):
+        request_id = message.get("id")
+        op = message.get("op")
+        
+        try:
+            result = await self.dispatch(op, message.get("params"))
+            response = {"id": request_id, "ok": True, "result": result}
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.debug(f"Control op {op} failed: {e}")
+            response = {"id": request_id, "ok": False, "error": str(e), "type": type(e).__name__}
+        
+        if writer.is_closing():
+            return
+        writer.write(protocol.encode(response))
+        await writer.drain()
+    
+    async def _serve_stream(self, message: Dict[str, Any], writer: asyncio.StreamWriter):
+        request_id = message.get("id")
+        op = message.get("op")
+        stream = None
+        
+        try:
+            stream = self.stream(op, message.get("params"))
+            async for event in stream:
+                if writer.is_closing():
+                    return
+                writer.write(protocol.encode({"id": request_id, "ok": True, "event": event}))
+                await writer.drain()
+            response = {"id": request_id, "ok": True, "result": None}
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.debug(f"Control stream {op} failed: {e}")
+            response = {"id": request_id, "ok": False, "error": str(e), "type": type(e).__name__}
+        finally:
+            if stream is not None and hasattr(stream, "aclose"):
+                await stream.aclose()
+        
+        if writer.is_closing():
+            return
+        writer.write(protocol.encode(response))
+        await writer.drain()
+    
+    def _cancel(self, message: Dict[str, Any], streams: Dict[Any, asyncio.Task], writer: asyncio.StreamWriter):
+        """Handle the reserved cancel op: stop a stream on this connection"""
+        target = (message.get("params") or {}).get("id")
+        task = streams.pop(target, None)
+        if task is not None:
+            task.cancel()
+        
+        if not writer.is_closing():
+            writer.write(protocol.encode({
+                "id": message.get("id"),
+                "ok": True,
+                "result": {"cancelled": task is not None},
+            }))
+    
+    @staticmethod
+    def _forget_stream(streams: Dict[Any, asyncio.Task], request_id: Any, task: asyncio.Task):
+        if streams.get(request_id) is task:
+            del streams[request_id]
@@ -0,0 +1,234 @@
+"""
+NEXUS v2 - Prometheus Exposition Endpoint
+Addresses Review: No Metrics Exposition over HTTP
+"""
+
+import asyncio
+import gzip
+import logging
+from typing import Callable, Iterable, List, Optional, Tuple
+
+from .metrics import MetricsCollector
+
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+}
+
+
+def _accepts_gzip(header: str) -> bool:
+    """Check an Accept-Encoding header for gzip with a non-zero q-value"""
+    for token in header.split(","):
+        parts = [p.strip() for p in token.split(";")]
+        if parts[0].lower() not in ("gzip", "*"):
+            continue
+        for param in parts[1:]:
+            if param.startswith("q="):
+                try:
+                    return float(param[2:]) > 0.0
+                except ValueError:
+                    return False
+        return True
+    return False
+
+
+class PrometheusExporter:
+    """
+    Minimal asyncio HTTP server serving /metrics.
+    
+    Each collector caches its own rendered block until one of its metrics
+    changes, and the exporter caches the assembled body (and its gzip
+    encoding) until any collector generation moves. An idle scrape is
+    therefore one generation comparison per module.
+    """
+    
+    def __init__(
+        self,
+        collectors: Callable[[], Iterable[MetricsCollector]],
+        host: str = "127.0.0.1",
+        port: int = 9090,
+        path: str = "/metrics",
+        idle_timeout: float = 30.0
+    ):
+        self._collectors = collectors
+        self.host = host
+        self.port = port
+        self.path = path
+        self.idle_timeout = idle_timeout
+        
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._cache_key: Optional[Tuple] = None
+        self._body = b""
+        self._body_gzip: Optional[bytes] = None
+    
+    async def start(self):
+        """Start listening"""
+        if self._server:
+            return
+        
+        self._server = await asyncio.start_server(self._handle_client, self.host, self.port)
+        
+        # Resolve the bound port when started with port=0
+        sockets = self._server.sockets or []
+        if sockets:
+            self.port = sockets[0].getsockname()[1]
+        
+        logger.info(f"Metrics endpoint listening on http://{self.host}:{self.port}{self.path}")
+    
+    async def stop(self):
+        """Stop listening and close the server"""
+        if not self._server:
+            return
+        
+        self._server.close()
+        await self._server.wait_closed()
+        self._server = None
+        logger.info("Metrics endpoint stopped")
+    
+    @property
+    def is_running(self) -> bool:
+        return self._server is not None
+    
+    def render(self, compress: bool = False) -> bytes:
+        """
+        Render the exposition body, re-using cached output when no
+        collector changed since the last call.
+        """
+        collectors = list(self._collectors())
+        cache_key = tuple((id(c), c.generation) for c in collectors)
+        
+        if cache_key != self._cache_key:
+            blocks: List[str] = []
+            for collector in collectors:
+                block = collector.export_prometheus()
+                if block:
+                    blocks.append(block)
+            
+            self._body = ("\n".join(blocks) + "\n").encode("utf-8") if blocks else b""
+            self._body_gzip = None
+            self._cache_key = cache_key
+        
+        if not compress:
+            return self._body
+        
+        if self._body_gzip is None:
+            self._body_gzip = gzip.compress(self._body, compresslevel=6)
+        return self._body_gzip
+    
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serve requests on one connection (HTTP/1.1 keep-alive)"""
+        try:
+            while True:
+                try:
+                    request_line = await asyncio.wait_for(reader.readline(), self.idle_timeout)
+                except (asyncio.TimeoutError, ValueError):
+                    # Idle connection, or a line beyond the reader limit
+                    break
+                if not request_line:
+                    break
+                
+                headers = await self._read_headers(reader)
+                if headers is None:
+                    break
+                
+                keep_alive = await self._respond(writer, request_line, headers)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            pass
+        except Exception as e:
+            logger.error(f"Metrics request failed: {e}", exc_info=True)
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except Exception:
+                pass
+    
+    async def _read_headers(self, reader: asyncio.StreamReader) -> Optional[dict]:
+        """Read request headers; returns None on EOF, timeout or oversized request"""
+        headers = {}
+        for _ in range(100):
+            try:
+                line = await asyncio.wait_for(reader.readline(), self.idle_timeout)
+            except (asyncio.TimeoutError, ValueError):
+                return None
+            if not line:
+                return None
+            if line in (b"\r\n", b"\n"):
+                return headers
+            
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        
+        return None
+    
+    async def _respond(self, writer: asyncio.StreamWriter, request_line: bytes, headers: dict) -> bool:
+        """Write one response; returns whether the connection stays open"""
+        parts = request_line.decode("latin-1").split()
+        if len(parts) != 3:
+            self._write(writer, 400, b"bad request\n", keep_alive=False)
+            return False
+        
+        method, target, version = parts
+        keep_alive = (
+            version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+        ) or headers.get("connection", "").lower() == "keep-alive"
+        
+        if target.split("?", 1)[0] != self.path:
+            self._write(writer, 404, b"not found\n", keep_alive=keep_alive)
+            return keep_alive
+        
+        if method not in ("GET", "HEAD"):
+            self._write(writer, 405, b"method not allowed\n", keep_alive=keep_alive,
+                        extra_headers=[("Allow", "GET, HEAD")])
+            return keep_alive
+        
+        compress = _accepts_gzip(headers.get("accept-encoding", ""))
+        body = self.render(compress=compress)
+        
+        extra = [("Vary", "Accept-Encoding")]
+        if compress:
+            extra.append(("Content-Encoding", "gzip"))
+        
+        self._write(
+            writer, 200, body,
+            keep_alive=keep_alive,
+            content_type=CONTENT_TYPE,
+            extra_headers=extra,
+            head_only=(method == "HEAD")
+        )
+        return keep_alive
+    
+    @staticmethod
+    def _write(
+        writer: asyncio.StreamWriter,
+        status: int,
+        body: bytes,
+        keep_alive: bool,
+        content_type: str = "text/plain; charset=utf-8",
+        extra_headers: Optional[List[Tuple[str, str]]] = None,
+        head_only: bool = False
+    ):
+        """Serialize an HTTP/1.1 response"""
+        lines = [
+            f"HTTP/1.1 {status} {_REASONS.get(status, '')}",
+            f"Content-Type: {content_type}",
+            f"Content-Length: {len(body)}",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}",
+        ]
+        for name, value in extra_headers or ():
+            lines.append(f"{name}: {value}")
+        
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+        if not head_only:
+            writer.write(body)
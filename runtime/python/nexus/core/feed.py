@@ -0,0 +1,245 @@
+"""
+NEXUS v2 - Status Feed
+Addresses Review: Dashboards polled the full get_status payload every second
+
+Subscribers get one snapshot and then only changes:
+
+- module: a module's health entry when its status, state, ready or live
+  flag changes (pushed from the HealthTable; None when it is unloaded)
+- summary: the aggregate health counters after each module change
+- metric: a series whose value moved by more than the relative threshold
+  since it was last sent
+
+Each subscription coalesces pending changes by (kind, key): while a slow
+consumer's socket drains, newer values replace older ones instead of
+queueing, so a subscriber's backlog is bounded by the number of distinct
+series rather than the update rate.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .health import HealthTable
+from .metrics import MetricsCollector
+
+
+logger = logging.getLogger(__name__)
+
+
+class FeedSubscription:
+    """
+    One subscriber's view of the feed.
+    
+    Iterating yields the snapshot first, then delta batches of the form
+    {"type": "delta", "seq", "timestamp", "changes": [...], "coalesced"},
+    until the subscription or the feed is closed.
+    """
+    
+    def __init__(self, feed: "StatusFeed", snapshot: Dict[str, Any], metrics: bool = True, interval: float = 0.0):
+        self.metrics = metrics
+        self.interval = interval
+        
+        self._feed = feed
+        self._snapshot: Optional[Dict[str, Any]] = snapshot
+        self._pending: Dict[Tuple[str, str], Any] = {}
+        self._wakeup = asyncio.Event()
+        self._seq = 0
+        self._coalesced = 0
+        self._last_batch = 0.0
+        self.closed = False
+    
+    def push(self, kind: str, key: str, value: Any):
+        """Queue a change, replacing any unsent change for the same key"""
+        if self.closed or (kind == "metric" and not self.metrics):
+            return
+        
+        pending_key = (kind, key)
+        if pending_key in self._pending:
+            # Re-insert so batches stay in order of latest change
+            del self._pending[pending_key]
+            self._coalesced += 1
+        self._pending[pending_key] = value
+        self._wakeup.set()
+    
+    def close(self):
+        """Stop the subscription; a waiting iterator finishes"""
+        if self.closed:
+            return
+        self.closed = True
+        self._feed._unsubscribe(self)
+        self._wakeup.set()
+    
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+    
+    def __aiter__(self):
+        return self
+    
+    async def __anext__(self) -> Dict[str, Any]:
+        if self._snapshot is not None:
+            snapshot, self._snapshot = self._snapshot, None
+            return snapshot
+        
+        while not self._pending:
+            if self.closed:
+                raise StopAsyncIteration
+            self._wakeup.clear()
+            await self._wakeup.wait()
+        
+        if self.interval > 0:
+            # Rate-limit batches; changes arriving meanwhile coalesce
+            delay = self._last_batch + self.interval - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        
+        changes = [
+            {"kind": kind, "key": key, "value": value}
+            for (kind, key), value in self._pending.items()
+        ]
+        self._pending = {}
+        self._seq += 1
+        self._last_batch = time.monotonic()
+        
+        batch = {
+            "type": "delta",
+            "seq": self._seq,
+            "timestamp": time.time(),
+            "changes": changes,
+            "coalesced": self._coalesced,
+        }
+        self._coalesced = 0
+        return batch
+
+
+class StatusFeed:
+    """
+    Change feed over the health table and metric collectors.
+    
+    Health changes are pushed to subscribers as they happen; metrics are
+    sampled every metric_interval seconds, skipping collectors whose
+    generation has not moved.
+    """
+    
+    def __init__(
+        self,
+        table: HealthTable,
+        collectors: Callable[[], List[MetricsCollector]],
+        metric_interval: float = 1.0,
+        metric_threshold: float = 0.05
+    ):
+        self.table = table
+        self.metric_interval = metric_interval
+        self.metric_threshold = metric_threshold
+        
+        self._collectors = collectors
+        self._subscriptions: List[FeedSubscription] = []
+        self._table_unsubscribe: Optional[Callable[[], None]] = None
+        self._sampler: Optional[asyncio.Task] = None
+        
+        # Last value sent per metric series, and collector generations seen
+        self._metrics: Dict[str, float] = {}
+        self._generations: Dict[Tuple[str, int], int] = {}
+    
+    async def start(self):
+        """Follow the health table and start sampling metrics"""
+        if self._table_unsubscribe:
+            return
+        
+        self._table_unsubscribe = self.table.subscribe(self._on_health_change)
+        if self.metric_interval > 0:
+            self._sampler = asyncio.create_task(self._sample_loop(), name="nexus_status_feed")
+    
+    async def stop(self):
+        """Stop sampling and end every subscription"""
+        if self._table_unsubscribe:
+            self._table_unsubscribe()
+            self._table_unsubscribe = None
+        
+        if self._sampler:
+            self._sampler.cancel()
+            try:
+                await self._sampler
+            except asyncio.CancelledError:
+                pass
+            self._sampler = None
+        
+        for subscription in list(self._subscriptions):
+            subscription.close()
+    
+    def subscribe(self, metrics: bool = True, interval: float = 0.0) -> FeedSubscription:
+        """
+        Open a subscription.
+        
+        Args:
+            metrics: Include metric changes
+            interval: Minimum seconds between delta batches (0 = as soon
+                as the consumer is ready)
+        """
+        if metrics:
+            # Bring the baseline up to date so the snapshot is current
+            self.sample_metrics()
+        
+        snapshot = {
+            "type": "snapshot",
+            "seq": 0,
+            "timestamp": time.time(),
+            "modules": self.table.entries(),
+            "summary": self.table.statistics(),
+        }
+        if metrics:
+            snapshot["metrics"] = dict(self._metrics)
+        
+        subscription = FeedSubscription(self, snapshot, metrics=metrics, interval=interval)
+        self._subscriptions.append(subscription)
+        return subscription
+    
+    @property
+    def subscribers(self) -> int:
+        return len(self._subscriptions)
+    
+    def sample_metrics(self):
+        """Push metric series that moved past the threshold"""
+        threshold = self.metric_threshold
+        sent = self._metrics
+        generations = {}
+        
+        for collector in self._collectors():
+            key = (collector.module_id, id(collector))
+            generation = collector.generation
+            generations[key] = generation
+            if self._generations.get(key) == generation:
+                continue
+            
+            for series, value in collector.snapshot().items():
+                previous = sent.get(series)
+                if previous is not None and abs(value - previous) <= threshold * abs(previous):
+                    continue
+                sent[series] = value
+                self._push("metric", series, value)
+        
+        self._generations = generations
+    
+    def _on_health_change(self, module_id: str, old, new):
+        self._push("module", module_id, new)
+        self._push("summary", "health", self.table.statistics())
+    
+    def _push(self, kind: str, key: str, value: Any):
+        for subscription in self._subscriptions:
+            subscription.push(kind, key, value)
+    
+    def _unsubscribe(self, subscription: FeedSubscription):
+        if subscription in self._subscriptions:
+            self._subscriptions.remove(subscription)
+    
+    async def _sample_loop(self):
+        while True:
+            await asyncio.sleep(self.metric_interval)
+            if not self._subscriptions:
+                continue
+            try:
+                self.sample_metrics()
+            except Exception as e:
+                logger.error(f"Status feed metric sampling failed: {e}", exc_info=True)
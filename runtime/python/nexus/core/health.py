@@ -0,0 +1,306 @@
+"""
+NEXUS v2 - Health Aggregation
+Addresses Review: get_status() checks module health serially
+
+Health checks fan out concurrently under one overall deadline, and each
+module's last result is cached with its age. Status queries are served
+from the cache while results are younger than the staleness budget; an
+optional background refresher keeps the cache warm so frequent polling
+never waits on a module.
+
+Modules can also push health: state transitions and explicit
+_publish_health() calls land in a HealthTable that keeps its aggregate
+counters up to date incrementally, so readiness and summary queries are
+O(1) and never call into a module.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+HEALTH_STATUSES = ("healthy", "degraded", "unhealthy")
+
+HealthListener = Callable[[str, Optional[Dict[str, Any]], Optional[Dict[str, Any]]], None]
+
+
+class HealthTable:
+    """
+    Push-based health table with incrementally maintained aggregates.
+    
+    Each entry holds status, state, ready, live, details and updated_at.
+    Subscribers are called synchronously as listener(module_id, old, new)
+    whenever status, state, ready or live changes (new is None on
+    removal); they must not block.
+    """
+    
+    def __init__(self):
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._by_status: Dict[str, int] = {status: 0 for status in HEALTH_STATUSES}
+        self._by_state: Dict[str, int] = {}
+        self._ready = 0
+        self._listeners: List[HealthListener] = []
+    
+    def publish(
+        self,
+        module_id: str,
+        status: Optional[str] = None,
+        state: Optional[str] = None,
+        ready: Optional[bool] = None,
+        live: Optional[bool] = None,
+        details: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Update a module's entry; omitted fields keep their previous value.
+        
+        Raises:
+            ValueError: Unknown status
+        """
+        if status is not None and status not in self._by_status:
+            raise ValueError(f"Invalid health status: {status}")
+        
+        old = self._entries.get(module_id)
+        entry = dict(old) if old else {
+            "status": "degraded",
+            "state": "unloaded",
+            "ready": False,
+            "live": False,
+            "details": {},
+        }
+        
+        if status is not None:
+            entry["status"] = status
+        if state is not None:
+            entry["state"] = state
+        if ready is not None:
+            entry["ready"] = bool(ready)
+        if live is not None:
+            entry["live"] = bool(live)
+        if details is not None:
+            entry["details"] = details
+        entry["updated_at"] = time.time()
+        
+        if old:
+            self._count(old, -1)
+        self._count(entry, 1)
+        self._entries[module_id] = entry
+        
+        if old is None or any(
+            old[key] != entry[key] for key in ("status", "state", "ready", "live")
+        ):
+            self._notify(module_id, old, entry)
+    
+    def remove(self, module_id: str):
+        """Drop a module's entry (on unload)"""
+        old = self._entries.pop(module_id, None)
+        if old:
+            self._count(old, -1)
+            self._notify(module_id, old, None)
+    
+    def get(self, module_id: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(module_id)
+        return dict(entry) if entry else None
+    
+    def entries(self) -> Dict[str, Dict[str, Any]]:
+        return {module_id: dict(entry) for module_id, entry in self._entries.items()}
+    
+    def is_ready(self) -> bool:
+        """True when every known module is ready"""
+        return self._ready == len(self._entries)
+    
+    def statistics(self) -> Dict[str, Any]:
+        """Aggregate counters - O(number of statuses/states), not modules"""
+        stats: Dict[str, Any] = {"total": len(self._entries)}
+        stats.update(self._by_status)
+        stats["ready"] = self._ready
+        stats["by_state"] = {state: n for state, n in self._by_state.items() if n}
+        return stats
+    
+    def subscribe(self, listener: HealthListener) -> Callable[[], None]:
+        """Register a change listener; returns an unsubscribe callable"""
+        self._listeners.append(listener)
+        
+        def unsubscribe():
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+        
+        return unsubscribe
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def __contains__(self, module_id: str) -> bool:
+        return module_id in self._entries
+    
+    def _count(self, entry: Dict[str, Any], delta: int):
+        self._by_status[entry["status"]] += delta
+        self._by_state[entry["state"]] = self._by_state.get(entry["state"], 0) + delta
+        if entry["ready"]:
+            self._ready += delta
+    
+    def _notify(self, module_id: str, old, new):
+        for listener in list(self._listeners):
+            try:
+                listener(module_id, old, new)
+            except Exception as e:
+                logger.error(f"Health listener failed for {module_id}: {e}", exc_info=True)
+
+
+class HealthChecker:
+    """
+    Concurrent, cached health fan-out over module instances.
+    
+    Refreshes of the same module are single-flight: concurrent status
+    calls share one in-flight health() call instead of stacking up.
+    """
+    
+    def __init__(
+        self,
+        instances: Callable[[], Iterable],
+        timeout: float = 5.0,
+        max_age: float = 2.0,
+        refresh_interval: float = 1.0,
+        table: Optional[HealthTable] = None
+    ):
+        self._instances = instances
+        self.timeout = timeout
+        self.max_age = max_age
+        self.refresh_interval = refresh_interval
+        self.table = table
+        
+        # module_id -> (result, monotonic time of check, wall time of check)
+        self._cache: Dict[str, Tuple[Dict[str, Any], float, float]] = {}
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._refresher: Optional[asyncio.Task] = None
+    
+    async def start(self):
+        """Start the background refresher (if refresh_interval > 0)"""
+        if self._refresher or self.refresh_interval <= 0:
+            return
+        
+        self._refresher = asyncio.create_task(self._refresh_loop(), name="nexus_health_refresh")
+    
+    async def stop(self):
+        """Stop the refresher and cancel in-flight checks"""
+        if self._refresher:
+            self._refresher.cancel()
+            try:
+                await self._refresher
+            except asyncio.CancelledError:
+                pass
+            self._refresher = None
+        
+        for task in list(self._inflight.values()):
+            task.cancel()
+        self._inflight.clear()
+    
+    async def check_all(self, max_age: Optional[float] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Health of every module, refreshing entries older than max_age.
+        
+        Args:
+            max_age: Staleness budget in seconds (default: self.max_age;
+                0 forces a fresh check of every module)
+        
+        Returns:
+            module_id -> health dict, each with "checked_at",
+            "age_seconds" and "stale" (still older than max_age after
+            the deadline) added
+        """
+        if max_age is None:
+            max_age = self.max_age
+        
+        instances = {instance.manifest.id: instance for instance in self._instances()}
+        
+        # Forget modules that went away
+        for module_id in list(self._cache):
+            if module_id not in instances:
+                del self._cache[module_id]
+        
+        now = time.monotonic()
+        pending = []
+        for module_id, instance in instances.items():
+            cached = self._cache.get(module_id)
+            if cached is None or now - cached[1] > max_age:
+                pending.append(self._refresh(module_id, instance))
+        
+        if pending:
+            # One deadline for the whole fan-out; each check also has its
+            # own timeout, so stragglers finish on their own and fill the
+            # cache for the next call
+            await asyncio.wait(pending, timeout=self.timeout)
+        
+        return {
+            module_id: self._entry(module_id, max_age)
+            for module_id in instances
+        }
+    
+    def cached(self, module_id: str) -> Optional[Dict[str, Any]]:
+        """Last known health of a module without checking it"""
+        if module_id not in self._cache:
+            return None
+        return self._entry(module_id, self.max_age)
+    
+    def _refresh(self, module_id: str, instance) -> asyncio.Task:
+        task = self._inflight.get(module_id)
+        if task is None:
+            task = asyncio.create_task(
+                self._check(module_id, instance), name=f"nexus_health_{module_id}"
+            )
+            self._inflight[module_id] = task
+        return task
+    
+    async def _check(self, module_id: str, instance):
+        try:
+            result = await asyncio.wait_for(instance.health(), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            result = {"status": "unhealthy", "error": "health check timeout"}
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            result = {"status": "unhealthy", "error": str(e)}
+        finally:
+            self._inflight.pop(module_id, None)
+        
+        self._cache[module_id] = (result, time.monotonic(), time.time())
+        
+        # Pulled results update the push table too, for modules that
+        # never publish on their own
+        if self.table is not None and module_id in self.table:
+            status = result.get("status")
+            self.table.publish(
+                module_id,
+                status=status if status in HEALTH_STATUSES else "unhealthy",
+                ready=result.get("ready"),
+                live=result.get("live")
+            )
+    
+    def _entry(self, module_id: str, max_age: float) -> Dict[str, Any]:
+        cached = self._cache.get(module_id)
+        if cached is None:
+            # First check still running past the deadline
+            return {
+                "status": "unhealthy",
+                "error": "health check timeout",
+                "checked_at": None,
+                "age_seconds": None,
+                "stale": True
+            }
+        
+        result, checked, checked_at = cached
+        entry = dict(result)
+        entry["checked_at"] = checked_at
+        entry["age_seconds"] = time.monotonic() - checked
+        entry["stale"] = entry["age_seconds"] > max_age
+        return entry
+    
+    async def _refresh_loop(self):
+        while True:
+            try:
+                await self.check_all(max_age=self.refresh_interval)
+            except Exception as e:
+                logger.error(f"Health refresh failed: {e}", exc_info=True)
+            await asyncio.sleep(self.refresh_interval)
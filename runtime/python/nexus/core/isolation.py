@@ -0,0 +1,549 @@
+"""
+NEXUS v2 - Process-Isolated Modules
+Addresses Review: One interpreter and one GIL for every module
+
+A module whose execution mode is "process" (manifest field `execution`,
+or the "execution" config key) is hosted in a worker process of its
+own. The daemon registers a ProcessModuleProxy in its place: a
+BaseModule that forwards init/load/start/stop/unload/health to the real
+module, so the loader, health checks and status see an ordinary module.
+The module itself is unchanged.
+
+    worker process                         daemon
+    ------------------------------         ------------------------------
+    module + its own loop, timers,         ProcessModuleProxy
+    bus, health table, RpcRouter
+    lifecycle / health calls       <-----  RPC "nexus.worker:<id>"
+    state + health changes         ----->  RPC "nexus.host:<id>", mirrored
+                                           into the proxy and health table
+    RPC calls it makes             ----->  daemon router (upstream)
+    capabilities it serves         <-----  routed from the daemon router
+    provides topics                ----->  RingChannel -> daemon bus
+    consumes topics                <-----  daemon bus -> RingChannel
+                                           (opened on first publish /
+                                           subscribe in the worker)
+    metrics                        ----->  shared-memory segment, merged
+                                           at scrape time
+
+Workers are started with the "spawn" method by default (config key
+worker_start_method) so they never inherit the daemon's event loop. The
+module's init context holds its resolved config section and any
+persisted state; the daemon registry is not available in the worker.
+If a worker dies, the proxy goes to FAILED.
+
+provides/consumes also name RPC capabilities, so a topic gets its ring
+only once the worker first publishes on it (provides) or subscribes to
+it (consumes). The daemon creates the ring and hands it over in the
+reply to the worker's "ring" call.
+"""
+
+import asyncio
+import importlib
+import logging
+import multiprocessing
+import os
+import pickle
+import socket
+import time
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Type
+
+from .bus import MessageBus
+from .config import ConfigurationManager
+from .health import HealthTable
+from .metrics import MetricsCollector, MetricsRegistry
+from .module import BaseModule, ModuleManifest, ModuleState
+from .ring import RingChannel, forward_topic, receive_topic
+from .rpc import RpcChannel, RpcRouter
+from .shared_metrics import SharedMetricsAggregator, use_shared_registry
+from .timers import TimerService
+
+
+logger = logging.getLogger(__name__)
+
+WORKER_CAPABILITY = "nexus.worker"
+HOST_CAPABILITY = "nexus.host"
+
+DEFAULT_CALL_TIMEOUT = 60.0
+DEFAULT_RING_BYTES = 1 << 20
+EXIT_TIMEOUT = 5.0
+
+
+def _usage(instance: BaseModule) -> Dict[str, Any]:
+    """Resource usage of the whole worker process"""
+    usage = dict(instance._resource_usage)
+    usage["cpu_seconds"] = time.process_time()
+    try:
+        with open("/proc/self/statm") as f:
+            usage["memory_mb"] = int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        pass
+    return usage
+
+
+class ProcessModuleProxy(BaseModule):
+    """
+    Stand-in for a module hosted in a worker process.
+    
+    Created by ModuleLifecycleManager for modules whose execution mode is
+    "process"; not discovered as a module itself.
+    """
+    
+    def __init__(
+        self,
+        manifest: ModuleManifest,
+        module_class: Type[BaseModule],
+        worker_metrics: Optional[SharedMetricsAggregator] = None
+    ):
+        super().__init__(manifest)
+        self.module_class = module_class
+        self._worker_metrics = worker_metrics
+        self._control = f"{WORKER_CAPABILITY}:{manifest.id}"
+        self._host = f"{HOST_CAPABILITY}:{manifest.id}"
+        
+        self._process: Optional[multiprocessing.Process] = None
+        self._channel: Optional[RpcChannel] = None
+        self._router: Optional[RpcRouter] = None
+        self._segment: Optional[str] = None
+        self._outbound: List[Tuple[str, RingChannel]] = []
+        self._inbound: List[Tuple[str, RingChannel]] = []
+        self._exiting = False
+        
+        self._call_timeout = DEFAULT_CALL_TIMEOUT
+        self._ring_bytes = DEFAULT_RING_BYTES
+        self._start_method = "spawn"
+    
+    @classmethod
+    def get_manifest(cls) -> ModuleManifest:
+        raise TypeError("ProcessModuleProxy takes the manifest of the module it hosts")
+    
+    @property
+    def worker_pid(self) -> Optional[int]:
+        return self._process.pid if self._process else None
+    
+    async def init(self, context: Dict[str, Any]):
+        """
+        Start the worker process and initialize the module in it.
+        """
+        config: ConfigurationManager = context["config"]
+        module_id = self.manifest.id
+        self._call_timeout = config.get(module_id, "worker_timeout_s", default=DEFAULT_CALL_TIMEOUT, expected_type=float)
+        self._ring_bytes = config.get(module_id, "topic_ring_bytes", default=DEFAULT_RING_BYTES, expected_type=int)
+        self._start_method = config.get(module_id, "worker_start_method", default="spawn", expected_type=str)
+        
+        try:
+            await self._start_worker(config)
+            extra = {
+                key: value for key, value in context.items()
+                if key not in ("config", "registry") and _picklable(value)
+            }
+            await self._control_call("init", extra)
+        except Exception:
+            await self._stop_worker()
+            raise
+    
+    async def load(self, context: Dict[str, Any]):
+        """Load the module in the worker"""
+        try:
+            await self._control_call("load")
+        except Exception:
+            await self._stop_worker()
+            raise
+    
+    async def start(self):
+        """Start the module in the worker and attach its capabilities and topics"""
+        await self._control_call("start")
+        
+        router = self._router
+        for capability in self.manifest.provides:
+            try:
+                router.route(capability, self._channel, owner=self.manifest.id)
+            except ValueError as e:
+                self.logger.warning(f"Not routing {capability} to worker: {e}")
+    
+    async def stop(self):
+        """Stop the module in the worker"""
+        await self._control_call("stop")
+    
+    async def unload(self):
+        """Unload the module and stop the worker - idempotent"""
+        try:
+            if self._channel is not None and not self._channel.closed:
+                await self._control_call("unload")
+        finally:
+            await self._stop_worker()
+            if self._state != ModuleState.UNLOADED:
+                self._set_state(ModuleState.UNLOADED)
+    
+    async def health(self) -> Dict[str, Any]:
+        """Health of the module in the worker, plus worker process details"""
+        if self._channel is None or self._channel.closed:
+            return {
+                "status": "unhealthy",
+                "ready": False,
+                "live": False,
+                "details": {"worker": "not running"}
+            }
+        
+        reply = await self._router.call(self._control, "health", timeout=self._call_timeout)
+        self._resource_usage.update(reply["resource_usage"])
+        health = reply["health"]
+        details = dict(health.get("details") or {})
+        details["worker_pid"] = self.worker_pid
+        health["details"] = details
+        return health
+    
+    def _open_executor(self):
+        """Blocking calls run on the worker's executor, not the daemon's"""
+    
+    # Worker management
+    
+    async def _start_worker(self, config: ConfigurationManager):
+        self._router = self._rpc_router or RpcRouter()
+        
+        if self._worker_metrics is not None:
+            self._segment = self._worker_metrics.create_segment()
+        
+        secret_provider = config._secret_provider
+        spec = {
+            "module": self.module_class.__module__,
+            "qualname": self.module_class.__qualname__,
+            "manifest": self.manifest,
+            "config": config.get_section(self.manifest.id),
+            "secret_provider": secret_provider if _picklable(secret_provider) else None,
+            "security_context": self._security_context,
+            "metrics_segment": self._segment,
+            "bridge_topics": self._message_bus is not None and self._ring_bytes > 0,
+            "log_level": logging.getLogger().getEffectiveLevel(),
+        }
+        
+        parent_sock, child_sock = socket.socketpair()
+        context = multiprocessing.get_context(self._start_method)
+        process = context.Process(
+            target=run_worker,
+            args=(child_sock, spec),
+            name=f"nexus-{self.manifest.id}",
+            daemon=True
+        )
+        try:
+            process.start()
+        except Exception:
+            parent_sock.close()
+            raise
+        finally:
+            child_sock.close()
+        # Set only once started: _stop_worker() reaps it via its sentinel
+        self._process = process
+        self.logger.info(f"Worker process started (pid {self._process.pid})")
+        
+        self._channel = RpcChannel(self._router, parent_sock, name=self.manifest.id)
+        await self._channel.open()
+        self._router.route(self._control, self._channel, owner=self._control)
+        self._router.serve(self._host, "events", self._on_worker_events, owner=self._host, batch=True)
+        self._router.serve(self._host, "ring", self._open_ring, owner=self._host)
+        asyncio.get_running_loop().add_reader(self._process.sentinel, self._on_worker_exit)
+    
+    async def _stop_worker(self):
+        """Ask the worker to exit, then reap it and release its resources"""
+        self._exiting = True
+        process = self._process
+        
+        if self._channel is not None:
+            if not self._channel.closed:
+                try:
+                    await self._router.call(self._control, "exit", timeout=EXIT_TIMEOUT)
+                except Exception as e:
+                    self.logger.warning(f"Worker did not acknowledge exit: {e}")
+            await self._channel.close()
+            self._channel = None
+        if self._router is not None:
+            self._router.unserve_owner(self._control)
+            self._router.unserve_owner(self._host)
+        
+        if process is not None and process.pid is not None:
+            loop = asyncio.get_running_loop()
+            loop.remove_reader(process.sentinel)
+            await loop.run_in_executor(None, process.join, EXIT_TIMEOUT)
+            if process.is_alive():
+                self.logger.warning(f"Worker {process.pid} did not exit, killing it")
+                process.kill()
+                await loop.run_in_executor(None, process.join)
+        self._process = None
+        
+        self._close_subscriptions()
+        await self._cancel_background_tasks()
+        for _, ring in self._outbound + self._inbound:
+            ring.close()
+        self._outbound, self._inbound = [], []
+        if self._segment is not None:
+            self._worker_metrics.release_segment(self._segment)
+            self._segment = None
+    
+    async def _control_call(self, method: str, payload: Any = None):
+        reply = await self._router.call(self._control, method, payload, timeout=self._call_timeout)
+        self._resource_usage.update(reply["resource_usage"])
+        self._mirror_state(reply["state"])
+        return reply
+    
+    def _mirror_state(self, value: str):
+        state = ModuleState(value)
+        if state != self._state:
+            self._set_state(state)
+    
+    def _on_worker_events(self, events: List[Tuple[str, Any]]) -> List[None]:
+        """State and health changes pushed by the worker, in order"""
+        for kind, value in events:
+            if kind == "state":
+                self._mirror_state(value)
+            elif kind == "health":
+                self._publish_health(**value)
+        return [None] * len(events)
+    
+    def _open_ring(self, request: Tuple[str, str]) -> RingChannel:
+        """
+        Ring for one topic, requested by the worker on first use:
+        "out" carries a provides topic into the daemon bus, "in" a
+        consumes topic from it.
+        """
+        direction, topic = request
+        declared = self.manifest.provides if direction == "out" else self.manifest.consumes
+        if topic not in declared:
+            raise ValueError(f"{topic!r} is not declared in {'provides' if direction == 'out' else 'consumes'}")
+        if self._message_bus is None or self._ring_bytes <= 0:
+            raise RuntimeError("Topic bridging is disabled")
+        
+        ring = RingChannel.create(self._ring_bytes)
+        if direction == "out":
+            self._outbound.append((topic, ring))
+            self._spawn_background_task(
+                receive_topic(self._message_bus, topic, ring),
+                name=f"{self.manifest.id}_ring_{topic}"
+            )
+        else:
+            self._inbound.append((topic, ring))
+            forward_topic(self._message_bus, topic, ring, owner=self.manifest.id,
+                          spawn=self._spawn_background_task)
+        return ring
+    
+    def _on_worker_exit(self):
+        process = self._process
+        asyncio.get_running_loop().remove_reader(process.sentinel)
+        if self._exiting:
+            return
+        # The sentinel fires as the process exits; reaping follows at once
+        process.join(0.1)
+        self._last_error = RuntimeError(f"Worker process {process.pid} exited with code {process.exitcode}")
+        self.logger.error(str(self._last_error))
+        if self._state != ModuleState.FAILED:
+            self._set_state(ModuleState.FAILED)
+
+
+def _picklable(value: Any) -> bool:
+    try:
+        pickle.dumps(value)
+        return True
+    except Exception:
+        return False
+
+
+# Worker process side
+
+
+class _WorkerBus(MessageBus):
+    """
+    Worker bus that calls open_ring(direction, topic) the first time a
+    topic is published ("out") or subscribed to ("in") by the module.
+    """
+    
+    def __init__(self, metrics: MetricsCollector, open_ring: Callable[[str, str], None]):
+        super().__init__(metrics)
+        self._open_ring = open_ring
+        self._carried: Set[Tuple[str, str]] = set()
+    
+    def publish_nowait(self, topic: str, message: Any) -> int:
+        self._carry("out", topic)
+        return super().publish_nowait(topic, message)
+    
+    async def publish(self, topic: str, message: Any) -> int:
+        self._carry("out", topic)
+        return await super().publish(topic, message)
+    
+    def subscribe(self, topic: str, handler: Callable, owner: Optional[str] = None, **options):
+        subscription = super().subscribe(topic, handler, owner=owner, **options)
+        if owner != WORKER_CAPABILITY:
+            self._carry("in", topic)
+        return subscription
+    
+    def _carry(self, direction: str, topic: str):
+        if (direction, topic) not in self._carried:
+            self._carried.add((direction, topic))
+            self._open_ring(direction, topic)
+
+def run_worker(sock: socket.socket, spec: Dict[str, Any]):
+    """Worker process entry point"""
+    logging.basicConfig(
+        level=spec["log_level"],
+        format=f"%(asctime)s [{spec['manifest'].id} pid %(process)d] %(name)s %(levelname)s %(message)s"
+    )
+    if spec["metrics_segment"]:
+        use_shared_registry(spec["metrics_segment"])
+    asyncio.run(_host(sock, spec))
+
+
+async def _host(sock: socket.socket, spec: Dict[str, Any]):
+    manifest: ModuleManifest = spec["manifest"]
+    module = importlib.import_module(spec["module"])
+    module_class = module
+    for part in spec["qualname"].split("."):
+        module_class = getattr(module_class, part)
+    
+    config = ConfigurationManager(spec["secret_provider"])
+    config.register_module_defaults(manifest.id, spec["config"])
+    
+    # The worker's own bus and router stay off the shared segment: the
+    # daemon exports "bus" and "rpc" collectors of its own, and the same
+    # families from a worker would be emitted twice
+    private = MetricsRegistry()
+    router = RpcRouter(MetricsCollector("rpc", private))
+    channel = RpcChannel(router, sock, name="daemon")
+    await channel.open()
+    router.set_upstream(channel)
+    
+    timers = TimerService()
+    host = f"{HOST_CAPABILITY}:{manifest.id}"
+    rings: List[RingChannel] = []
+    pumps: List[asyncio.Task] = []
+    
+    def open_ring(direction: str, topic: str):
+        declared = manifest.provides if direction == "out" else manifest.consumes
+        if not spec["bridge_topics"] or topic not in declared:
+            return
+        
+        requested = asyncio.ensure_future(
+            router.call(host, "ring", (direction, topic), timeout=DEFAULT_CALL_TIMEOUT)
+        )
+        subscription = None
+        
+        if direction == "out":
+            # Subscribed now, so nothing published before the ring arrives is lost
+            async def send(messages):
+                ring = await requested
+                for message in messages:
+                    if not await ring.write(pickle.dumps(message)):
+                        logger.warning(f"Ring {ring.name} full, dropped a {topic} message")
+            
+            subscription = bus.subscribe(topic, send, owner=WORKER_CAPABILITY)
+        else:
+            async def pump():
+                await receive_topic(bus, topic, await requested)
+            
+            pumps.append(asyncio.create_task(pump(), name=f"ring_{topic}"))
+        
+        def opened(future):
+            if future.cancelled():
+                return
+            if future.exception() is None:
+                rings.append(future.result())
+                return
+            logger.error(f"No ring for {topic}: {future.exception()}")
+            if subscription is not None:
+                subscription.close()
+        
+        requested.add_done_callback(opened)
+    
+    bus = _WorkerBus(MetricsCollector("bus", private), open_ring)
+    health_table = HealthTable()
+    
+    instance = module_class(manifest)
+    if spec["security_context"] is not None:
+        instance.security_context = spec["security_context"]
+    instance.health_table = health_table
+    instance.timer_service = timers
+    instance.message_bus = bus
+    instance.rpc_router = router
+    
+    def on_health(module_id, old, new):
+        if new is not None:
+            router.notify(host, "events", ("health", {
+                "status": new["status"], "ready": new["ready"], "live": new["live"], "details": new["details"]
+            }))
+    
+    health_table.subscribe(on_health)
+    instance.subscribe_state(lambda module, old, new: router.notify(host, "events", ("state", new.value)))
+    
+    exiting = asyncio.Event()
+    
+    def reply():
+        return {"state": instance.state.value, "resource_usage": _usage(instance)}
+    
+    def cleanup():
+        instance._cancel_timers()
+        instance._close_subscriptions()
+        instance._close_rpc()
+    
+    async def init(extra):
+        await instance._accounted(instance.init({"config": config, **(extra or {})}))
+        return reply()
+    
+    async def load(_):
+        instance._open_executor()
+        await instance._accounted(instance.load({"config": config}))
+        return reply()
+    
+    async def start(_):
+        await instance._accounted(instance.start())
+        return reply()
+    
+    async def stop(_):
+        try:
+            await instance._accounted(instance.stop())
+        finally:
+            cleanup()
+        return reply()
+    
+    async def unload(_):
+        try:
+            await instance._accounted(instance.unload())
+        finally:
+            cleanup()
+            await instance._shutdown_executor()
+        return reply()
+    
+    async def health(_):
+        return {"health": await instance.health(), "resource_usage": _usage(instance)}
+    
+    def exit_(_):
+        exiting.set()
+        return reply()
+    
+    control = f"{WORKER_CAPABILITY}:{manifest.id}"
+    for name, handler in (
+        ("init", init), ("load", load), ("start", start), ("stop", stop),
+        ("unload", unload), ("health", health), ("exit", exit_),
+    ):
+        router.serve(control, name, handler, owner=WORKER_CAPABILITY)
+    
+    # Run until told to exit or the daemon goes away
+    waiters = [asyncio.create_task(exiting.wait()), asyncio.create_task(channel.wait_closed())]
+    await asyncio.wait(waiters, return_when=asyncio.FIRST_COMPLETED)
+    
+    if instance.state == ModuleState.STARTED:
+        logger.warning("Daemon went away, stopping module")
+        try:
+            await instance.stop()
+            await instance.unload()
+        except Exception as e:
+            logger.error(f"Shutdown after daemon loss failed: {e}")
+        cleanup()
+        await instance._shutdown_executor()
+    
+    # Let the exit reply flush before closing
+    await asyncio.sleep(0.01)
+    for task in pumps + waiters:
+        task.cancel()
+    await asyncio.gather(*pumps, *waiters, return_exceptions=True)
+    await channel.close()
+    router.close()
+    bus.close()
+    timers.close()
+    for ring in rings:
+        ring.close()
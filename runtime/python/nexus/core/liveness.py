@@ -0,0 +1,104 @@
+"""
+NEXUS v2 - Liveness Stamp Writer
+Addresses Review: Liveness depended on module health checks
+
+Refreshes the memory-mapped stamp described in aeon_interface/stamp.py
+from a task on the daemon's event loop. Updating it is a struct pack into
+shared memory - no syscall - and a stuck loop stops the stamp, which is
+exactly what a liveness probe should detect.
+"""
+
+import asyncio
+import logging
+import mmap
+import os
+import struct
+import time
+from pathlib import Path
+from typing import Optional
+
+from ..aeon_interface import stamp as layout
+
+
+logger = logging.getLogger(__name__)
+
+_SEQ = struct.Struct("<I")
+# Everything after magic and seq: pid, state, pad, stamp, interval, started
+_BODY = struct.Struct("<QIIddd")
+_BODY_OFFSET = 8
+
+
+class LivenessStamp:
+    """Owner side of the liveness stamp file"""
+    
+    def __init__(self, path: Optional[str] = None, interval: float = 1.0):
+        self.path = Path(layout.stamp_path(path))
+        self.interval = interval
+        
+        self._map: Optional[mmap.mmap] = None
+        self._task: Optional[asyncio.Task] = None
+        self._seq = 0
+        self._state = layout.STATE_STOPPED
+        self._started = 0.0
+    
+    async def start(self, state: int = layout.STATE_RUNNING):
+        """Create the stamp file and start refreshing it"""
+        if self._task:
+            self.set_state(state)
+            return
+        
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            os.ftruncate(fd, layout.SIZE)
+            self._map = mmap.mmap(fd, layout.SIZE)
+        finally:
+            os.close(fd)
+        
+        self._started = time.time()
+        self.set_state(state)
+        self._task = asyncio.create_task(self._refresh_loop(), name="nexus_liveness_stamp")
+        logger.info(f"Liveness stamp at {self.path} (every {self.interval}s)")
+    
+    async def stop(self):
+        """Mark the daemon stopped and release the mapping"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        
+        if self._map is not None:
+            self.set_state(layout.STATE_STOPPED)
+            self._map.close()
+            self._map = None
+    
+    def set_state(self, state: int):
+        self._state = state
+        self.touch()
+    
+    def touch(self):
+        """
+        Write a fresh stamp (seqlock: odd while writing). The fields go in
+        first and the even seq last, so a reader that sees the same even
+        seq before and after its read has a consistent stamp.
+        """
+        if self._map is None:
+            return
+        
+        self._seq += 1
+        self._map[0:4] = layout.MAGIC
+        _SEQ.pack_into(self._map, 4, self._seq)
+        _BODY.pack_into(
+            self._map, _BODY_OFFSET, os.getpid(), self._state, 0,
+            time.time(), self.interval, self._started
+        )
+        self._seq += 1
+        _SEQ.pack_into(self._map, 4, self._seq)
+    
+    async def _refresh_loop(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            self.touch()
@@ -8,13 +8,20 @@ import importlib
 import inspect
 import json
 import logging
-from typing import Dict, List, Optional, Set, Type
+from typing import Any, Callable, Dict, KeysView, List, Optional, Set, Type, ValuesView
 from pathlib import Path
 from abc import ABC, abstractmethod
 
 from .module import BaseModule, ModuleManifest, ModuleState, SecurityContext
+from .bus import MessageBus
+from .rpc import RpcRouter
 from .resolver import DependencyResolver
 from .config import ConfigurationManager
+from .health import HealthTable
+from .isolation import ProcessModuleProxy
+from .shared_metrics import SharedMetricsAggregator
+from .timers import TimerService
+from .tracing import get_tracer
 
 
 logger = logging.getLogger(__name__)
@@ -88,16 +95,41 @@ class ModuleRegistry:
     """
     Module registry - separation of concerns.
     Addresses Review: God Class
+    
+    Besides the flat dicts keyed by module id, the registry keeps
+    secondary indexes so lookups never scan every module:
+    
+    - provides capability -> module ids (from manifests)
+    - group -> module ids (from manifests)
+    - ModuleState -> instances, kept current by a state listener on
+      every registered instance
+    
+    Index views returned by get_providers/get_group/instances are live
+    and read-only; copy them before awaiting if modules may (un)load
+    meanwhile.
     """
     
     def __init__(self):
         self._manifests: Dict[str, ModuleManifest] = {}
         self._classes: Dict[str, Type[BaseModule]] = {}
         self._instances: Dict[str, BaseModule] = {}
+        
+        # Secondary indexes; dicts as insertion-ordered sets
+        self._by_capability: Dict[str, Dict[str, None]] = {}
+        self._by_group: Dict[str, Dict[str, None]] = {}
+        self._by_state: Dict[ModuleState, Dict[str, BaseModule]] = {state: {} for state in ModuleState}
+        self._unsubscribe: Dict[str, Callable[[], None]] = {}
     
     def register_manifest(self, manifest: ModuleManifest):
         """Register module manifest"""
+        previous = self._manifests.get(manifest.id)
+        if previous is not None:
+            self._unindex_manifest(previous)
+        
         self._manifests[manifest.id] = manifest
+        for capability in manifest.provides:
+            self._by_capability.setdefault(capability, {})[manifest.id] = None
+        self._by_group.setdefault(manifest.group, {})[manifest.id] = None
     
     def register_class(self, module_id: str, module_class: Type[BaseModule]):
         """Register module class"""
@@ -105,12 +137,22 @@ class ModuleRegistry:
     
     def register_instance(self, module_id: str, instance: BaseModule):
         """Register module instance"""
+        self.unregister_instance(module_id)
+        
         self._instances[module_id] = instance
+        self._by_state[instance.state][module_id] = instance
+        self._unsubscribe[module_id] = instance.subscribe_state(self._on_state_change)
     
     def unregister_instance(self, module_id: str):
         """Unregister module instance"""
-        if module_id in self._instances:
-            del self._instances[module_id]
+        instance = self._instances.pop(module_id, None)
+        if instance is None:
+            return
+        
+        self._by_state[instance.state].pop(module_id, None)
+        unsubscribe = self._unsubscribe.pop(module_id, None)
+        if unsubscribe is not None:
+            unsubscribe()
     
     def get_manifest(self, module_id: str) -> Optional[ModuleManifest]:
         """Get module manifest"""
@@ -129,8 +171,77 @@ class ModuleRegistry:
         return list(self._manifests.values())
     
     def get_all_instances(self) -> List[BaseModule]:
-        """Get all registered instances"""
+        """Get all registered instances (a copy - see instances())"""
         return list(self._instances.values())
+    
+    def instances(self) -> ValuesView[BaseModule]:
+        """Live view of registered instances - no copy"""
+        return self._instances.values()
+    
+    def instance_ids(self) -> KeysView[str]:
+        """Live view of registered instance ids - no copy"""
+        return self._instances.keys()
+    
+    def get_providers(self, capability: str) -> KeysView[str]:
+        """Ids of modules whose manifest provides capability - O(1)"""
+        return self._by_capability.get(capability, {}).keys()
+    
+    def get_provider(self, capability: str) -> Optional[BaseModule]:
+        """
+        First loaded instance providing capability, preferring one that
+        is started.
+        """
+        fallback = None
+        for module_id in self._by_capability.get(capability, ()):
+            instance = self._instances.get(module_id)
+            if instance is None:
+                continue
+            if instance.state == ModuleState.STARTED:
+                return instance
+            fallback = fallback or instance
+        return fallback
+    
+    def get_group(self, group: str) -> KeysView[str]:
+        """Ids of modules in group - O(1)"""
+        return self._by_group.get(group, {}).keys()
+    
+    def get_instances_by_state(self, state: ModuleState) -> ValuesView[BaseModule]:
+        """Live view of instances currently in state - O(1)"""
+        return self._by_state[state].values()
+    
+    def count_by_state(self) -> Dict[str, int]:
+        """Instance count per state - O(number of states), not modules"""
+        return {state.value: len(ids) for state, ids in self._by_state.items() if ids}
+    
+    @property
+    def manifest_count(self) -> int:
+        return len(self._manifests)
+    
+    @property
+    def instance_count(self) -> int:
+        return len(self._instances)
+    
+    # Index maintenance
+    
+    def _on_state_change(self, instance: BaseModule, old_state: ModuleState, new_state: ModuleState):
+        module_id = instance.manifest.id
+        if self._instances.get(module_id) is not instance:
+            return
+        self._by_state[old_state].pop(module_id, None)
+        self._by_state[new_state][module_id] = instance
+    
+    def _unindex_manifest(self, manifest: ModuleManifest):
+        for capability in manifest.provides:
+            providers = self._by_capability.get(capability)
+            if providers is not None:
+                providers.pop(manifest.id, None)
+                if not providers:
+                    del self._by_capability[capability]
+        members = self._by_group.get(manifest.group)
+        if members is not None:
+            members.pop(manifest.id, None)
+            if not members:
+                del self._by_group[manifest.group]
 
 
 class ModuleDiscovery:
@@ -200,11 +311,22 @@ class ModuleLifecycleManager:
         self,
         registry: ModuleRegistry,
         config: ConfigurationManager,
-        state_store: Optional[StateStore] = None
+        state_store: Optional[StateStore] = None,
+        health_table: Optional[HealthTable] = None,
+        timers: Optional[TimerService] = None,
+        bus: Optional[MessageBus] = None,
+        rpc: Optional[RpcRouter] = None
     ):
         self.registry = registry
         self.config = config
         self.state_store = state_store
+        self.health_table = health_table
+        self.timers = timers
+        self.bus = bus
+        self.rpc = rpc
+        # Set by the daemon so worker-process modules report metrics
+        self.worker_metrics: Optional[SharedMetricsAggregator] = None
+        self.tracer = get_tracer()
     
     async def load_single_module(
         self,
@@ -242,10 +364,24 @@ class ModuleLifecycleManager:
             # Register module defaults
             self.config.register_module_defaults(module_id, manifest.config_keys)
             
-            # Instantiate
-            instance = module_class(manifest)
+            # Instantiate, in a worker process if configured
+            execution = self.config.get(module_id, "execution", default=manifest.execution, expected_type=str)
+            if execution == "process":
+                instance = ProcessModuleProxy(manifest, module_class, self.worker_metrics)
+            elif execution == "inprocess":
+                instance = module_class(manifest)
+            else:
+                raise ValueError(f"Module {module_id}: unknown execution mode {execution!r}")
             if security_context:
                 instance.security_context = security_context
+            if self.health_table is not None:
+                instance.health_table = self.health_table
+            if self.timers is not None:
+                instance.timer_service = self.timers
+            if self.bus is not None:
+                instance.message_bus = self.bus
+            if self.rpc is not None:
+                instance.rpc_router = self.rpc
             
             self.registry.register_instance(module_id, instance)
             
@@ -256,16 +392,20 @@ class ModuleLifecycleManager:
                     context['persisted_state'] = state
                     logger.info(f"Loaded persisted state for {module_id}")
             
-            # init phase
-            logger.info(f"[{module_id}] Initializing...")
-            await instance.init(context)
-            
-            if instance.state != ModuleState.LOADED:
-                raise RuntimeError(f"Module {module_id} not in LOADED state after init")
-            
-            # load phase
-            logger.info(f"[{module_id}] Loading...")
-            await instance.load(context)
+            with self.tracer.span("module.load", {"nexus.module.id": module_id}):
+                # init phase
+                logger.info(f"[{module_id}] Initializing...")
+                with self.tracer.span("module.init", {"nexus.module.id": module_id}):
+                    await instance._accounted(instance.init(context))
+                
+                if instance.state != ModuleState.LOADED:
+                    raise RuntimeError(f"Module {module_id} not in LOADED state after init")
+                
+                # load phase
+                logger.info(f"[{module_id}] Loading...")
+                with self.tracer.span("module.load_resources", {"nexus.module.id": module_id}):
+                    instance._open_executor()
+                    await instance._accounted(instance.load(context))
             
             logger.info(f"[{module_id}] Loaded successfully")
             return True
@@ -274,9 +414,10 @@ class ModuleLifecycleManager:
             logger.error(f"Failed to load module {module_id}: {e}", exc_info=True)
             
             # Mark as failed
-            if module_id in self.registry._instances:
-                self.registry._instances[module_id]._set_state(ModuleState.FAILED)
-                self.registry._instances[module_id]._last_error = e
+            failed = self.registry.get_instance(module_id)
+            if failed is not None:
+                failed._set_state(ModuleState.FAILED)
+                failed._last_error = e
             
             raise  # Re-raise instead of returning False
     
@@ -293,7 +434,8 @@ class ModuleLifecycleManager:
                 )
             
             logger.info(f"[{module_id}] Starting...")
-            await instance.start()
+            with self.tracer.span("module.start", {"nexus.module.id": module_id}):
+                await instance._accounted(instance.start())
             
             if instance.state == ModuleState.STARTED:
                 logger.info(f"[{module_id}] Started successfully")
@@ -319,7 +461,13 @@ class ModuleLifecycleManager:
             logger.info(f"[{module_id}] Stopping...")
             
             try:
-                await asyncio.wait_for(instance.stop(), timeout=timeout)
+                with self.tracer.span("module.stop", {"nexus.module.id": module_id}):
+                    try:
+                        await asyncio.wait_for(instance._accounted(instance.stop()), timeout=timeout)
+                    finally:
+                        instance._cancel_timers()
+                        instance._close_subscriptions()
+                        instance._close_rpc()
                 
                 if instance.state == ModuleState.STOPPED:
                     logger.info(f"[{module_id}] Stopped successfully")
@@ -354,13 +502,22 @@ class ModuleLifecycleManager:
                 return True
             
             logger.info(f"[{module_id}] Unloading...")
-            await instance.unload()
+            with self.tracer.span("module.unload", {"nexus.module.id": module_id}):
+                try:
+                    await instance._accounted(instance.unload())
+                finally:
+                    instance._cancel_timers()
+                    instance._close_subscriptions()
+                    instance._close_rpc()
+                    await instance._shutdown_executor()
             
             if instance.state == ModuleState.UNLOADED:
                 logger.info(f"[{module_id}] Unloaded successfully")
                 
                 # Remove from registry
                 self.registry.unregister_instance(module_id)
+                if self.health_table is not None:
+                    self.health_table.remove(module_id)
                 return True
             else:
                 raise RuntimeError(f"Module {module_id} not in UNLOADED state after unload")
@@ -393,7 +550,13 @@ class ModuleLoader:
         self.registry = ModuleRegistry()
         self.resolver = DependencyResolver()
         self.discovery = ModuleDiscovery(self.registry)
-        self.lifecycle = ModuleLifecycleManager(self.registry, config, self.state_store)
+        self.health_table = HealthTable()
+        self.timers = TimerService()
+        self.bus = MessageBus()
+        self.rpc = RpcRouter()
+        self.lifecycle = ModuleLifecycleManager(
+            self.registry, config, self.state_store, self.health_table, self.timers, self.bus, self.rpc
+        )
         
         # State tracking
         self._loading = False
@@ -488,7 +651,7 @@ class ModuleLoader:
     ) -> Dict[str, bool]:
         """Start loaded modules"""
         if module_ids is None:
-            module_ids = [mid for mid, instance in self.registry._instances.items()]
+            module_ids = list(self.registry.instance_ids())
         
         results = {}
         
@@ -508,7 +671,7 @@ class ModuleLoader:
     ) -> Dict[str, bool]:
         """Stop started modules in reverse dependency order"""
         if module_ids is None:
-            module_ids = [mid for mid, instance in self.registry._instances.items()]
+            module_ids = list(self.registry.instance_ids())
         
         # Stop in reverse dependency order
         load_order, _ = self.resolver.resolve()
@@ -531,7 +694,7 @@ class ModuleLoader:
     ) -> Dict[str, bool]:
         """Unload stopped modules in reverse dependency order"""
         if module_ids is None:
-            module_ids = [mid for mid, instance in self.registry._instances.items()]
+            module_ids = list(self.registry.instance_ids())
         
         # Unload in reverse dependency order
         load_order, _ = self.resolver.resolve()
@@ -583,16 +746,22 @@ class ModuleLoader:
         """Get loaded module instance"""
         return self.registry.get_instance(module_id)
     
+    def get_provider(self, capability: str) -> Optional[BaseModule]:
+        """Loaded instance providing capability, preferring a started one"""
+        return self.registry.get_provider(capability)
+    
     def get_status(self) -> Dict[str, Any]:
         """Get loader status"""
         return {
-            "total_discovered": len(self.registry._manifests),
-            "total_loaded": len(self.registry._instances),
+            "total_discovered": self.registry.manifest_count,
+            "total_loaded": self.registry.instance_count,
+            "by_state": self.registry.count_by_state(),
             "modules": {
-                module_id: {
+                instance.manifest.id: {
                     "state": instance.state.value,
                     "uptime_seconds": instance.uptime_seconds,
+                    "resource_usage": dict(instance._resource_usage),
                 }
-                for module_id, instance in self.registry._instances.items()
+                for instance in self.registry.instances()
             }
         }
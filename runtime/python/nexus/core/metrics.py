@@ -0,0 +1,766 @@
+"""
+NEXUS v2 - Metrics Collection
+Addresses Review: No Metrics Exposition, Unbounded Histogram Memory
+"""
+
+import logging
+import math
+import re
+import sys
+from array import array
+from bisect import bisect_left
+from itertools import compress
+from operator import itemgetter
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+
+# Prometheus client defaults - tuned for request latencies in seconds
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+_INVALID_NAME_CHARS = re.compile(r"[^a-zA-Z0-9_:]")
+
+
+def _format_float(value: float) -> str:
+    """Format a sample value or bucket bound for the text exposition format"""
+    if value == math.inf:
+        return "+Inf"
+    if value == -math.inf:
+        return "-Inf"
+    if isinstance(value, int):
+        return str(value)
+    return repr(float(value))
+
+
+def _format_labels(labels: Sequence[Tuple[str, str]]) -> str:
+    """Render label pairs as {k="v",...} with exposition-format escaping"""
+    if not labels:
+        return ""
+    parts = []
+    for key, value in labels:
+        value = str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        parts.append(f'{key}="{value}"')
+    return "{" + ",".join(parts) + "}"
+
+
+def _sanitize_name(name: str) -> str:
+    """Map an arbitrary string onto the metric name charset [a-zA-Z0-9_:]"""
+    name = _INVALID_NAME_CHARS.sub("_", name)
+    if name[:1].isdigit():
+        name = "_" + name
+    return name
+
+
+class QuantileSketch:
+    """
+    Streaming quantile sketch with bounded memory.
+    
+    Values are mapped onto logarithmically spaced bins (HDR/DDSketch
+    style), so any reported quantile is within ``relative_accuracy`` of
+    the true value. Once ``max_bins`` is reached the lowest bins are
+    collapsed, which keeps memory fixed and sacrifices accuracy only at
+    the low end - the tail quantiles stay exact to the configured bound.
+    """
+    
+    def __init__(
+        self,
+        relative_accuracy: float = 0.01,
+        max_bins: int = 2048,
+        min_value: float = 1e-9
+    ):
+        if not 0.0 < relative_accuracy < 1.0:
+            raise ValueError("relative_accuracy must be in (0, 1)")
+        if max_bins < 1:
+            raise ValueError("max_bins must be >= 1")
+        
+        self.relative_accuracy = relative_accuracy
+        self.max_bins = max_bins
+        self.min_value = min_value
+        self._gamma = (1.0 + relative_accuracy) / (1.0 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._bins: Dict[int, int] = {}
+        self._zero_count = 0
+        self.count = 0
+    
+    def add(self, value: float):
+        """Add an observation"""
+        self.count += 1
+        if value <= self.min_value:
+            self._zero_count += 1
+            return
+        
+        index = math.ceil(math.log(value) / self._log_gamma)
+        bins = self._bins
+        if index in bins:
+            bins[index] += 1
+            return
+        
+        bins[index] = 1
+        if len(bins) > self.max_bins:
+            self._collapse()
+    
+    def _collapse(self):
+        """Merge the two lowest bins to stay within max_bins"""
+        lowest, second = sorted(self._bins)[:2]
+        self._bins[second] += self._bins.pop(lowest)
+    
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate the q-quantile (0 <= q <= 1).
+        
+        Returns:
+            Estimated value, or None if no observations were recorded
+        """
+        if not 0.0 <= q <= 1.0:
+            raise ValueError(f"Quantile must be in [0, 1], got {q}")
+        if self.count == 0:
+            return None
+        
+        rank = q * (self.count - 1)
+        seen = self._zero_count
+        if rank < seen:
+            return 0.0
+        
+        for index in sorted(self._bins):
+            seen += self._bins[index]
+            if seen > rank:
+                # Midpoint of the bin in log space keeps the relative error bound
+                return 2.0 * self._gamma ** index / (self._gamma + 1.0)
+        
+        return 2.0 * self._gamma ** max(self._bins) / (self._gamma + 1.0)
+    
+    def reset(self):
+        """Drop all observations"""
+        self._bins.clear()
+        self._zero_count = 0
+        self.count = 0
+
+
+class Histogram:
+    """
+    Fixed-bucket cumulative histogram.
+    
+    Memory use is O(buckets) regardless of how many values are observed.
+    An optional QuantileSketch can be attached for p50/p99 style queries.
+    """
+    
+    __slots__ = ("name", "labels", "bounds", "_counts", "sum", "count", "sketch")
+    
+    def __init__(
+        self,
+        name: str,
+        labels: Tuple[Tuple[str, str], ...] = (),
+        buckets: Optional[Sequence[float]] = None,
+        sketch: Optional[QuantileSketch] = None
+    ):
+        bounds = sorted(float(b) for b in (buckets or DEFAULT_BUCKETS))
+        if bounds and bounds[-1] == math.inf:
+            bounds.pop()
+        if not bounds:
+            raise ValueError(f"Histogram {name} needs at least one finite bucket")
+        
+        self.name = name
+        self.labels = labels
+        self.bounds: Tuple[float, ...] = tuple(bounds)
+        # One counter per bucket plus the implicit +Inf bucket
+        self._counts: List[int] = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self.sketch = sketch
+    
+    def observe(self, value: float):
+        """Record a single observation"""
+        self._counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+        if self.sketch is not None:
+            self.sketch.add(value)
+    
+    def cumulative_counts(self) -> List[Tuple[float, int]]:
+        """Return (upper_bound, cumulative_count) pairs including +Inf"""
+        result = []
+        running = 0
+        for bound, count in zip(self.bounds + (math.inf,), self._counts):
+            running += count
+            result.append((bound, running))
+        return result
+    
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate a quantile from the sketch, or None without one"""
+        if self.sketch is None:
+            return None
+        return self.sketch.quantile(q)
+
+
+class _Column:
+    """
+    Contiguous storage for one metric kind.
+    
+    Values live in a flat array('d'); owner, name and label-set ids are
+    parallel array('I') columns, so aggregation is a pass over buffers
+    instead of a walk over per-module dicts.
+    """
+    
+    __slots__ = ("values", "owners", "names", "label_sets", "_fixed")
+    
+    def __init__(self, values: Optional[memoryview] = None):
+        # A fixed-size external buffer (e.g. shared memory) or a growable array
+        self._fixed = values is not None
+        self.values = values if values is not None else array("d")
+        self.owners = array("I")
+        self.names = array("I")
+        self.label_sets = array("I")
+    
+    def add(self, owner: int, name: int, label_set: int) -> int:
+        index = len(self.owners)
+        if self._fixed:
+            if index >= len(self.values):
+                raise RuntimeError(f"Metrics buffer full ({len(self.values)} slots)")
+            self.values[index] = 0.0
+        else:
+            self.values.append(0.0)
+        self.owners.append(owner)
+        self.names.append(name)
+        self.label_sets.append(label_set)
+        return index
+    
+    def __len__(self) -> int:
+        return len(self.owners)
+
+
+class MetricsRegistry:
+    """
+    Process-wide columnar metrics store.
+    
+    Metric names, label sets and owners (module IDs) are interned once and
+    referenced by integer id. Counters and gauges are slots in contiguous
+    buffers; histograms are fixed-size objects indexed the same way.
+    Each module gets a MetricsCollector view onto its own slots.
+    
+    Series are keyed by module ID, so a reloaded module keeps counting
+    where its previous instance stopped.
+    
+    With a SharedMetricsSegment the value and generation buffers live in
+    shared memory, so a parent process can read them without IPC.
+    """
+    
+    COUNTER = 0
+    GAUGE = 1
+    HISTOGRAM = 2
+    OWNER = 3  # shared-segment descriptor kind for module entries
+    
+    def __init__(self, segment=None):
+        self.segment = segment
+        
+        # Interning tables
+        self._strings: Dict[str, int] = {}
+        self._string_table: List[str] = []
+        self._label_sets: Dict[Tuple[Tuple[str, str], ...], int] = {(): 0}
+        self._label_set_table: List[Tuple[Tuple[str, str], ...]] = [()]
+        self._owners: Dict[str, int] = {}
+        self._owner_table: List[str] = []
+        
+        # Per-owner write generation and slot membership
+        self.generations = segment.generations if segment else array("Q")
+        self._owner_slots: List[Tuple[array, array, array]] = []
+        
+        # Storage
+        self.counters = _Column(segment.counters if segment else None)
+        self.gauges = _Column(segment.gauges if segment else None)
+        self.histograms: List[Histogram] = []
+        self._histogram_owners = array("I")
+        self._histogram_names = array("I")
+        self._index: Dict[Tuple[int, int, int, int], int] = {}
+    
+    def intern(self, value: str) -> int:
+        """Intern a metric or label name, returning its id"""
+        sid = self._strings.get(value)
+        if sid is None:
+            sid = self._strings[value] = len(self._string_table)
+            self._string_table.append(sys.intern(value))
+        return sid
+    
+    def name_of(self, sid: int) -> str:
+        return self._string_table[sid]
+    
+    def intern_labels(self, labels: Optional[Dict[str, str]]) -> int:
+        """Intern a label set (sorted name/value pairs), returning its id"""
+        if not labels:
+            return 0
+        pairs = tuple(
+            (self._string_table[self.intern(_sanitize_name(k))], sys.intern(str(v)))
+            for k, v in sorted(labels.items())
+        )
+        lid = self._label_sets.get(pairs)
+        if lid is None:
+            lid = self._label_sets[pairs] = len(self._label_set_table)
+            self._label_set_table.append(pairs)
+        return lid
+    
+    def labels_of(self, lid: int) -> Tuple[Tuple[str, str], ...]:
+        return self._label_set_table[lid]
+    
+    def owner(self, module_id: str) -> int:
+        """Get (or allocate) the owner id for a module"""
+        oid = self._owners.get(module_id)
+        if oid is None:
+            oid = len(self._owner_table)
+            if self.segment:
+                if oid >= len(self.generations):
+                    raise RuntimeError(f"Metrics owner table full ({oid} modules)")
+                self.generations[oid] = 0
+                self.segment.publish(self.OWNER, oid, module_id)
+            else:
+                self.generations.append(0)
+            self._owners[module_id] = oid
+            self._owner_table.append(module_id)
+            self._owner_slots.append((array("I"), array("I"), array("I")))
+        return oid
+    
+    def slot(self, kind: int, owner: int, name: str, labels: Optional[Dict[str, str]]) -> int:
+        """Resolve (or allocate) the slot of a series"""
+        nid = self.intern(name)
+        lid = self.intern_labels(labels)
+        key = (kind, owner, nid, lid)
+        
+        index = self._index.get(key)
+        if index is not None:
+            return index
+        
+        if kind == self.COUNTER:
+            index = self.counters.add(owner, nid, lid)
+        elif kind == self.GAUGE:
+            index = self.gauges.add(owner, nid, lid)
+        else:
+            raise ValueError("Histogram series are allocated with histogram_slot()")
+        
+        if self.segment:
+            self.segment.publish(
+                kind, index, self._owner_table[owner], name, self._label_set_table[lid]
+            )
+        
+        self._owner_slots[owner][kind].append(index)
+        self._index[key] = index
+        self.generations[owner] += 1
+        return index
+    
+    def histogram_slot(
+        self,
+        owner: int,
+        name: str,
+        labels: Optional[Dict[str, str]],
+        factory: Callable[[str, Tuple[Tuple[str, str], ...]], Histogram]
+    ) -> int:
+        """Resolve (or allocate via factory) the slot of a histogram series"""
+        nid = self.intern(name)
+        lid = self.intern_labels(labels)
+        key = (self.HISTOGRAM, owner, nid, lid)
+        
+        index = self._index.get(key)
+        if index is not None:
+            return index
+        
+        index = len(self.histograms)
+        hist = factory(self._string_table[nid], self._label_set_table[lid])
+        if self.segment:
+            hist = self.segment.share_histogram(hist, self._owner_table[owner])
+        self.histograms.append(hist)
+        self._histogram_owners.append(owner)
+        self._histogram_names.append(nid)
+        self._owner_slots[owner][self.HISTOGRAM].append(index)
+        self._index[key] = index
+        self.generations[owner] += 1
+        return index
+    
+    def find(self, kind: int, owner: int, name: str, labels: Optional[Dict[str, str]]) -> Optional[int]:
+        """Look up an existing series without allocating"""
+        nid = self._strings.get(name)
+        if nid is None:
+            return None
+        lid = 0
+        if labels:
+            pairs = tuple((_sanitize_name(k), str(v)) for k, v in sorted(labels.items()))
+            lid = self._label_sets.get(pairs)
+            if lid is None:
+                return None
+        return self._index.get((kind, owner, nid, lid))
+    
+    def owner_slots(self, owner: int, kind: int) -> array:
+        """Slot indices belonging to one owner"""
+        return self._owner_slots[owner][kind]
+    
+    def totals(self, kind: int = COUNTER) -> Dict[str, float]:
+        """
+        Sum counter (or gauge) values per metric name across all modules.
+        
+        One pass over the name/value columns - no per-module traversal.
+        """
+        column = self.counters if kind == self.COUNTER else self.gauges
+        sums: Dict[int, float] = {}
+        for nid, value in zip(column.names, column.values):
+            sums[nid] = sums.get(nid, 0.0) + value
+        return {self._string_table[nid]: total for nid, total in sums.items()}
+    
+    def total(self, name: str, kind: int = COUNTER) -> float:
+        """Sum one counter (or gauge) across all modules and label sets"""
+        nid = self._strings.get(name)
+        if nid is None:
+            return 0.0
+        column = self.counters if kind == self.COUNTER else self.gauges
+        return sum(compress(column.values, (n == nid for n in column.names)))
+    
+    def __len__(self) -> int:
+        return len(self.counters) + len(self.gauges) + len(self.histograms)
+
+
+_default_registry: Optional[MetricsRegistry] = None
+
+
+def get_registry() -> MetricsRegistry:
+    """Get the process-wide metrics registry"""
+    global _default_registry
+    if _default_registry is None:
+        _default_registry = MetricsRegistry()
+    return _default_registry
+
+
+class CounterHandle:
+    """
+    Pre-bound counter series.
+    
+    Obtained from MetricsCollector.counter(); inc() touches only the
+    resolved buffer slot - no label sorting, key building or logging.
+    """
+    
+    __slots__ = ("_values", "_index", "_generations", "_owner")
+    
+    def __init__(self, registry: MetricsRegistry, index: int, owner: int):
+        self._values = registry.counters.values
+        self._index = index
+        self._generations = registry.generations
+        self._owner = owner
+    
+    def inc(self, amount: float = 1):
+        """Increment counter"""
+        self._values[self._index] += amount
+        self._generations[self._owner] += 1
+    
+    @property
+    def value(self) -> float:
+        return self._values[self._index]
+
+
+class GaugeHandle:
+    """Pre-bound gauge series, obtained from MetricsCollector.gauge_handle()"""
+    
+    __slots__ = ("_values", "_index", "_generations", "_owner")
+    
+    def __init__(self, registry: MetricsRegistry, index: int, owner: int):
+        self._values = registry.gauges.values
+        self._index = index
+        self._generations = registry.generations
+        self._owner = owner
+    
+    def set(self, value: float):
+        """Set gauge value"""
+        self._values[self._index] = value
+        self._generations[self._owner] += 1
+    
+    def inc(self, amount: float = 1.0):
+        """Increase gauge value"""
+        self._values[self._index] += amount
+        self._generations[self._owner] += 1
+    
+    def dec(self, amount: float = 1.0):
+        """Decrease gauge value"""
+        self._values[self._index] -= amount
+        self._generations[self._owner] += 1
+    
+    @property
+    def value(self) -> float:
+        return self._values[self._index]
+
+
+class HistogramHandle:
+    """Pre-bound histogram series, obtained from MetricsCollector.histogram_handle()"""
+    
+    __slots__ = ("_hist", "_generations", "_owner")
+    
+    def __init__(self, registry: MetricsRegistry, index: int, owner: int):
+        self._hist = registry.histograms[index]
+        self._generations = registry.generations
+        self._owner = owner
+    
+    def observe(self, value: float):
+        """Record a single observation"""
+        self._hist.observe(value)
+        self._generations[self._owner] += 1
+    
+    @property
+    def histogram(self) -> Histogram:
+        return self._hist
+
+
+def _gather(values: array, indices: array) -> Tuple[float, ...]:
+    """Fetch values at indices in one C-level pass"""
+    if not indices:
+        return ()
+    if len(indices) == 1:
+        return (values[indices[0]],)
+    return itemgetter(*indices)(values)
+
+
+class MetricsCollector:
+    """
+    Metrics collection interface.
+    Addresses Review: No Metrics Exposition
+    
+    A lightweight per-module view onto the process-wide MetricsRegistry.
+    
+    increment()/gauge()/histogram() resolve the series on every call.
+    Hot paths should bind a handle once and reuse it:
+    
+        sent = self.metrics.counter("heartbeats_sent_total")
+        ...
+        sent.inc()
+    
+    Every write bumps the module's generation in the registry;
+    export_prometheus() re-renders only when it moved since the
+    previous export.
+    """
+    
+    def __init__(self, module_id: str, registry: Optional[MetricsRegistry] = None):
+        self.module_id = module_id
+        self.prefix = _sanitize_name(f"nexus_{module_id}")
+        self.registry = registry if registry is not None else get_registry()
+        self._owner = self.registry.owner(module_id)
+        self._histogram_specs: Dict[str, Tuple[Tuple[float, ...], Tuple[float, ...]]] = {}
+        self._help: Dict[str, str] = {}
+        
+        # Render cache
+        self._rendered_generation = -1
+        self._rendered = ""
+    
+    @property
+    def generation(self) -> int:
+        """Monotonic change counter - moves on every metric write"""
+        return self.registry.generations[self._owner]
+    
+    def _touch(self):
+        self.registry.generations[self._owner] += 1
+    
+    def describe(self, name: str, help_text: str):
+        """Set the # HELP text exported for a metric"""
+        self._help[name] = help_text
+        self._touch()
+    
+    def increment(self, name: str, value: float = 1, labels: Dict[str, str] = None):
+        """Increment counter"""
+        registry = self.registry
+        index = registry.slot(registry.COUNTER, self._owner, name, labels)
+        registry.counters.values[index] += value
+        self._touch()
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"[{self.module_id}] Counter {name}={registry.counters.values[index]}")
+    
+    def gauge(self, name: str, value: float, labels: Dict[str, str] = None):
+        """Set gauge value"""
+        registry = self.registry
+        index = registry.slot(registry.GAUGE, self._owner, name, labels)
+        registry.gauges.values[index] = value
+        self._touch()
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"[{self.module_id}] Gauge {name}={value}")
+    
+    def counter(self, name: str, labels: Dict[str, str] = None) -> CounterHandle:
+        """Get a pre-bound handle for a counter series"""
+        registry = self.registry
+        index = registry.slot(registry.COUNTER, self._owner, name, labels)
+        return CounterHandle(registry, index, self._owner)
+    
+    def gauge_handle(self, name: str, labels: Dict[str, str] = None) -> GaugeHandle:
+        """Get a pre-bound handle for a gauge series"""
+        registry = self.registry
+        index = registry.slot(registry.GAUGE, self._owner, name, labels)
+        return GaugeHandle(registry, index, self._owner)
+    
+    def histogram_handle(self, name: str, labels: Dict[str, str] = None) -> HistogramHandle:
+        """Get a pre-bound handle for a histogram series"""
+        index = self.registry.histogram_slot(self._owner, name, labels, self._new_histogram)
+        return HistogramHandle(self.registry, index, self._owner)
+    
+    def configure_histogram(
+        self,
+        name: str,
+        buckets: Optional[Sequence[float]] = None,
+        quantiles: Optional[Sequence[float]] = None
+    ):
+        """
+        Configure bucket layout and quantile tracking for a histogram.
+        
+        Applies to series created after the call, so configure metrics
+        before the first observation (typically in init()).
+        
+        Args:
+            name: Histogram name
+            buckets: Upper bucket bounds (default: DEFAULT_BUCKETS)
+            quantiles: Quantiles to export from a streaming sketch,
+                e.g. (0.5, 0.99). Omit to disable the sketch.
+        """
+        for q in quantiles or ():
+            if not 0.0 <= q <= 1.0:
+                raise ValueError(f"Quantile must be in [0, 1], got {q}")
+        
+        self._histogram_specs[name] = (
+            tuple(buckets or DEFAULT_BUCKETS),
+            tuple(quantiles or ())
+        )
+    
+    def histogram(self, name: str, value: float, labels: Dict[str, str] = None):
+        """Record histogram value"""
+        registry = self.registry
+        index = registry.histogram_slot(self._owner, name, labels, self._new_histogram)
+        registry.histograms[index].observe(value)
+        self._touch()
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"[{self.module_id}] Histogram {name}={value}")
+    
+    def get_histogram(self, name: str, labels: Dict[str, str] = None) -> Optional[Histogram]:
+        """Get histogram series, or None if nothing was observed yet"""
+        index = self.registry.find(self.registry.HISTOGRAM, self._owner, name, labels)
+        return None if index is None else self.registry.histograms[index]
+    
+    def get_value(self, name: str, labels: Dict[str, str] = None) -> Optional[float]:
+        """Get the current value of a counter or gauge series"""
+        registry = self.registry
+        for kind, column in ((registry.COUNTER, registry.counters), (registry.GAUGE, registry.gauges)):
+            index = registry.find(kind, self._owner, name, labels)
+            if index is not None:
+                return column.values[index]
+        return None
+    
+    def snapshot(self) -> Dict[str, float]:
+        """
+        Current values keyed by exposition series name.
+        
+        Counters and gauges map to their value; histograms contribute
+        their _sum and _count series.
+        """
+        registry = self.registry
+        values: Dict[str, float] = {}
+        
+        for kind, column in ((registry.COUNTER, registry.counters), (registry.GAUGE, registry.gauges)):
+            indices = registry.owner_slots(self._owner, kind)
+            for nid, lid, value in zip(_gather(column.names, indices),
+                                       _gather(column.label_sets, indices),
+                                       _gather(column.values, indices)):
+                name = f"{self.prefix}_{_sanitize_name(registry.name_of(nid))}"
+                values[name + _format_labels(registry.labels_of(lid))] = value
+        
+        for i in registry.owner_slots(self._owner, registry.HISTOGRAM):
+            hist = registry.histograms[i]
+            base = f"{self.prefix}_{_sanitize_name(hist.name)}"
+            labels = _format_labels(hist.labels)
+            values[f"{base}_sum{labels}"] = hist.sum
+            values[f"{base}_count{labels}"] = hist.count
+        
+        return values
+
+    def _new_histogram(self, name: str, labels: Tuple[Tuple[str, str], ...]) -> Histogram:
+        """Create a histogram series from its configured spec"""
+        buckets, quantiles = self._histogram_specs.get(name, (DEFAULT_BUCKETS, ()))
+        return Histogram(
+            name,
+            labels=labels,
+            buckets=buckets,
+            sketch=QuantileSketch() if quantiles else None
+        )
+    
+    def export_prometheus(self) -> str:
+        """
+        Export metrics in the Prometheus text exposition format.
+        
+        Series are grouped into families with # HELP / # TYPE headers.
+        The rendered block is cached until the next metric write.
+        """
+        generation = self.generation
+        if self._rendered_generation == generation:
+            return self._rendered
+        
+        registry = self.registry
+        lines: List[str] = []
+        
+        for kind, column, type_name in (
+            (registry.COUNTER, registry.counters, "counter"),
+            (registry.GAUGE, registry.gauges, "gauge"),
+        ):
+            indices = registry.owner_slots(self._owner, kind)
+            families = self._group(
+                zip(_gather(column.names, indices),
+                    _gather(column.label_sets, indices),
+                    _gather(column.values, indices))
+            )
+            for nid, series in families.items():
+                name = registry.name_of(nid)
+                self._render_header(lines, name, type_name)
+                full_name = f"{self.prefix}_{_sanitize_name(name)}"
+                for _, lid, value in series:
+                    labels = _format_labels(registry.labels_of(lid))
+                    lines.append(f"{full_name}{labels} {_format_float(value)}")
+        
+        histograms = [
+            registry.histograms[i]
+            for i in registry.owner_slots(self._owner, registry.HISTOGRAM)
+        ]
+        families = {}
+        for hist in histograms:
+            families.setdefault(hist.name, []).append(hist)
+        
+        for name, family in families.items():
+            self._render_header(lines, name, "histogram")
+            base = f"{self.prefix}_{_sanitize_name(name)}"
+            for hist in family:
+                for bound, count in hist.cumulative_counts():
+                    labels = _format_labels(hist.labels + (("le", _format_float(bound)),))
+                    lines.append(f"{base}_bucket{labels} {count}")
+                
+                labels = _format_labels(hist.labels)
+                lines.append(f"{base}_sum{labels} {_format_float(hist.sum)}")
+                lines.append(f"{base}_count{labels} {hist.count}")
+            
+            # Sketch quantiles are a separate gauge family - a histogram
+            # family may only carry _bucket/_sum/_count samples
+            _, quantiles = self._histogram_specs.get(name, (None, ()))
+            if quantiles:
+                lines.append(f"# TYPE {base}_quantile gauge")
+                for hist in family:
+                    for q in quantiles:
+                        estimate = hist.quantile(q)
+                        if estimate is None:
+                            continue
+                        labels = _format_labels(hist.labels + (("quantile", _format_float(q)),))
+                        lines.append(f"{base}_quantile{labels} {_format_float(estimate)}")
+        
+        self._rendered = "\n".join(lines)
+        self._rendered_generation = generation
+        return self._rendered
+    
+    @staticmethod
+    def _group(series) -> Dict[int, list]:
+        """Group (name_id, label_set_id, value) rows by name, preserving order"""
+        families: Dict[int, list] = {}
+        for row in series:
+            families.setdefault(row[0], []).append(row)
+        return families
+    
+    def _render_header(self, lines: List[str], name: str, kind: str):
+        """Append # HELP and # TYPE lines for a metric family"""
+        full_name = f"{self.prefix}_{_sanitize_name(name)}"
+        help_text = self._help.get(name, f"{name} ({self.module_id})")
+        help_text = help_text.replace("\\", "\\\\").replace("\n", "\\n")
+        lines.append(f"# HELP {full_name} {help_text}")
+        lines.append(f"# TYPE {full_name} {kind}")
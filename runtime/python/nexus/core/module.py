@@ -4,19 +4,30 @@ Addresses Review: Security, Observability, Error Handling
 """
 
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
 from typing import Dict, List, Any, Optional, Set, Callable
 from dataclasses import dataclass, field
 import asyncio
+import contextvars
 import logging
 import time
 from datetime import datetime
-from contextlib import asynccontextmanager
+
+from .accounting import account_coroutine
+from .bus import MessageBus, Subscription
+from .rpc import RpcRouter
+from .health import HealthTable
+from .metrics import MetricsCollector
+from .timers import Timer, TimerService
+from .tracing import detached, get_tracer
 
 
 # Structured logging
 logger = logging.getLogger(__name__)
 
+EXECUTION_MODES = ("inprocess", "process")
+
 
 class ModuleState(Enum):
     """Module lifecycle states"""
@@ -73,6 +84,10 @@ class ModuleManifest:
     hot_unload_allowed: bool = True
     hot_unload_reason: str = ""
     
+    # "inprocess", or "process" to host the module in a worker process
+    # (overridable per deployment with the "execution" config key)
+    execution: str = "inprocess"
+    
     # Security metadata
     required_permissions: List[str] = field(default_factory=list)
     sensitive: bool = False  # Contains secrets/PII
@@ -93,66 +108,143 @@ class ModuleManifest:
                 f"Group mismatch: manifest.group={self.group} but "
                 f"id={self.id} implies {group_from_id}"
             )
+        
+        if self.execution not in EXECUTION_MODES:
+            raise ValueError(f"Invalid execution mode: {self.execution}. Must be one of {EXECUTION_MODES}")
+
+
+class _OperationMetrics:
+    """Pre-bound metric handles for one tracked operation name"""
+    
+    __slots__ = ("total", "success", "error", "duration")
+    
+    def __init__(self, metrics: MetricsCollector, operation: str):
+        self.total = metrics.counter(f"{operation}_total")
+        self.success = metrics.counter(f"{operation}_success")
+        self.error = metrics.counter(f"{operation}_error")
+        self.duration = metrics.histogram_handle(f"{operation}_duration_seconds")
+
+
+class _BlockingExecutor:
+    """
+    Per-module thread pool behind BaseModule._run_blocking.
+    
+    Bookkeeping runs on the event loop thread only: the worker thread
+    records when a call started and its CPU time, and the done callback
+    turns that into metrics.
+    """
+    
+    def __init__(self, module: "BaseModule", threads: int):
+        self.module = module
+        self.threads = threads
+        self.pool = ThreadPoolExecutor(max_workers=threads, thread_name_prefix=f"nexus-{module.manifest.id}")
+        self.in_flight: Set[asyncio.Future] = set()
+        
+        metrics = module.metrics
+        metrics.gauge("executor_threads", threads)
+        self.queue_depth = metrics.gauge_handle("executor_queue_depth")
+        self.calls = metrics.counter("executor_calls_total")
+        self.errors = metrics.counter("executor_errors_total")
+        self.wait = metrics.histogram_handle("executor_wait_seconds")
+        self.duration = metrics.histogram_handle("executor_task_seconds")
+        self.queue_depth.set(0)
+    
+    def submit(self, fn: Callable, args: tuple) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        timing = [time.perf_counter(), 0.0, 0.0]
+        
+        def call():
+            timing[1] = time.perf_counter()
+            cpu = time.thread_time()
+            try:
+                return fn(*args)
+            finally:
+                timing[2] = time.thread_time() - cpu
+        
+        # Like asyncio.to_thread: the call sees the caller's context (trace spans)
+        future = loop.run_in_executor(self.pool, contextvars.copy_context().run, call)
+        self.in_flight.add(future)
+        self.calls.inc()
+        self._update_depth()
+        future.add_done_callback(lambda done: self._finished(done, timing))
+        return future
+    
+    def _finished(self, future: asyncio.Future, timing: List[float]):
+        self.in_flight.discard(future)
+        self._update_depth()
+        submitted, started, cpu = timing
+        if not started:
+            return  # Cancelled while queued
+        self.wait.observe(started - submitted)
+        self.duration.observe(time.perf_counter() - started)
+        self.module._resource_usage["cpu_seconds"] += cpu
+        if future.cancelled() or future.exception() is not None:
+            self.errors.inc()
+    
+    def _update_depth(self):
+        # Idle workers pick up a call immediately, so everything beyond
+        # one call per thread is waiting in the queue
+        self.queue_depth.set(max(0, len(self.in_flight) - self.threads))
+    
+    async def shutdown(self, timeout: float) -> int:
+        """Drop queued calls, wait up to timeout for running ones; returns how many are still running"""
+        self.pool.shutdown(wait=False, cancel_futures=True)
+        pending = [future for future in self.in_flight if not future.done()]
+        if pending:
+            _, still_running = await asyncio.wait(pending, timeout=timeout)
+            return len(still_running)
+        return 0
 
 
-class MetricsCollector:
+class _TrackedOperation:
     """
-    Metrics collection interface.
-    Addresses Review: No Metrics Exposition
+    Async context manager returned by BaseModule._track_operation.
+    
+    A plain class rather than @asynccontextmanager - avoids creating a
+    generator per call on the hot path. When tracing is enabled the
+    operation is also a span, nested under the current lifecycle or
+    operation span.
     """
     
-    def __init__(self, module_id: str):
-        self.module_id = module_id
-        self._counters: Dict[str, int] = {}
-        self._gauges: Dict[str, float] = {}
-        self._histograms: Dict[str, List[float]] = {}
-    
-    def increment(self, name: str, value: int = 1, labels: Dict[str, str] = None):
-        """Increment counter"""
-        key = self._make_key(name, labels)
-        self._counters[key] = self._counters.get(key, 0) + value
-        logger.debug(f"[{self.module_id}] Counter {name}={self._counters[key]}")
-    
-    def gauge(self, name: str, value: float, labels: Dict[str, str] = None):
-        """Set gauge value"""
-        key = self._make_key(name, labels)
-        self._gauges[key] = value
-        logger.debug(f"[{self.module_id}] Gauge {name}={value}")
-    
-    def histogram(self, name: str, value: float, labels: Dict[str, str] = None):
-        """Record histogram value"""
-        key = self._make_key(name, labels)
-        if key not in self._histograms:
-            self._histograms[key] = []
-        self._histograms[key].append(value)
-        logger.debug(f"[{self.module_id}] Histogram {name}={value}")
-    
-    def _make_key(self, name: str, labels: Optional[Dict[str, str]]) -> str:
-        """Create metric key with labels"""
-        if not labels:
-            return name
-        label_str = ",".join(f"{k}={v}" for k, v in sorted(labels.items()))
-        return f"{name}{{{label_str}}}"
-    
-    def export_prometheus(self) -> str:
-        """Export metrics in Prometheus format"""
-        lines = []
-        
-        # Counters
-        for key, value in self._counters.items():
-            lines.append(f'nexus_{self.module_id.replace("/", "_")}_{key} {value}')
-        
-        # Gauges
-        for key, value in self._gauges.items():
-            lines.append(f'nexus_{self.module_id.replace("/", "_")}_{key} {value}')
-        
-        # Histograms (simplified - just count)
-        for key, values in self._histograms.items():
-            lines.append(f'nexus_{self.module_id.replace("/", "_")}_{key}_count {len(values)}')
-            if values:
-                lines.append(f'nexus_{self.module_id.replace("/", "_")}_{key}_sum {sum(values)}')
-        
-        return "\n".join(lines)
+    __slots__ = ("_module", "_operation", "_handles", "_start", "_span")
+    
+    def __init__(self, module: "BaseModule", operation: str, handles: _OperationMetrics):
+        self._module = module
+        self._operation = operation
+        self._handles = handles
+        self._start = 0.0
+        self._span = None
+    
+    async def __aenter__(self):
+        self._handles.total.inc()
+        
+        tracer = get_tracer()
+        if tracer.enabled:
+            self._span = tracer.span(
+                self._operation, {"nexus.module.id": self._module.manifest.id}
+            ).__enter__()
+        
+        self._start = time.perf_counter()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        duration = time.perf_counter() - self._start
+        handles = self._handles
+        
+        if self._span is not None:
+            self._span.__exit__(exc_type, exc, tb)
+        
+        if exc_type is None:
+            handles.success.inc()
+        elif issubclass(exc_type, Exception):
+            handles.error.inc()
+            self._module.logger.error(
+                f"{self._operation} failed: {exc}",
+                exc_info=(exc_type, exc, tb)
+            )
+        
+        handles.duration.observe(duration)
+        return False
 
 
 class BaseModule(ABC):
@@ -177,11 +269,30 @@ class BaseModule(ABC):
         
         # Observability
         self.metrics = MetricsCollector(manifest.id)
+        self._operation_metrics: Dict[str, "_OperationMetrics"] = {}
         self.logger = logging.getLogger(f"nexus.module.{manifest.id}")
         
         # Security
         self._security_context: Optional[SecurityContext] = None
         
+        # Push-based health (set by the lifecycle manager)
+        self._health_table: Optional[HealthTable] = None
+        
+        # Shared timer wheel (set by the lifecycle manager)
+        self._timer_service: Optional[TimerService] = None
+        
+        # Topic bus for provides/consumes (set by the lifecycle manager)
+        self._message_bus: Optional[MessageBus] = None
+        
+        # Capability RPC (set by the lifecycle manager)
+        self._rpc_router: Optional[RpcRouter] = None
+        
+        # Thread pool for blocking calls (opened by the lifecycle manager before load)
+        self._executor: Optional[_BlockingExecutor] = None
+        
+        # State transition listeners (registry indexes)
+        self._state_listeners: List[Callable[["BaseModule", ModuleState, ModuleState], None]] = []
+        
         # Resource tracking
         self._resource_usage = {
             "cpu_seconds": 0.0,
@@ -283,18 +394,259 @@ class BaseModule(ABC):
         elif new_state in (ModuleState.STOPPED, ModuleState.FAILED):
             self._stop_time = datetime.now()
             self.metrics.gauge("state", 0.0)
+        
+        self._publish_state()
+        
+        for listener in list(self._state_listeners):
+            try:
+                listener(self, old_state, new_state)
+            except Exception as e:
+                logger.error(f"State listener failed for {self.manifest.id}: {e}", exc_info=True)
+    
+    def _publish_state(self):
+        """Push the current lifecycle state into the health table"""
+        if self._health_table is None:
+            return
+        
+        state = self._state
+        if state == ModuleState.STARTED:
+            status = "healthy"
+        elif state == ModuleState.FAILED:
+            status = "unhealthy"
+        else:
+            status = "degraded"
+        
+        self._health_table.publish(
+            self.manifest.id,
+            status=status,
+            state=state.value,
+            ready=state == ModuleState.STARTED,
+            live=state != ModuleState.FAILED
+        )
+    
+    def _publish_health(
+        self,
+        status: str,
+        ready: Optional[bool] = None,
+        live: Optional[bool] = None,
+        details: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Push a health change without waiting to be polled.
+        
+        The published status holds until the next state transition or
+        the next one published.
+        
+        Usage:
+            self._publish_health("degraded", details={"reason": "upstream slow"})
+        """
+        if self._health_table is None:
+            return
+        
+        self._health_table.publish(
+            self.manifest.id,
+            status=status,
+            ready=ready,
+            live=live,
+            details=details
+        )
     
     def _spawn_background_task(self, coro, name: str = None):
         """
         Spawn a tracked background task with automatic cleanup.
         """
-        task = asyncio.create_task(coro, name=name or f"{self.manifest.id}_bg")
+        # Long-lived tasks start their own traces instead of hanging off
+        # the lifecycle span that spawned them
+        with detached():
+            task = asyncio.create_task(
+                self._accounted(coro),
+                name=name or f"{self.manifest.id}_bg"
+            )
         self._background_tasks.add(task)
         task.add_done_callback(self._background_tasks.discard)
         
         self.metrics.increment("background_tasks_spawned")
         return task
     
+    def _call_later(self, delay: float, callback: Callable, *args) -> Timer:
+        """
+        Run callback(*args) once after delay seconds on the daemon's
+        timer service. Cancelled automatically on stop/unload.
+        """
+        return self._timers().call_later(
+            delay, self._timer_callback(callback), *args, owner=self.manifest.id
+        )
+    
+    def _call_every(self, interval: float, callback: Callable, *args, first: Optional[float] = None) -> Timer:
+        """
+        Run callback(*args) every interval seconds on the daemon's timer
+        service instead of a dedicated `while True: sleep()` task.
+        
+        Coroutine functions run as background tasks; a run is skipped
+        while the previous one is still in flight. Cancelled
+        automatically on stop/unload.
+        
+        Usage:
+            self._call_every(5.0, self._flush_buffers)
+        """
+        return self._timers().call_every(
+            interval, self._timer_callback(callback), *args, owner=self.manifest.id, first=first
+        )
+    
+    def _cancel_timers(self) -> int:
+        """Cancel all timers this module registered"""
+        if self._timer_service is None:
+            return 0
+        return self._timer_service.cancel_owner(self.manifest.id)
+    
+    def _timers(self) -> TimerService:
+        if self._timer_service is None:
+            raise RuntimeError(f"Module {self.manifest.id} has no timer service attached")
+        return self._timer_service
+    
+    def _publish(self, topic: str, message: Any) -> int:
+        """
+        Publish on one of this module's `provides` topics without waiting.
+        
+        Every subscriber receives the same object, so do not mutate a
+        message after publishing it. Returns how many subscribers queued it.
+        """
+        return self._bus_for(topic, self.manifest.provides, "provides").publish_nowait(topic, message)
+    
+    async def _publish_wait(self, topic: str, message: Any) -> int:
+        """Like _publish(), but waits for space in "block" subscribers"""
+        return await self._bus_for(topic, self.manifest.provides, "provides").publish(topic, message)
+    
+    def _subscribe(self, topic: str, handler: Callable, **options) -> Subscription:
+        """
+        Subscribe to one of this module's `consumes` topics.
+        
+        handler(messages) receives batches; options are passed to
+        MessageBus.subscribe (queue_size, overflow, batch_size, key).
+        Closed automatically on stop/unload.
+        
+        Usage:
+            self._subscribe("vitals.peer.suspicion", self._on_suspicion, overflow="coalesce",
+                            key=lambda event: event["peer"])
+        """
+        return self._bus_for(topic, self.manifest.consumes, "consumes").subscribe(
+            topic, handler, owner=self.manifest.id, spawn=self._spawn_background_task, **options
+        )
+    
+    def _close_subscriptions(self) -> int:
+        """Close all bus subscriptions this module registered"""
+        if self._message_bus is None:
+            return 0
+        return self._message_bus.unsubscribe_owner(self.manifest.id)
+    
+    def _serve(self, capability: str, method: str, handler: Callable, batch: bool = False, **options):
+        """
+        Serve an RPC method of one of this module's `provides` capabilities.
+        
+        handler(payload) returns the result (or is a coroutine function);
+        with batch=True it receives the payloads of every call flushed in
+        one tick and returns their results in order. options are passed
+        to RpcRouter.serve (max_in_flight). Withdrawn automatically on
+        stop/unload.
+        
+        Usage:
+            self._serve("substrate.query", "lookup", self._lookup_many, batch=True)
+        """
+        self._rpc_for(capability, self.manifest.provides, "provides").serve(
+            capability, method, handler, owner=self.manifest.id, batch=batch,
+            spawn=self._spawn_background_task, **options
+        )
+    
+    async def _call(self, capability: str, method: str, payload: Any = None, timeout: Optional[float] = None) -> Any:
+        """
+        Call a method on the provider of one of this module's `consumes`
+        capabilities, wherever it runs.
+        
+        Raises:
+            RpcTimeout: No reply within timeout seconds
+            RpcError: No provider or unknown method
+        """
+        return await self._rpc_for(capability, self.manifest.consumes, "consumes").call(
+            capability, method, payload, timeout
+        )
+    
+    def _close_rpc(self) -> int:
+        """Withdraw all RPC capabilities this module serves"""
+        if self._rpc_router is None:
+            return 0
+        return self._rpc_router.unserve_owner(self.manifest.id)
+    
+    async def _run_blocking(self, fn: Callable, *args) -> Any:
+        """
+        Run a blocking callable on this module's thread pool and await
+        its result, so blocking I/O does not stall the event loop.
+        
+        The pool has manifest.resources["threads"] workers (default 1).
+        Calls beyond that queue up; queue depth, wait and run time are
+        exported as executor_* metrics.
+        
+        Usage:
+            data = await self._run_blocking(path.read_bytes)
+        """
+        if self._executor is None:
+            raise RuntimeError(f"Module {self.manifest.id} has no executor (not loaded, or resources.threads is 0)")
+        return await self._executor.submit(fn, args)
+    
+    def _open_executor(self):
+        """Create the thread pool sized from manifest.resources["threads"]"""
+        if self._executor is not None:
+            return
+        threads = int(self.manifest.resources.get("threads", 1))
+        if threads > 0:
+            self._executor = _BlockingExecutor(self, threads)
+    
+    async def _shutdown_executor(self, timeout: float = 5.0):
+        """Shut the thread pool down, waiting up to timeout for running calls"""
+        executor, self._executor = self._executor, None
+        if executor is None:
+            return
+        
+        still_running = await executor.shutdown(timeout)
+        if still_running:
+            # Threads cannot be interrupted; they finish in the background
+            self.logger.warning(f"{still_running} blocking calls still running after {timeout}s executor shutdown")
+    
+    def _bus_for(self, topic: str, declared: List[str], field_name: str) -> MessageBus:
+        if topic not in declared:
+            raise ValueError(f"Module {self.manifest.id} does not declare topic {topic!r} in {field_name}")
+        if self._message_bus is None:
+            raise RuntimeError(f"Module {self.manifest.id} has no message bus attached")
+        return self._message_bus
+    
+    def _rpc_for(self, capability: str, declared: List[str], field_name: str) -> RpcRouter:
+        if capability not in declared:
+            raise ValueError(f"Module {self.manifest.id} does not declare capability {capability!r} in {field_name}")
+        if self._rpc_router is None:
+            raise RuntimeError(f"Module {self.manifest.id} has no RPC router attached")
+        return self._rpc_router
+    
+    def _timer_callback(self, callback: Callable) -> Callable:
+        """Adapt a timer callback: spawn coroutines, skip overlapping runs"""
+        running: Optional[asyncio.Task] = None
+        
+        def fire(*args):
+            nonlocal running
+            if running is not None and not running.done():
+                self.metrics.increment("timer_overruns_total")
+                return
+            result = callback(*args)
+            if asyncio.iscoroutine(result):
+                running = self._spawn_background_task(result, name=f"{self.manifest.id}_timer")
+        
+        return fire
+    
+    def _accounted(self, coro):
+        """
+        Wrap a coroutine so the CPU time of each step is charged to this
+        module's _resource_usage["cpu_seconds"].
+        """
+        return account_coroutine(coro, self._resource_usage)
+    
     async def _cancel_background_tasks(self, timeout: float = 5.0):
         """Cancel all background tasks with timeout"""
         if not self._background_tasks:
@@ -317,8 +669,7 @@ class BaseModule(ABC):
                 if not task.done():
                     task.cancel()
     
-    @asynccontextmanager
-    async def _track_operation(self, operation: str):
+    def _track_operation(self, operation: str) -> "_TrackedOperation":
         """
         Context manager for tracking operations with metrics.
         
@@ -326,19 +677,12 @@ class BaseModule(ABC):
             async with self._track_operation("database_query"):
                 await db.query(...)
         """
-        start = time.time()
-        self.metrics.increment(f"{operation}_total")
-        
-        try:
-            yield
-            self.metrics.increment(f"{operation}_success")
-        except Exception as e:
-            self.metrics.increment(f"{operation}_error")
-            self.logger.error(f"{operation} failed: {e}", exc_info=True)
-            raise
-        finally:
-            duration = time.time() - start
-            self.metrics.histogram(f"{operation}_duration_seconds", duration)
+        handles = self._operation_metrics.get(operation)
+        if handles is None:
+            handles = self._operation_metrics[operation] = _OperationMetrics(
+                self.metrics, operation
+            )
+        return _TrackedOperation(self, operation, handles)
     
     def _require_permission(self, permission: str):
         """
@@ -395,3 +739,57 @@ class BaseModule(ABC):
             f"Security context set: {ctx.principal}",
             extra={"principal": ctx.principal, "roles": ctx.roles}
         )
+    
+    @property
+    def health_table(self) -> Optional[HealthTable]:
+        """Daemon health table this module publishes to"""
+        return self._health_table
+    
+    @health_table.setter
+    def health_table(self, table: Optional[HealthTable]):
+        """Attach a health table and publish the current state into it"""
+        self._health_table = table
+        self._publish_state()
+    
+    @property
+    def timer_service(self) -> Optional[TimerService]:
+        """Daemon timer service backing _call_later/_call_every"""
+        return self._timer_service
+    
+    @timer_service.setter
+    def timer_service(self, service: Optional[TimerService]):
+        self._timer_service = service
+    
+    @property
+    def message_bus(self) -> Optional[MessageBus]:
+        """Daemon message bus backing _publish/_subscribe"""
+        return self._message_bus
+    
+    @message_bus.setter
+    def message_bus(self, bus: Optional[MessageBus]):
+        self._message_bus = bus
+    
+    @property
+    def rpc_router(self) -> Optional[RpcRouter]:
+        """Daemon RPC router backing _serve/_call"""
+        return self._rpc_router
+    
+    @rpc_router.setter
+    def rpc_router(self, router: Optional[RpcRouter]):
+        self._rpc_router = router
+    
+    def subscribe_state(
+        self,
+        listener: Callable[["BaseModule", ModuleState, ModuleState], None]
+    ) -> Callable[[], None]:
+        """
+        Call listener(module, old_state, new_state) synchronously on every
+        state transition; returns an unsubscribe callable.
+        """
+        self._state_listeners.append(listener)
+        
+        def unsubscribe():
+            if listener in self._state_listeners:
+                self._state_listeners.remove(listener)
+        
+        return unsubscribe
@@ -0,0 +1,213 @@
+"""
+NEXUS v2 - Event Loop Monitor
+Addresses Review: One blocking module stalls every module on the shared loop
+
+A sampler task sleeps for a fixed interval and records how late it wakes
+up against a monotonic deadline; that delay is the loop's scheduling lag.
+A watchdog thread watches the sampler's last tick and, when the loop has
+been stuck for longer than the slow-callback threshold, inspects the task
+currently running on the loop to find the module responsible.
+"""
+
+import asyncio
+import fnmatch
+import logging
+import sys
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from .accounting import module_source_patterns
+from .metrics import MetricsCollector
+
+
+logger = logging.getLogger(__name__)
+
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+UNKNOWN_MODULE = "unknown"
+
+
+class LoopMonitor:
+    """
+    Loop-lag sampler with slow-callback attribution.
+    
+    Lag is recorded in the loop_lag_seconds histogram (p50/p99 exported as
+    its quantile family). Stalls are counted per module in
+    slow_callbacks_total and logged once per offender, then at most once
+    per log_interval with the number of stalls suppressed in between.
+    """
+    
+    def __init__(
+        self,
+        metrics: MetricsCollector,
+        instances: Callable[[], Iterable],
+        interval: float = 0.1,
+        slow_callback_threshold: float = 0.25,
+        log_interval: float = 60.0
+    ):
+        self.metrics = metrics
+        self._instances = instances
+        self.interval = interval
+        self.slow_callback_threshold = slow_callback_threshold
+        self.log_interval = log_interval
+        
+        metrics.configure_histogram("loop_lag_seconds", LAG_BUCKETS, quantiles=(0.5, 0.99))
+        metrics.describe("loop_lag_seconds", "Event loop scheduling delay")
+        metrics.describe("slow_callbacks_total", "Loop stalls over the slow-callback threshold")
+        self._lag = metrics.histogram_handle("loop_lag_seconds")
+        
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        
+        self._last_tick = 0.0
+        
+        # offender -> [stall count, suppressed since last log, last log time]
+        self._offenders: Dict[Tuple[str, str], List[float]] = {}
+        self._patterns: Dict[type, List[str]] = {}
+    
+    async def start(self):
+        """Start the lag sampler and the watchdog thread"""
+        if self._task:
+            return
+        
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._last_tick = time.monotonic()
+        self._stop_event.clear()
+        
+        self._task = asyncio.create_task(self._sample_loop(), name="nexus_loop_monitor")
+        self._watchdog = threading.Thread(
+            target=self._watch, name="nexus-loop-watchdog", daemon=True
+        )
+        self._watchdog.start()
+        
+        logger.info(
+            f"Loop monitor started (interval: {self.interval}s, "
+            f"slow callback: {self.slow_callback_threshold}s)"
+        )
+    
+    async def stop(self):
+        """Stop sampling and join the watchdog"""
+        self._stop_event.set()
+        
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        
+        if self._watchdog:
+            self._watchdog.join(timeout=self.slow_callback_threshold * 2)
+            self._watchdog = None
+    
+    @property
+    def offenders(self) -> Dict[str, int]:
+        """Stall counts keyed by "module (task)" """
+        return {
+            f"{module_id} ({task_name})": int(entry[0])
+            for (module_id, task_name), entry in self._offenders.items()
+        }
+    
+    async def _sample_loop(self):
+        observe = self._lag.observe
+        interval = self.interval
+        
+        while True:
+            deadline = time.monotonic() + interval
+            await asyncio.sleep(interval)
+            now = time.monotonic()
+            self._last_tick = now
+            observe(max(0.0, now - deadline))
+    
+    def _watch(self):
+        """Watchdog thread: attribute stalls while they are happening"""
+        check = min(self.interval, self.slow_callback_threshold / 2)
+        reported_tick = None
+        
+        while not self._stop_event.wait(check):
+            tick = self._last_tick
+            if tick == reported_tick:
+                continue
+            
+            stalled = time.monotonic() - tick
+            if stalled < self.slow_callback_threshold + self.interval:
+                continue
+            
+            # One report per stall - the next report needs a fresh tick
+            reported_tick = tick
+            try:
+                self._report_stall(stalled)
+            except Exception as e:
+                logger.debug(f"Stall attribution failed: {e}")
+    
+    def _report_stall(self, stalled: float):
+        task = asyncio.current_task(self._loop)
+        task_name = task.get_name() if task else "<callback>"
+        frame = sys._current_frames().get(self._loop_thread_id)
+        
+        module_id = self._attribute(task_name, frame)
+        self._loop.call_soon_threadsafe(
+            self.metrics.increment, "slow_callbacks_total", 1, {"module": module_id}
+        )
+        
+        key = (module_id, task_name)
+        now = time.monotonic()
+        entry = self._offenders.get(key)
+        if entry is None:
+            self._offenders[key] = [1, 0, now]
+            logger.warning(
+                f"Event loop blocked for {stalled:.3f}s+ by {module_id} (task: {task_name})"
+                + self._location(frame)
+            )
+            return
+        
+        entry[0] += 1
+        entry[1] += 1
+        if now - entry[2] >= self.log_interval:
+            logger.warning(
+                f"Event loop blocked again by {module_id} (task: {task_name}), "
+                f"{int(entry[1])} stalls in the last {now - entry[2]:.0f}s"
+            )
+            entry[1] = 0
+            entry[2] = now
+    
+    def _attribute(self, task_name: str, frame) -> str:
+        """Map a stall to a module by task name, then by stack frames"""
+        instances = list(self._instances())
+        
+        best = None
+        for instance in instances:
+            module_id = instance.manifest.id
+            if task_name.startswith(module_id) and (best is None or len(module_id) > len(best)):
+                best = module_id
+        if best:
+            return best
+        
+        # Lifecycle calls run on the daemon's task - fall back to the stack
+        while frame is not None:
+            filename = frame.f_code.co_filename
+            for instance in instances:
+                for pattern in self._module_patterns(type(instance)):
+                    if fnmatch.fnmatch(filename, pattern):
+                        return instance.manifest.id
+            frame = frame.f_back
+        
+        return UNKNOWN_MODULE
+    
+    def _module_patterns(self, module_class: type) -> List[str]:
+        patterns = self._patterns.get(module_class)
+        if patterns is None:
+            patterns = self._patterns[module_class] = module_source_patterns(module_class)
+        return patterns
+    
+    @staticmethod
+    def _location(frame) -> str:
+        if frame is None:
+            return ""
+        return f" at {frame.f_code.co_filename}:{frame.f_lineno} in {frame.f_code.co_name}"
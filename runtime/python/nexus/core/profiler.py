@@ -0,0 +1,195 @@
+"""
+NEXUS v2 - Sampling Profiler
+Addresses Review: No way to tell which module is burning CPU
+
+On demand, a background thread snapshots the stacks of the loop thread
+and every worker thread at a fixed rate. Each stack is rooted at the
+module whose code is innermost on it, and the counts are written in the
+collapsed-stack format understood by flamegraph.pl and speedscope:
+    
+    vitals/heartbeat-client;MainThread;base_events.py:run_forever;... 42
+
+Nothing is installed while the profiler is idle, so the disabled cost is
+zero - there is no tracing hook and no thread.
+"""
+
+import fnmatch
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+from .accounting import module_source_patterns
+
+
+logger = logging.getLogger(__name__)
+
+UNATTRIBUTED = "unattributed"
+
+
+class SamplingProfiler:
+    """
+    Time-boxed stack sampler with per-module attribution.
+    
+    Only one session runs at a time. A session ends when its duration
+    elapses or stop() is called; the folded stacks are then written to
+    the session's output path (if any) and kept in `stacks` until the
+    next session starts.
+    """
+    
+    def __init__(self, instances: Callable[[], Iterable], max_depth: int = 128):
+        self._instances = instances
+        self.max_depth = max_depth
+        
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._done = threading.Event()
+        self._done.set()
+        
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.output: Optional[Path] = None
+        
+        # code object -> module ID (or None), resolved once per code object
+        self._code_modules: Dict[object, Optional[str]] = {}
+        self._patterns: List = []
+    
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+    
+    def start(self, duration: float = 30.0, rate: float = 100.0, output: Optional[Path] = None):
+        """
+        Start a profiling session.
+        
+        Args:
+            duration: Seconds to sample for
+            rate: Samples per second
+            output: Collapsed-stack file written when the session ends
+        """
+        if self.is_running:
+            raise RuntimeError("Profiler already running")
+        if duration <= 0 or rate <= 0:
+            raise ValueError("duration and rate must be positive")
+        
+        self.stacks = Counter()
+        self.samples = 0
+        self.output = Path(output).expanduser() if output else None
+        self._code_modules = {}
+        self._patterns = [
+            (instance.manifest.id, module_source_patterns(type(instance)))
+            for instance in self._instances()
+        ]
+        
+        self._stop_event.clear()
+        self._done.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(duration, 1.0 / rate),
+            name="nexus-profiler",
+            daemon=True
+        )
+        self._thread.start()
+        
+        logger.info(f"Profiler started ({duration}s at {rate} Hz)")
+    
+    def stop(self, timeout: Optional[float] = None) -> bool:
+        """
+        End the session early and wait for its output.
+        
+        Returns:
+            True if the session has finished
+        """
+        self._stop_event.set()
+        return self._done.wait(timeout)
+    
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait for the current session to finish on its own"""
+        return self._done.wait(timeout)
+    
+    def collapsed(self) -> str:
+        """Folded stacks, one "frame;frame;... count" line each"""
+        return "".join(
+            f"{stack} {count}\n" for stack, count in self.stacks.most_common()
+        )
+    
+    def by_module(self) -> Dict[str, int]:
+        """Sample counts per root module"""
+        totals: Counter = Counter()
+        for stack, count in self.stacks.items():
+            totals[stack.split(";", 1)[0]] += count
+        return dict(totals)
+    
+    def _run(self, duration: float, period: float):
+        own_ident = threading.get_ident()
+        deadline = time.monotonic() + duration
+        
+        try:
+            while not self._stop_event.wait(period):
+                self._sample(own_ident)
+                if time.monotonic() >= deadline:
+                    break
+            
+            if self.output:
+                self._write()
+            
+            logger.info(
+                f"Profiler finished: {self.samples} samples"
+                + (f", written to {self.output}" if self.output else "")
+            )
+        except Exception as e:
+            logger.error(f"Profiler failed: {e}", exc_info=True)
+        finally:
+            self._done.set()
+    
+    def _sample(self, own_ident: int):
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        stacks = self.stacks
+        
+        for ident, frame in sys._current_frames().items():
+            if ident == own_ident:
+                continue
+            
+            labels = []
+            module_id = None
+            while frame is not None and len(labels) < self.max_depth:
+                code = frame.f_code
+                if module_id is None:
+                    module_id = self._module_of(code)
+                labels.append(
+                    f"{os.path.basename(code.co_filename)}:"
+                    f"{getattr(code, 'co_qualname', code.co_name)}"
+                )
+                frame = frame.f_back
+            
+            labels.append(names.get(ident, str(ident)).replace(";", ":"))
+            labels.append(module_id or UNATTRIBUTED)
+            labels.reverse()
+            stacks[";".join(labels)] += 1
+        
+        self.samples += 1
+    
+    def _module_of(self, code) -> Optional[str]:
+        try:
+            return self._code_modules[code]
+        except KeyError:
+            pass
+        
+        module_id = None
+        for candidate, patterns in self._patterns:
+            if any(fnmatch.fnmatch(code.co_filename, pattern) for pattern in patterns):
+                module_id = candidate
+                break
+        
+        self._code_modules[code] = module_id
+        return module_id
+    
+    def _write(self):
+        self.output.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.output.with_suffix(self.output.suffix + ".tmp")
+        tmp.write_text(self.collapsed(), encoding="utf-8")
+        tmp.replace(self.output)
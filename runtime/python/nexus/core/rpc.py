@@ -0,0 +1,694 @@
+"""
+NEXUS v2 - Module RPC
+Addresses Review: provides/consumes covered pub/sub only, no request/response
+
+Awaitable calls between modules, addressed by a capability name from the
+provider's `provides`:
+
+    # provider (capability "substrate.query" in provides)
+    self._serve("substrate.query", "lookup", self._lookup)
+
+    # caller (capability "substrate.query" in consumes)
+    row = await self._call("substrate.query", "lookup", {"key": key}, timeout=0.5)
+
+- Batching: calls to one target made within the same loop tick are
+  queued and flushed together on the next tick. A method served with
+  batch=True gets one handler call with every payload of the flush; a
+  target in a worker process gets one frame.
+- Pipelining: callers never wait for earlier calls, and replies complete
+  out of order.
+- Deadlines: every call has one (default 5s). A request still queued at
+  its deadline is never dispatched; a running async handler is
+  cancelled; a remote peer is told to cancel. The caller gets RpcTimeout.
+- Concurrency cap: at most max_in_flight requests per target are
+  dispatched and still running (or, remotely, unanswered), even when
+  their callers timed out; the rest wait in the target's queue.
+- Transport: in-process targets are dispatched directly - no copy, no
+  serialization, so payloads and results must not be mutated afterwards.
+  A target in another process is reached through an RpcChannel, a socket
+  carrying length-prefixed pickled batches.
+
+Metrics (capability label) on the "rpc" collector:
+nexus_rpc_calls_total, _errors_total, _timeouts_total and
+_latency_seconds, measured by the caller.
+"""
+
+import asyncio
+import logging
+import pickle
+import socket
+import struct
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from .metrics import MetricsCollector
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = 5.0
+DEFAULT_MAX_IN_FLIGHT = 64
+
+FRAME = struct.Struct("<I")
+MAX_FRAME = 64 * 1024 * 1024
+
+LATENCY_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+Handler = Callable[[Any], Any]
+
+
+class RpcError(Exception):
+    """Call could not be routed or delivered, or a remote handler failed"""
+
+
+class RpcTimeout(RpcError, TimeoutError):
+    """Call missed its deadline"""
+
+
+class _Request:
+    __slots__ = ("method", "payload", "future", "deadline")
+    
+    def __init__(self, method: str, payload: Any, future: asyncio.Future, deadline: float):
+        self.method = method
+        self.payload = payload
+        self.future = future
+        self.deadline = deadline
+
+
+class _Target(ABC):
+    """
+    Queue, flush scheduling and concurrency cap of one capability.
+    
+    A dispatched request holds its in-flight slot until the handler
+    finishes or the remote reply arrives, even if the caller gave up
+    earlier; _dispatch implementations call _release() for each.
+    """
+    
+    def __init__(self, router: "RpcRouter", capability: str, owner: Optional[str], max_in_flight: int):
+        self.router = router
+        self.capability = capability
+        self.owner = owner
+        self.max_in_flight = max_in_flight
+        self.in_flight = 0
+        self.queue: Deque[_Request] = deque()
+        self._scheduled = False
+    
+    def submit(self, request: _Request):
+        self.queue.append(request)
+        self._schedule()
+    
+    def close(self, reason: str):
+        """Fail every queued request"""
+        while self.queue:
+            request = self.queue.popleft()
+            if not request.future.done():
+                request.future.set_exception(RpcError(f"{self.capability}: {reason}"))
+    
+    def _schedule(self):
+        if not self._scheduled:
+            self._scheduled = True
+            self.router._loop().call_soon(self._flush)
+    
+    def _flush(self):
+        self._scheduled = False
+        batch: List[_Request] = []
+        queue = self.queue
+        while queue and self.in_flight < self.max_in_flight:
+            request = queue.popleft()
+            if request.future.done():
+                # Expired or cancelled while queued
+                continue
+            self.in_flight += 1
+            batch.append(request)
+        if batch:
+            self._dispatch(batch)
+    
+    def _release(self, count: int = 1):
+        self.in_flight -= count
+        if self.queue:
+            self._schedule()
+    
+    @abstractmethod
+    def _dispatch(self, batch: List[_Request]):
+        """Start every request in batch"""
+
+
+class _LocalTarget(_Target):
+    """Handlers registered in this process, called directly"""
+    
+    def __init__(self, router, capability, owner, max_in_flight, spawn: Optional[Callable]):
+        super().__init__(router, capability, owner, max_in_flight)
+        self.methods: Dict[str, Tuple[Handler, bool]] = {}
+        self.spawn = spawn or (lambda coro, name=None: asyncio.ensure_future(coro))
+    
+    def _dispatch(self, batch: List[_Request]):
+        by_method: Dict[str, List[_Request]] = {}
+        for request in batch:
+            by_method.setdefault(request.method, []).append(request)
+        
+        for method, requests in by_method.items():
+            entry = self.methods.get(method)
+            if entry is None:
+                _fail(requests, RpcError(f"{self.capability} has no method {method!r}"))
+                self._release(len(requests))
+                continue
+            handler, batched = entry
+            if batched:
+                self._run(handler, [request.payload for request in requests], requests, True)
+            else:
+                for request in requests:
+                    self._run(handler, request.payload, [request], False)
+    
+    def _run(self, handler: Handler, argument: Any, requests: List[_Request], batched: bool):
+        try:
+            result = handler(argument)
+        except Exception as e:
+            _fail(requests, e)
+            self._release(len(requests))
+            return
+        
+        if not asyncio.iscoroutine(result):
+            _settle(requests, result, batched)
+            self._release(len(requests))
+            return
+        
+        task = self.spawn(result, name=f"rpc_{self.capability}_{requests[0].method}")
+        
+        def done(task):
+            _settle_task(requests, task, batched)
+            self._release(len(requests))
+        
+        task.add_done_callback(done)
+        if not batched:
+            # Deadline or caller cancellation stops the handler
+            requests[0].future.add_done_callback(lambda f: task.cancel() if not task.done() else None)
+
+
+class _RemoteTarget(_Target):
+    """Capability served in another process, reached through a channel"""
+    
+    def __init__(self, router, capability, owner, max_in_flight, channel: "RpcChannel"):
+        super().__init__(router, capability, owner, max_in_flight)
+        self.channel = channel
+    
+    def _dispatch(self, batch: List[_Request]):
+        self.channel._send_calls(self.capability, batch, self._release)
+
+
+def _fail(requests: List[_Request], error: BaseException):
+    for request in requests:
+        if not request.future.done():
+            request.future.set_exception(error)
+
+
+def _settle(requests: List[_Request], result: Any, batched: bool):
+    if not batched:
+        if not requests[0].future.done():
+            requests[0].future.set_result(result)
+        return
+    
+    try:
+        results = list(result)
+    except TypeError:
+        results = None
+    if results is None or len(results) != len(requests):
+        _fail(requests, RpcError(f"Batch handler returned {type(result).__name__}, expected {len(requests)} results"))
+        return
+    for request, value in zip(requests, results):
+        if not request.future.done():
+            request.future.set_result(value)
+
+
+def _settle_task(requests: List[_Request], task: asyncio.Task, batched: bool):
+    if task.cancelled():
+        _fail(requests, RpcError("Handler cancelled"))
+    elif task.exception() is not None:
+        _fail(requests, task.exception())
+    else:
+        _settle(requests, task.result(), batched)
+
+
+class RpcChannel:
+    """
+    One end of a socket connecting two RpcRouters, usually the daemon
+    and a worker process.
+    
+    Frames are a 4-byte little-endian length and a pickled tuple:
+        
+        ("call",   [(id, capability, method, payload, timeout), ...])
+        ("reply",  [(id, ok, value), ...])
+        ("cancel", [id, ...])
+    
+    Calls, replies and cancellations produced in one loop tick go out in
+    one frame. Incoming calls are dispatched to the router's own targets
+    and never routed back over the channel they arrived on.
+    """
+    
+    def __init__(self, router: "RpcRouter", sock: socket.socket, name: str = "channel"):
+        self.router = router
+        self.name = name
+        self.closed = False
+        self._sock = sock
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._task: Optional[asyncio.Task] = None
+        self._next_id = 0
+        # Our calls awaiting a reply, by id, with the target's slot release
+        self._pending: Dict[int, Tuple[_Request, Callable[[], None]]] = {}
+        # Peer calls we are serving, by id
+        self._serving: Dict[int, asyncio.Future] = {}
+        self._outbox: Dict[str, list] = {"call": [], "reply": [], "cancel": []}
+        self._scheduled = False
+        self._closed_event = asyncio.Event()
+    
+    async def open(self):
+        self._reader, self._writer = await asyncio.open_unix_connection(sock=self._sock)
+        self._task = asyncio.create_task(self._read_loop(), name=f"rpc_{self.name}")
+        self.router._channels.append(self)
+    
+    async def close(self):
+        self._shutdown("channel closed")
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._task = None
+        if self._writer is not None:
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except Exception:
+                pass
+    
+    async def wait_closed(self):
+        """Return once the channel is closed, by either side"""
+        await self._closed_event.wait()
+    
+    # Sending
+    
+    def _send_calls(self, capability: str, batch: List[_Request], release: Callable[[], None]):
+        if self.closed:
+            _fail(batch, RpcError(f"{capability}: {self.name} closed"))
+            for _ in batch:
+                release()
+            return
+        now = self.router._loop().time()
+        calls = self._outbox["call"]
+        for request in batch:
+            self._next_id += 1
+            call_id = self._next_id
+            self._pending[call_id] = (request, release)
+            request.future.add_done_callback(lambda f, call_id=call_id: self._forget(call_id))
+            calls.append((call_id, capability, request.method, request.payload, request.deadline - now))
+        self._schedule()
+    
+    def _forget(self, call_id: int):
+        """
+        Our call completed; if that was not a reply, cancel it remotely.
+        It stays pending until the peer confirms, so its slot stays taken.
+        """
+        if call_id in self._pending and not self.closed:
+            self._outbox["cancel"].append(call_id)
+            self._schedule()
+    
+    def _schedule(self):
+        if not self._scheduled:
+            self._scheduled = True
+            self.router._loop().call_soon(self._flush)
+    
+    def _flush(self):
+        self._scheduled = False
+        if self.closed:
+            return
+        frames = []
+        for kind, items in self._outbox.items():
+            if items:
+                self._outbox[kind] = []
+                frames.extend(self._encode(kind, items))
+        if not frames:
+            return
+        try:
+            self._writer.write(b"".join(frames))
+        except Exception as e:
+            logger.error(f"RPC {self.name} write failed: {e}")
+            self._shutdown("write failed")
+    
+    def _encode(self, kind: str, items: list) -> List[bytes]:
+        """
+        One frame for items; if that fails (unpicklable or oversized), one
+        frame per item, failing just the items that cannot be sent.
+        """
+        try:
+            return [_encode_frame((kind, items))]
+        except Exception:
+            pass
+        
+        frames = []
+        for item in items:
+            try:
+                frames.append(_encode_frame((kind, [item])))
+                continue
+            except Exception as e:
+                error = RpcError(f"Cannot send {kind}: {type(e).__name__}: {e}")
+            logger.warning(f"RPC {self.name}: {error}")
+            if kind == "call":
+                entry = self._pending.pop(item[0], None)
+                if entry is not None:
+                    request, release = entry
+                    if not request.future.done():
+                        request.future.set_exception(error)
+                    release()
+            elif kind == "reply":
+                frames.append(_encode_frame((kind, [(item[0], False, error)])))
+        return frames
+    
+    # Receiving
+    
+    async def _read_loop(self):
+        try:
+            while True:
+                header = await self._reader.readexactly(FRAME.size)
+                (size,) = FRAME.unpack(header)
+                if size > MAX_FRAME:
+                    raise RpcError(f"Frame too large: {size} bytes")
+                kind, items = pickle.loads(await self._reader.readexactly(size))
+                if kind == "call":
+                    self._on_calls(items)
+                elif kind == "reply":
+                    self._on_replies(items)
+                elif kind == "cancel":
+                    self._on_cancels(items)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"RPC {self.name} read failed: {e}", exc_info=True)
+        finally:
+            self._shutdown("peer disconnected")
+    
+    def _on_calls(self, items):
+        router = self.router
+        for call_id, capability, method, payload, timeout in items:
+            future = router._submit(capability, method, payload, timeout, origin=self)
+            self._serving[call_id] = future
+            future.add_done_callback(lambda f, call_id=call_id: self._reply(call_id, f))
+    
+    def _reply(self, call_id: int, future: asyncio.Future):
+        if self._serving.pop(call_id, None) is None or self.closed:
+            return
+        if future.cancelled():
+            # Confirms a cancel, so the caller frees the slot
+            self._outbox["reply"].append((call_id, False, RpcError("Cancelled by caller")))
+            self._schedule()
+            return
+        error = future.exception()
+        if error is None:
+            self._outbox["reply"].append((call_id, True, future.result()))
+        else:
+            self._outbox["reply"].append((call_id, False, _portable(error)))
+        self._schedule()
+    
+    def _on_replies(self, items):
+        for call_id, ok, value in items:
+            entry = self._pending.pop(call_id, None)
+            if entry is None:
+                continue
+            request, release = entry
+            release()
+            if request.future.done():
+                continue
+            if ok:
+                request.future.set_result(value)
+            else:
+                request.future.set_exception(value)
+    
+    def _on_cancels(self, items):
+        for call_id in items:
+            # _reply() confirms once the call is done
+            future = self._serving.get(call_id)
+            if future is not None and not future.done():
+                future.cancel()
+    
+    def _shutdown(self, reason: str):
+        if self.closed:
+            return
+        self.closed = True
+        self._closed_event.set()
+        if self in self.router._channels:
+            self.router._channels.remove(self)
+        self.router._drop_channel(self, reason)
+        
+        pending, self._pending = self._pending, {}
+        _fail([request for request, _ in pending.values()], RpcError(f"{self.name}: {reason}"))
+        for _, release in pending.values():
+            release()
+        serving, self._serving = self._serving, {}
+        for future in serving.values():
+            future.cancel()
+
+
+def _encode_frame(message) -> bytes:
+    payload = pickle.dumps(message, protocol=pickle.HIGHEST_PROTOCOL)
+    if len(payload) > MAX_FRAME:
+        raise RpcError(f"Frame too large: {len(payload)} bytes")
+    return FRAME.pack(len(payload)) + payload
+
+
+def _portable(error: BaseException) -> BaseException:
+    """The exception itself if it survives pickling, else an RpcError"""
+    try:
+        pickle.loads(pickle.dumps(error))
+        return error
+    except Exception:
+        return RpcError(f"{type(error).__name__}: {error}")
+
+
+class RpcRouter:
+    """
+    Daemon-level RPC router: capability -> target.
+    
+    Usage:
+        router.serve("substrate.query", "lookup", lookup, owner="substrate/store")
+        row = await router.call("substrate.query", "lookup", {"key": 7})
+    
+    In a worker process, set_upstream(channel) sends calls for
+    capabilities not served locally to the parent.
+    """
+    
+    def __init__(self, metrics: Optional[MetricsCollector] = None, default_timeout: float = DEFAULT_TIMEOUT):
+        self.metrics = metrics or MetricsCollector("rpc")
+        self.default_timeout = default_timeout
+        self._targets: Dict[str, _Target] = {}
+        self._upstream: Optional[RpcChannel] = None
+        self._upstream_max_in_flight = DEFAULT_MAX_IN_FLIGHT
+        self._upstream_targets: Dict[str, _RemoteTarget] = {}
+        self._channels: List[RpcChannel] = []
+        self._handles: Dict[str, tuple] = {}
+        for name, help_text in (
+            ("calls_total", "RPC calls made per capability"),
+            ("errors_total", "RPC calls that failed per capability, timeouts included"),
+            ("timeouts_total", "RPC calls that missed their deadline per capability"),
+            ("latency_seconds", "RPC call latency seen by the caller"),
+        ):
+            self.metrics.describe(name, help_text)
+        self.metrics.configure_histogram("latency_seconds", buckets=LATENCY_BUCKETS, quantiles=(0.5, 0.99))
+    
+    def serve(
+        self,
+        capability: str,
+        method: str,
+        handler: Handler,
+        owner: Optional[str] = None,
+        batch: bool = False,
+        max_in_flight: Optional[int] = None,
+        spawn: Optional[Callable] = None
+    ):
+        """
+        Serve method of capability in this process.
+        
+        Args:
+            capability: Capability name
+            method: Method name
+            handler: handler(payload) -> result, or with batch=True
+                handler([payload, ...]) -> [result, ...] in the same order;
+                may be a coroutine function
+            owner: Module id, for unserve_owner()
+            batch: Receive every payload of one flush in a single call
+            max_in_flight: Concurrency cap of the whole capability
+                (default 64)
+            spawn: Task factory for async handlers, e.g. a module's
+                _spawn_background_task (default asyncio.ensure_future)
+        
+        Raises:
+            ValueError: capability is served by another owner or routed
+                to a worker process
+        """
+        target = self._targets.get(capability)
+        if target is None:
+            target = self._targets[capability] = _LocalTarget(
+                self, capability, owner, max_in_flight or DEFAULT_MAX_IN_FLIGHT, spawn
+            )
+        elif not isinstance(target, _LocalTarget) or target.owner != owner:
+            raise ValueError(f"Capability {capability!r} is already served by {target.owner or '?'}")
+        elif max_in_flight:
+            target.max_in_flight = max_in_flight
+        target.methods[method] = (handler, batch)
+    
+    def route(
+        self,
+        capability: str,
+        channel: RpcChannel,
+        owner: Optional[str] = None,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT
+    ):
+        """Send calls for capability over channel (provider in another process)"""
+        target = self._targets.get(capability)
+        if target is not None and target.owner != owner:
+            raise ValueError(f"Capability {capability!r} is already served by {target.owner or '?'}")
+        self._targets[capability] = _RemoteTarget(self, capability, owner, max_in_flight, channel)
+    
+    def set_upstream(self, channel: Optional[RpcChannel], max_in_flight: int = DEFAULT_MAX_IN_FLIGHT):
+        """Fallback channel for capabilities with no target here"""
+        self._upstream = channel
+        self._upstream_max_in_flight = max_in_flight
+        for target in self._upstream_targets.values():
+            target.close("upstream changed")
+        self._upstream_targets.clear()
+    
+    def unserve_owner(self, owner: str) -> int:
+        """Withdraw every capability owner serves or routes; queued calls fail"""
+        capabilities = [name for name, target in self._targets.items() if target.owner == owner]
+        for capability in capabilities:
+            self._targets.pop(capability).close("provider withdrawn")
+        return len(capabilities)
+    
+    def close(self):
+        for target in list(self._targets.values()) + list(self._upstream_targets.values()):
+            target.close("router closed")
+        self._targets.clear()
+        self._upstream_targets.clear()
+        for channel in list(self._channels):
+            channel._shutdown("router closed")
+    
+    def providers(self) -> Dict[str, Dict[str, Any]]:
+        """Per-capability target state"""
+        return {
+            capability: {
+                "owner": target.owner,
+                "remote": isinstance(target, _RemoteTarget),
+                "methods": sorted(target.methods) if isinstance(target, _LocalTarget) else None,
+                "queued": len(target.queue),
+                "in_flight": target.in_flight,
+                "max_in_flight": target.max_in_flight,
+            }
+            for capability, target in self._targets.items()
+        }
+    
+    async def call(self, capability: str, method: str, payload: Any = None, timeout: Optional[float] = None) -> Any:
+        """
+        Call method on the provider of capability.
+        
+        Raises:
+            RpcTimeout: No reply within timeout seconds (default 5s)
+            RpcError: No provider, unknown method or a dead channel
+            Exception: Whatever the handler raised
+        """
+        calls, errors, timeouts, latency = self._metric_handles(capability)
+        calls.inc()
+        started = time.perf_counter()
+        try:
+            return await self._submit(capability, method, payload, timeout)
+        except RpcTimeout:
+            timeouts.inc()
+            errors.inc()
+            raise
+        except Exception:
+            errors.inc()
+            raise
+        finally:
+            latency.observe(time.perf_counter() - started)
+    
+    def notify(self, capability: str, method: str, payload: Any = None, timeout: Optional[float] = None):
+        """One-way call: same routing and batching as call(), result discarded, failures logged"""
+        future = self._submit(capability, method, payload, timeout)
+        future.add_done_callback(_log_notify_failure)
+    
+    # Internal
+    
+    def _loop(self) -> asyncio.AbstractEventLoop:
+        return asyncio.get_running_loop()
+    
+    def _submit(
+        self,
+        capability: str,
+        method: str,
+        payload: Any,
+        timeout: Optional[float],
+        origin: Optional[RpcChannel] = None
+    ) -> asyncio.Future:
+        loop = self._loop()
+        future = loop.create_future()
+        target = self._target(capability, origin)
+        if target is None:
+            future.set_exception(RpcError(f"No provider for capability {capability!r}"))
+            return future
+        
+        if timeout is None:
+            timeout = self.default_timeout
+        deadline = loop.time() + timeout
+        expiry = loop.call_at(deadline, _expire, future, capability, method, timeout)
+        future.add_done_callback(lambda f: expiry.cancel())
+        target.submit(_Request(method, payload, future, deadline))
+        return future
+    
+    def _target(self, capability: str, origin: Optional[RpcChannel]) -> Optional[_Target]:
+        target = self._targets.get(capability)
+        if target is not None:
+            if isinstance(target, _RemoteTarget) and target.channel is origin:
+                return None
+            return target
+        
+        upstream = self._upstream
+        if upstream is None or upstream is origin or upstream.closed:
+            return None
+        target = self._upstream_targets.get(capability)
+        if target is None:
+            target = self._upstream_targets[capability] = _RemoteTarget(
+                self, capability, None, self._upstream_max_in_flight, upstream
+            )
+        return target
+    
+    def _drop_channel(self, channel: RpcChannel, reason: str):
+        for capability, target in list(self._targets.items()):
+            if isinstance(target, _RemoteTarget) and target.channel is channel:
+                del self._targets[capability]
+                target.close(reason)
+        if channel is self._upstream:
+            self.set_upstream(None)
+    
+    def _metric_handles(self, capability: str) -> tuple:
+        handles = self._handles.get(capability)
+        if handles is None:
+            labels = {"capability": capability}
+            handles = self._handles[capability] = (
+                self.metrics.counter("calls_total", labels),
+                self.metrics.counter("errors_total", labels),
+                self.metrics.counter("timeouts_total", labels),
+                self.metrics.histogram_handle("latency_seconds", labels),
+            )
+        return handles
+
+
+def _log_notify_failure(future: asyncio.Future):
+    if not future.cancelled() and future.exception() is not None:
+        logger.warning(f"RPC notify failed: {future.exception()}")
+
+
+def _expire(future: asyncio.Future, capability: str, method: str, timeout: float):
+    if not future.done():
+        future.set_exception(RpcTimeout(f"{capability}.{method} timed out after {timeout:.3f}s"))
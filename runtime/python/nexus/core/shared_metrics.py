@@ -0,0 +1,384 @@
+"""
+NEXUS v2 - Shared-Memory Metrics
+Addresses Review: Metrics lost across worker processes
+
+Each worker process owns one shared-memory segment and is its only
+writer, so increments are plain stores into the mapping - no locks and
+no IPC. The parent daemon maps every segment read-only and sums series
+across processes at scrape time.
+
+Segment layout (little-endian, 8-byte aligned):
+    
+    header       64 bytes  magic, capacities, published descriptor count
+    generations  u64[owners]      per-module write generation
+    counters     f64[counters]
+    gauges       f64[gauges]
+    histograms   f64[histogram_doubles]  buckets..., sum, count per series
+    descriptors  DESCRIPTOR_SIZE * descriptors   JSON series descriptors
+
+A descriptor is written before the published count is bumped, so a
+reader only ever sees complete entries.
+"""
+
+import json
+import logging
+import os
+import struct
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .metrics import Histogram, MetricsCollector, MetricsRegistry
+
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"NXM1"
+_HEADER = struct.Struct("<4sIIIIIIII")   # magic, version, owners, counters, gauges, hist doubles, descriptors, published, pid
+HEADER_SIZE = 64
+DESCRIPTOR_SIZE = 256
+LAYOUT_VERSION = 1
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Attach to an existing segment without handing it to the resource tracker"""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        pass
+    
+    # Python < 3.13 registers every attach with the resource tracker. A
+    # multiprocessing child shares its parent's tracker, which is harmless;
+    # an unrelated process would start its own tracker and unlink the
+    # segment at exit, so only then is the registration withdrawn.
+    from multiprocessing import resource_tracker
+    own_tracker = getattr(resource_tracker._resource_tracker, "_fd", None) is None
+    
+    shm = shared_memory.SharedMemory(name=name)
+    if own_tracker:
+        try:
+            resource_tracker.unregister(shm._name, "shared_memory")
+        except Exception:
+            pass
+    return shm
+
+
+class SharedMetricsSegment:
+    """
+    Fixed-layout shared-memory segment for one process's metrics.
+    
+    The writer passes the segment to MetricsRegistry(segment=...) (see
+    use_shared_registry()); the registry then keeps its counter, gauge,
+    histogram and generation buffers inside the mapping.
+    """
+    
+    def __init__(
+        self,
+        name: Optional[str] = None,
+        create: bool = False,
+        owners: int = 256,
+        counters: int = 4096,
+        gauges: int = 1024,
+        histogram_doubles: int = 16384,
+        descriptors: int = 4096
+    ):
+        if create:
+            capacities = (owners, counters, gauges, histogram_doubles, descriptors)
+            size = HEADER_SIZE + 8 * (owners + counters + gauges + histogram_doubles)
+            size += DESCRIPTOR_SIZE * descriptors
+            self._shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+            _HEADER.pack_into(self._shm.buf, 0, MAGIC, LAYOUT_VERSION, *capacities, 0, os.getpid())
+        else:
+            if name is None:
+                raise ValueError("name is required to attach to a segment")
+            self._shm = _attach(name)
+            magic, version, *capacities, _, _ = _HEADER.unpack_from(self._shm.buf, 0)
+            if magic != MAGIC or version != LAYOUT_VERSION:
+                self._shm.close()
+                raise ValueError(f"{name} is not a NEXUS metrics segment (v{LAYOUT_VERSION})")
+        
+        self.owner_capacity, self.counter_capacity, self.gauge_capacity, \
+            self.histogram_capacity, self.descriptor_capacity = capacities
+        self._created = create
+        self._histogram_used = 0
+        self._descriptor_cache: List[Dict[str, Any]] = []
+        
+        # Typed views over each region
+        buf = self._shm.buf
+        offset = HEADER_SIZE
+        regions = []
+        for count, fmt in (
+            (self.owner_capacity, "Q"),
+            (self.counter_capacity, "d"),
+            (self.gauge_capacity, "d"),
+            (self.histogram_capacity, "d"),
+        ):
+            regions.append(buf[offset:offset + 8 * count].cast(fmt))
+            offset += 8 * count
+        self.generations, self.counters, self.gauges, self.histograms = regions
+        self._descriptor_offset = offset
+    
+    @property
+    def name(self) -> str:
+        return self._shm.name
+    
+    @property
+    def published(self) -> int:
+        """Number of descriptors visible to readers"""
+        return struct.unpack_from("<I", self._shm.buf, 28)[0]
+    
+    @property
+    def pid(self) -> int:
+        """PID of the process that last claimed the segment for writing"""
+        return struct.unpack_from("<I", self._shm.buf, 32)[0]
+    
+    def claim(self):
+        """Record the current process as the segment's writer"""
+        struct.pack_into("<I", self._shm.buf, 32, os.getpid())
+    
+    # Writer side
+    
+    def publish(self, kind: int, index: int, module_id: str, name: str = "",
+                labels: Sequence[Tuple[str, str]] = (), bounds: Sequence[float] = ()):
+        """Append a series descriptor and make it visible to readers"""
+        count = self.published
+        if count >= self.descriptor_capacity:
+            raise RuntimeError(f"Shared metrics segment {self.name} is full (descriptors)")
+        
+        entry = {"k": kind, "i": index, "m": module_id}
+        if name:
+            entry["n"] = name
+        if labels:
+            entry["l"] = [list(pair) for pair in labels]
+        if bounds:
+            entry["b"] = list(bounds)
+        
+        data = json.dumps(entry, separators=(",", ":")).encode("utf-8")
+        if len(data) > DESCRIPTOR_SIZE:
+            raise ValueError(f"Metric descriptor too long for shared segment: {module_id}/{name}")
+        
+        start = self._descriptor_offset + count * DESCRIPTOR_SIZE
+        self._shm.buf[start:start + len(data)] = data
+        self._shm.buf[start + len(data):start + DESCRIPTOR_SIZE] = bytes(DESCRIPTOR_SIZE - len(data))
+        struct.pack_into("<I", self._shm.buf, 28, count + 1)
+    
+    def allocate_histogram(self, doubles: int) -> int:
+        """Reserve a run of doubles in the histogram region"""
+        offset = self._histogram_used
+        if offset + doubles > self.histogram_capacity:
+            raise RuntimeError(f"Shared metrics segment {self.name} is full (histograms)")
+        self._histogram_used += doubles
+        return offset
+    
+    def share_histogram(self, hist: Histogram, module_id: str) -> "SharedHistogram":
+        """Move a freshly created histogram into the segment"""
+        width = len(hist.bounds) + 3
+        offset = self.allocate_histogram(width)
+        shared = SharedHistogram(hist, self.histograms[offset:offset + width])
+        self.publish(MetricsRegistry.HISTOGRAM, offset, module_id, hist.name, hist.labels, hist.bounds)
+        return shared
+    
+    # Reader side
+    
+    def descriptors(self) -> List[Dict[str, Any]]:
+        """Decode all published descriptors (incrementally cached)"""
+        count = self.published
+        cache = self._descriptor_cache
+        while len(cache) < count:
+            start = self._descriptor_offset + len(cache) * DESCRIPTOR_SIZE
+            raw = bytes(self._shm.buf[start:start + DESCRIPTOR_SIZE]).rstrip(b"\0")
+            cache.append(json.loads(raw))
+        return cache
+    
+    def generation(self) -> int:
+        """Sum of all owner generations - moves on any write"""
+        return sum(self.generations)
+    
+    def close(self):
+        """Release views and unmap; unlink if this process created it"""
+        for view in (self.generations, self.counters, self.gauges, self.histograms):
+            view.release()
+        self._shm.close()
+        if self._created:
+            try:
+                self._shm.unlink()
+            except FileNotFoundError:
+                pass
+
+
+class SharedHistogram(Histogram):
+    """
+    Histogram whose bucket counts, sum and count live in shared memory.
+    
+    The view holds len(bounds) + 1 bucket counts followed by sum and count.
+    The quantile sketch (if any) stays process-local.
+    """
+    
+    __slots__ = ("_view", "_n")
+    
+    def __init__(self, hist: Histogram, view: memoryview):
+        self._view = view
+        self._n = len(hist.bounds) + 1
+        Histogram.__init__(self, hist.name, hist.labels, hist.bounds, hist.sketch)
+        self._counts = view[:self._n]
+        for i in range(self._n):
+            self._counts[i] = 0.0
+    
+    @property
+    def sum(self) -> float:
+        return self._view[self._n]
+    
+    @sum.setter
+    def sum(self, value: float):
+        self._view[self._n] = value
+    
+    @property
+    def count(self) -> int:
+        return int(self._view[self._n + 1])
+    
+    @count.setter
+    def count(self, value: int):
+        self._view[self._n + 1] = value
+    
+    def cumulative_counts(self) -> List[Tuple[float, int]]:
+        return [(bound, int(count)) for bound, count in Histogram.cumulative_counts(self)]
+
+
+def use_shared_registry(segment_name: str) -> MetricsRegistry:
+    """
+    Back this process's default registry with an existing segment.
+    
+    Call once in a worker process before any module is instantiated.
+    """
+    from . import metrics
+    
+    segment = SharedMetricsSegment(segment_name)
+    segment.claim()
+    metrics._default_registry = MetricsRegistry(segment=segment)
+    logger.info(f"Metrics backed by shared segment {segment_name}")
+    return metrics._default_registry
+
+
+class SharedMetricsAggregator:
+    """
+    Parent-side reader that sums metrics across worker segments.
+    
+    Values are merged into a private MetricsRegistry, so rendering reuses
+    MetricsCollector.export_prometheus() and its per-module cache. The
+    merge itself is skipped while no segment generation moved.
+    
+    When a segment is released its final counters and histograms are
+    folded into a baseline, so they stay monotonic across worker
+    restarts. Gauges are dropped: a restarted worker reports its own.
+    """
+    
+    def __init__(self, **capacities):
+        self._capacities = capacities
+        self._segments: Dict[str, SharedMetricsSegment] = {}
+        self._baseline: Dict[Tuple, Any] = {}
+        self._registry = MetricsRegistry()
+        self._collectors: Dict[str, MetricsCollector] = {}
+        self._last_generation: Optional[Tuple] = None
+    
+    def create_segment(self) -> str:
+        """Create a segment for a new worker and return its name"""
+        segment = SharedMetricsSegment(create=True, **self._capacities)
+        self._segments[segment.name] = segment
+        return segment.name
+    
+    def release_segment(self, name: str):
+        """Fold a retired worker's final counters and histograms into the baseline and unlink it"""
+        segment = self._segments.pop(name, None)
+        if not segment:
+            return
+        
+        for key, value in self._read_segment(segment).items():
+            if key[0] != MetricsRegistry.GAUGE:
+                self._baseline[key] = self._add(self._baseline.get(key), value)
+        segment.close()
+        self._last_generation = None
+    
+    def close(self):
+        """Unlink all segments"""
+        for name in list(self._segments):
+            self._segments.pop(name).close()
+    
+    def collectors(self) -> List[MetricsCollector]:
+        """Merged per-module collectors, refreshed if any worker wrote"""
+        generation = tuple((name, seg.generation()) for name, seg in self._segments.items())
+        if generation != self._last_generation:
+            self._merge()
+            self._last_generation = generation
+        return list(self._collectors.values())
+    
+    # Internal
+    
+    @staticmethod
+    def _add(current, value):
+        """Sum scalars, or (counts, sum, count) histogram tuples"""
+        if current is None:
+            return value
+        if isinstance(value, tuple):
+            bounds, counts, total, count = value
+            _, cur_counts, cur_total, cur_count = current
+            return (bounds, [a + b for a, b in zip(cur_counts, counts)], cur_total + total, cur_count + count)
+        return current + value
+    
+    def _read_segment(self, segment: SharedMetricsSegment) -> Dict[Tuple, Any]:
+        """Snapshot one segment as {(kind, module_id, name, labels): value}"""
+        values: Dict[Tuple, Any] = {}
+        for entry in segment.descriptors():
+            kind = entry["k"]
+            if kind == MetricsRegistry.OWNER:
+                continue
+            
+            labels = tuple(tuple(pair) for pair in entry.get("l", ()))
+            key = (kind, entry["m"], entry["n"], labels)
+            index = entry["i"]
+            
+            if kind == MetricsRegistry.COUNTER:
+                value = segment.counters[index]
+            elif kind == MetricsRegistry.GAUGE:
+                value = segment.gauges[index]
+            else:
+                bounds = tuple(entry["b"])
+                n = len(bounds) + 1
+                run = segment.histograms[index:index + n + 2].tolist()
+                value = (bounds, [int(c) for c in run[:n]], run[n], int(run[n + 1]))
+            
+            values[key] = self._add(values.get(key), value)
+        return values
+    
+    def _merge(self):
+        """Recompute merged series from the baseline plus all live segments"""
+        merged = dict(self._baseline)
+        for segment in self._segments.values():
+            for key, value in self._read_segment(segment).items():
+                merged[key] = self._add(merged.get(key), value)
+        
+        registry = self._registry
+        for (kind, module_id, name, labels), value in merged.items():
+            collector = self._collectors.get(module_id)
+            if collector is None:
+                collector = self._collectors[module_id] = MetricsCollector(module_id, registry)
+            
+            owner = registry.owner(module_id)
+            label_dict = dict(labels)
+            
+            if kind == MetricsRegistry.HISTOGRAM:
+                bounds, counts, total, count = value
+                index = registry.histogram_slot(
+                    owner, name, label_dict,
+                    lambda n, l, b=bounds: Histogram(n, l, buckets=b)
+                )
+                hist = registry.histograms[index]
+                if hist.count != count:
+                    hist._counts[:] = counts
+                    hist.sum = total
+                    hist.count = count
+                    registry.generations[owner] += 1
+            else:
+                column = registry.counters if kind == MetricsRegistry.COUNTER else registry.gauges
+                index = registry.slot(kind, owner, name, label_dict)
+                if column.values[index] != value:
+                    column.values[index] = value
+                    registry.generations[owner] += 1
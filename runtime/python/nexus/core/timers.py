@@ -0,0 +1,282 @@
+"""
+NEXUS v2 - Timer Service
+Addresses Review: Every periodic job was its own sleeping task
+
+A hierarchical timing wheel shared by all modules. Timers are kept in
+per-tick buckets across four levels (256 x 64 x 64 x 64 slots), so
+insert and cancel are O(1) and the event loop carries one timer handle
+for the whole service instead of one per job. Each tick fires all of
+its due timers in a single callback. A due timer that is more than one
+tick late fires on the next wake-up, together with any others that are
+due by then.
+
+Timers are grouped by owner (a module id) so a module's timers can be
+cancelled together when it stops or unloads.
+"""
+
+import asyncio
+import logging
+import math
+from typing import Callable, Dict, List, Optional, Set
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RESOLUTION = 0.01
+
+# Level 0 has 2**8 slots, every further level 2**6
+_ROOT_BITS = 8
+_LEVEL_BITS = 6
+_LEVELS = 4
+_ROOT_SIZE = 1 << _ROOT_BITS
+_LEVEL_SIZE = 1 << _LEVEL_BITS
+_MAX_DELTA = 1 << (_ROOT_BITS + _LEVEL_BITS * (_LEVELS - 1))
+
+
+class Timer:
+    """Handle for a scheduled callback"""
+    
+    __slots__ = ("callback", "args", "interval", "expires", "owner", "_bucket", "_service", "cancelled")
+    
+    def __init__(self, service: "TimerService", callback: Callable, args: tuple,
+                 expires: int, interval: int, owner: Optional[str]):
+        self.callback = callback
+        self.args = args
+        self.expires = expires
+        self.interval = interval
+        self.owner = owner
+        self.cancelled = False
+        self._bucket: Optional[Set["Timer"]] = None
+        self._service = service
+    
+    def cancel(self):
+        """Cancel the timer (O(1)); safe to call more than once"""
+        if not self.cancelled:
+            self.cancelled = True
+            self._service._remove(self)
+    
+    @property
+    def periodic(self) -> bool:
+        return self.interval > 0
+
+
+class TimerService:
+    """
+    Hierarchical timing wheel driven by one loop.call_at handle.
+    
+    The wheel only wakes the loop while timers are pending. Callbacks
+    run on the event loop and must not block; coroutine functions are
+    started as tasks.
+    """
+    
+    def __init__(self, resolution: float = DEFAULT_RESOLUTION):
+        self.resolution = resolution
+        
+        self._wheel: List[List[Set[Timer]]] = [
+            [set() for _ in range(_ROOT_SIZE if level == 0 else _LEVEL_SIZE)]
+            for level in range(_LEVELS)
+        ]
+        self._owners: Dict[Optional[str], Set[Timer]] = {}
+        self._count = 0
+        
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._origin = 0.0
+        self._tick = 0
+        self._handle: Optional[asyncio.TimerHandle] = None
+        self.fired = 0
+    
+    def call_later(self, delay: float, callback: Callable, *args, owner: Optional[str] = None) -> Timer:
+        """Run callback(*args) once after delay seconds"""
+        return self._schedule(delay, 0.0, callback, args, owner)
+    
+    def call_every(
+        self,
+        interval: float,
+        callback: Callable,
+        *args,
+        owner: Optional[str] = None,
+        first: Optional[float] = None
+    ) -> Timer:
+        """
+        Run callback(*args) every interval seconds (first run after
+        `first`, default one interval). Runs stay on the original
+        schedule; if the wheel falls a whole interval behind, the missed
+        runs are skipped rather than fired back to back.
+        """
+        if interval < self.resolution:
+            raise ValueError(f"interval must be >= the timer resolution ({self.resolution}s)")
+        return self._schedule(interval if first is None else first, interval, callback, args, owner)
+    
+    def cancel_owner(self, owner: str) -> int:
+        """Cancel every timer registered by owner; returns how many"""
+        timers = self._owners.pop(owner, None)
+        if not timers:
+            return 0
+        for timer in timers:
+            timer.cancelled = True
+            self._unlink(timer)
+        return len(timers)
+    
+    def close(self):
+        """Cancel all timers and release the loop"""
+        for owner in list(self._owners):
+            self.cancel_owner(owner)
+        if self._handle:
+            self._handle.cancel()
+            self._handle = None
+        self._loop = None
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    def owned_by(self, owner: str) -> int:
+        return len(self._owners.get(owner, ()))
+    
+    # Internal
+    
+    def _schedule(self, delay: float, interval: float, callback: Callable, args: tuple,
+                  owner: Optional[str]) -> Timer:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._bind(loop)
+        
+        now_tick = self._now_tick()
+        if now_tick > self._tick and not self._count:
+            # Idle wheel: jump instead of replaying empty ticks
+            self._tick = now_tick
+        
+        ticks = max(1, math.ceil(delay / self.resolution))
+        timer = Timer(
+            self, callback, args,
+            expires=max(now_tick, self._tick) + ticks,
+            interval=max(1, round(interval / self.resolution)) if interval > 0 else 0,
+            owner=owner
+        )
+        self._owners.setdefault(owner, set()).add(timer)
+        self._insert(timer)
+        self._count += 1
+        self._arm()
+        return timer
+    
+    def _bind(self, loop: asyncio.AbstractEventLoop):
+        """Attach to a (new) event loop; timers from an old loop are dropped"""
+        if self._loop is not None:
+            self.close()
+        self._loop = loop
+        self._origin = loop.time()
+        self._tick = 0
+    
+    def _now_tick(self) -> int:
+        return int((self._loop.time() - self._origin) / self.resolution)
+    
+    def _insert(self, timer: Timer):
+        """Place a timer in the bucket for its expiry tick"""
+        expires = timer.expires
+        delta = expires - self._tick
+        
+        if delta < _ROOT_SIZE:
+            bucket = self._wheel[0][expires & (_ROOT_SIZE - 1)]
+        else:
+            if delta >= _MAX_DELTA:
+                # Beyond the top level: park at the far edge and re-file on cascade
+                expires = self._tick + _MAX_DELTA - 1
+            level = 1
+            while level < _LEVELS - 1 and delta >= 1 << (_ROOT_BITS + _LEVEL_BITS * level):
+                level += 1
+            shift = _ROOT_BITS + _LEVEL_BITS * (level - 1)
+            bucket = self._wheel[level][(expires >> shift) & (_LEVEL_SIZE - 1)]
+        
+        bucket.add(timer)
+        timer._bucket = bucket
+    
+    def _unlink(self, timer: Timer):
+        if timer._bucket is not None:
+            timer._bucket.discard(timer)
+            timer._bucket = None
+            self._count -= 1
+    
+    def _remove(self, timer: Timer):
+        self._unlink(timer)
+        owned = self._owners.get(timer.owner)
+        if owned is not None:
+            owned.discard(timer)
+            if not owned:
+                del self._owners[timer.owner]
+    
+    def _cascade(self, level: int):
+        """Re-file the current slot of a higher level into the levels below"""
+        shift = _ROOT_BITS + _LEVEL_BITS * (level - 1)
+        index = (self._tick >> shift) & (_LEVEL_SIZE - 1)
+        bucket = self._wheel[level][index]
+        if not bucket:
+            return index
+        
+        timers = list(bucket)
+        bucket.clear()
+        for timer in timers:
+            timer._bucket = None
+            self._insert(timer)
+        return index
+    
+    def _arm(self):
+        """Schedule the next wake-up (one handle for the whole wheel)"""
+        if self._handle is not None or not self._count or self._loop is None:
+            return
+        when = self._origin + (self._tick + 1) * self.resolution
+        self._handle = self._loop.call_at(when, self._run)
+    
+    def _run(self):
+        """Advance the wheel to the current tick, firing due buckets"""
+        self._handle = None
+        # We are only woken at or after the next tick boundary
+        target = max(self._now_tick(), self._tick + 1)
+        
+        while self._tick < target and self._count:
+            self._tick += 1
+            index = self._tick & (_ROOT_SIZE - 1)
+            
+            if index == 0:
+                level = 1
+                while level < _LEVELS and self._cascade(level) == 0:
+                    level += 1
+            
+            bucket = self._wheel[0][index]
+            if bucket:
+                # Detach the whole bucket first, so a callback that cancels
+                # a timer due in the same tick doesn't unlink it twice
+                due = list(bucket)
+                bucket.clear()
+                self._count -= len(due)
+                for timer in due:
+                    timer._bucket = None
+                for timer in due:
+                    if not timer.cancelled:
+                        self._fire(timer)
+        
+        if not self._count:
+            self._tick = max(self._tick, target)
+        self._arm()
+    
+    def _fire(self, timer: Timer):
+        if timer.periodic:
+            # Stay on the grid; skip whole intervals we fell behind by
+            timer.expires += timer.interval
+            if timer.expires <= self._tick:
+                missed = (self._tick - timer.expires) // timer.interval + 1
+                timer.expires += missed * timer.interval
+            self._insert(timer)
+            self._count += 1
+        else:
+            owned = self._owners.get(timer.owner)
+            if owned is not None:
+                owned.discard(timer)
+                if not owned:
+                    del self._owners[timer.owner]
+        
+        self.fired += 1
+        try:
+            result = timer.callback(*timer.args)
+            if asyncio.iscoroutine(result):
+                self._loop.create_task(result)
+        except Exception as e:
+            logger.error(f"Timer callback {timer.callback!r} failed: {e}", exc_info=True)
@@ -0,0 +1,303 @@
+"""
+NEXUS v2 - Tracing Spans
+Addresses Review: No way to correlate a slow lifecycle phase with its cause
+
+Spans carry trace/span IDs through a contextvar, so an operation tracked
+inside Module.start() becomes a child of the lifecycle span that called
+it - across awaits and into tasks created from that context.
+
+Finished spans are handed to a non-blocking exporter. The bundled
+JsonLinesSpanExporter batches them on a writer thread and appends one
+OTLP/JSON ExportTraceServiceRequest per line (the layout used by the
+OpenTelemetry collector's file exporter).
+"""
+
+import collections
+import contextvars
+import json
+import logging
+import random
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+logger = logging.getLogger(__name__)
+
+_current_span: contextvars.ContextVar = contextvars.ContextVar("nexus_span", default=None)
+
+# OTLP status codes
+STATUS_UNSET = 0
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+
+def current_span() -> Optional["Span"]:
+    """Span active in the current context, if any"""
+    return _current_span.get()
+
+
+class Span:
+    """
+    One timed operation. Use as a context manager to make it the
+    current span; it ends (and is exported) on exit.
+    """
+    
+    __slots__ = (
+        "tracer", "name", "trace_id", "span_id", "parent_id",
+        "attributes", "start_ns", "end_ns", "status", "status_message", "_token"
+    )
+    
+    def __init__(
+        self,
+        tracer: "Tracer",
+        name: str,
+        parent: Optional["Span"],
+        attributes: Optional[Dict[str, Any]] = None
+    ):
+        self.tracer = tracer
+        self.name = name
+        self.trace_id = parent.trace_id if parent else f"{random.getrandbits(128):032x}"
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_id = parent.span_id if parent else None
+        self.attributes = attributes or {}
+        self.start_ns = time.time_ns()
+        self.end_ns = 0
+        self.status = STATUS_UNSET
+        self.status_message = ""
+        self._token = None
+    
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+    
+    def end(self, error: Optional[BaseException] = None):
+        """Finish the span and hand it to the exporter (idempotent)"""
+        if self.end_ns:
+            return
+        
+        self.end_ns = time.time_ns()
+        if error is not None:
+            self.status = STATUS_ERROR
+            self.status_message = str(error)
+            self.attributes["exception.type"] = type(error).__name__
+        
+        self.tracer._finish(self)
+    
+    def __enter__(self) -> "Span":
+        self._token = _current_span.set(self)
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        _current_span.reset(self._token)
+        self._token = None
+        self.end(exc if exc_type is not None and issubclass(exc_type, Exception) else None)
+        return False
+    
+    def to_otlp(self) -> Dict[str, Any]:
+        """OTLP/JSON representation of the span"""
+        data = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": 1,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [_otlp_attribute(k, v) for k, v in self.attributes.items()],
+            "status": {"code": self.status},
+        }
+        if self.parent_id:
+            data["parentSpanId"] = self.parent_id
+        if self.status_message:
+            data["status"]["message"] = self.status_message
+        return data
+
+
+class _NoopSpan:
+    """Stand-in returned while tracing is disabled"""
+    
+    __slots__ = ()
+    
+    def set_attribute(self, key: str, value: Any):
+        pass
+    
+    def end(self, error: Optional[BaseException] = None):
+        pass
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+def _otlp_attribute(key: str, value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+
+class Tracer:
+    """
+    Span factory. Disabled (returning no-op spans) until an exporter is
+    set, so untraced daemons pay one attribute check per operation.
+    """
+    
+    def __init__(self):
+        self.exporter: Optional["JsonLinesSpanExporter"] = None
+    
+    @property
+    def enabled(self) -> bool:
+        return self.exporter is not None
+    
+    def set_exporter(self, exporter: Optional["JsonLinesSpanExporter"]):
+        if self.exporter and self.exporter is not exporter:
+            self.exporter.shutdown()
+        self.exporter = exporter
+    
+    def span(self, name: str, attributes: Optional[Dict[str, Any]] = None):
+        """Create a child of the current span (or a new trace root)"""
+        if self.exporter is None:
+            return _NOOP_SPAN
+        return Span(self, name, _current_span.get(), attributes)
+    
+    def shutdown(self):
+        """Flush and detach the exporter"""
+        self.set_exporter(None)
+    
+    def _finish(self, span: Span):
+        exporter = self.exporter
+        if exporter is not None:
+            exporter.export(span)
+
+
+class detached:
+    """
+    Clear the current span for the duration of the block.
+    
+    Used when spawning long-lived tasks, which would otherwise stay
+    children of whatever span created them for their whole lifetime.
+    """
+    
+    __slots__ = ("_token",)
+    
+    def __enter__(self):
+        self._token = _current_span.set(None)
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        _current_span.reset(self._token)
+        return False
+
+
+class JsonLinesSpanExporter:
+    """
+    Batched, non-blocking span exporter writing OTLP/JSON lines.
+    
+    export() only appends to a bounded deque; a writer thread drains it
+    every flush_interval (or as soon as batch_size spans are waiting).
+    When the queue is full new spans are dropped and counted.
+    """
+    
+    def __init__(
+        self,
+        path: Path,
+        service_name: str = "nexus",
+        batch_size: int = 512,
+        flush_interval: float = 1.0,
+        max_queue: int = 10000
+    ):
+        self.path = Path(path).expanduser()
+        self.service_name = service_name
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        
+        self.dropped = 0
+        self.exported = 0
+        
+        self._queue: collections.deque = collections.deque()
+        self._wakeup = threading.Event()
+        self._stopping = False
+        
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._thread = threading.Thread(target=self._run, name="nexus-span-exporter", daemon=True)
+        self._thread.start()
+    
+    def export(self, span: Span):
+        if len(self._queue) >= self.max_queue:
+            self.dropped += 1
+            return
+        
+        self._queue.append(span)
+        if len(self._queue) >= self.batch_size:
+            self._wakeup.set()
+    
+    def shutdown(self, timeout: float = 5.0):
+        """Write out queued spans and stop the writer thread"""
+        if self._stopping:
+            return
+        
+        self._stopping = True
+        self._wakeup.set()
+        self._thread.join(timeout)
+        
+        if self.dropped:
+            logger.warning(f"Span exporter dropped {self.dropped} spans (queue full)")
+    
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            
+            try:
+                self._flush()
+            except Exception as e:
+                logger.error(f"Span export failed: {e}", exc_info=True)
+            
+            if self._stopping:
+                return
+    
+    def _flush(self):
+        queue = self._queue
+        if not queue:
+            return
+        
+        lines: List[str] = []
+        while queue:
+            batch = []
+            while queue and len(batch) < self.batch_size:
+                batch.append(queue.popleft().to_otlp())
+            lines.append(json.dumps(self._request(batch), separators=(",", ":")))
+            self.exported += len(batch)
+        
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+    
+    def _request(self, spans: List[Dict[str, Any]]) -> Dict[str, Any]:
+        return {
+            "resourceSpans": [{
+                "resource": {
+                    "attributes": [_otlp_attribute("service.name", self.service_name)]
+                },
+                "scopeSpans": [{
+                    "scope": {"name": "nexus"},
+                    "spans": spans
+                }]
+            }]
+        }
+
+
+_default_tracer = Tracer()
+
+
+def get_tracer() -> Tracer:
+    """Process-wide tracer"""
+    return _default_tracer
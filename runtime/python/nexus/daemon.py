@@ -6,16 +6,60 @@ Enterprise-Grade Orchestrator with Security & Observability
 import asyncio
 import signal
 import logging
+import time
 from typing import Dict, List, Optional, Any
 from pathlib import Path
 
+from .core.accounting import ResourceAccountant, set_cpu_accounting
+from .core.batch import run_batch
 from .core.config import ConfigurationManager
+from .core.control import ControlServer
+from .core.exporter import PrometheusExporter
+from .core.feed import FeedSubscription, StatusFeed
+from .core.health import HealthChecker, HealthListener
+from .core.liveness import LivenessStamp
 from .core.loader import ModuleLoader
-from .core.module import ModuleState, SecurityContext
+from .core.module import ModuleState, SecurityContext, MetricsCollector
+from .core.monitor import LoopMonitor
+from .core.profiler import SamplingProfiler
+from .core.shared_metrics import SharedMetricsAggregator
+from .core.isolation import ProcessModuleProxy
+from .core.tracing import JsonLinesSpanExporter, get_tracer
 
 
 logger = logging.getLogger(__name__)
 
+# Config namespace for daemon-level settings (nexus.daemon.* in YAML,
+# NEXUS_NEXUS_DAEMON_* in the environment)
+DAEMON_CONFIG_ID = "nexus/daemon"
+
+DAEMON_DEFAULTS = {
+    "metrics_enabled": False,
+    "metrics_host": "127.0.0.1",
+    "metrics_port": 9090,
+    "cpu_accounting": True,
+    "memory_accounting": False,
+    "accounting_interval": 10.0,
+    "memory_frames": 4,
+    "loop_monitor_enabled": True,
+    "loop_lag_interval": 0.1,
+    "slow_callback_threshold": 0.25,
+    "slow_callback_log_interval": 60.0,
+    "profile_dir": "~/.nexus/profiles",
+    "profile_rate": 100.0,
+    "tracing_enabled": False,
+    "tracing_file": "~/.nexus/traces/spans.jsonl",
+    "health_timeout": 5.0,
+    "health_max_age": 2.0,
+    "health_refresh_interval": 1.0,
+    "control_enabled": True,
+    "control_socket": "",  # empty: $NEXUS_CONTROL_SOCKET or ~/.nexus/nexus.sock
+    "liveness_file": "",  # empty: $NEXUS_LIVENESS_FILE or ~/.nexus/nexus.live
+    "liveness_interval": 1.0,
+    "feed_metric_interval": 1.0,
+    "feed_metric_threshold": 0.05,
+}
+
 
 class UniversalDaemon:
     """
@@ -50,9 +94,57 @@ class UniversalDaemon:
             except Exception as e:
                 logger.warning(f"No user config: {e}")
         
+        self.config.register_module_defaults(DAEMON_CONFIG_ID, DAEMON_DEFAULTS)
+        
         self.loader = ModuleLoader(self.config)
         self.security_context = security_context
         
+        # Observability endpoints
+        self.metrics = MetricsCollector("daemon")
+        self.metrics_exporter: Optional[PrometheusExporter] = None
+        self.shared_metrics = SharedMetricsAggregator()
+        # Collectors skipped for duplicate metric families (logged once)
+        self._metric_conflicts: set = set()
+        self.loader.lifecycle.worker_metrics = self.shared_metrics
+        self.resource_accountant: Optional[ResourceAccountant] = None
+        self.loop_monitor: Optional[LoopMonitor] = None
+        self.profiler = SamplingProfiler(self.loader.registry.instances)
+        self.health = HealthChecker(
+            self.loader.registry.instances,
+            timeout=self.config.get(DAEMON_CONFIG_ID, "health_timeout", expected_type=float),
+            max_age=self.config.get(DAEMON_CONFIG_ID, "health_max_age", expected_type=float),
+            refresh_interval=self.config.get(
+                DAEMON_CONFIG_ID, "health_refresh_interval", expected_type=float
+            ),
+            table=self.loader.health_table
+        )
+        self.feed = StatusFeed(
+            self.loader.health_table,
+            self._metric_collectors,
+            metric_interval=self.config.get(DAEMON_CONFIG_ID, "feed_metric_interval", expected_type=float),
+            metric_threshold=self.config.get(DAEMON_CONFIG_ID, "feed_metric_threshold", expected_type=float)
+        )
+        
+        # AEON control socket (ops are callable in-process via control.dispatch)
+        self.control = ControlServer(
+            self.config.get(DAEMON_CONFIG_ID, "control_socket", expected_type=str) or None
+        )
+        self._register_control_ops()
+        
+        # Liveness fast path: mmap'd stamp refreshed by the event loop
+        self.liveness = LivenessStamp(
+            self.config.get(DAEMON_CONFIG_ID, "liveness_file", expected_type=str) or None,
+            interval=self.config.get(DAEMON_CONFIG_ID, "liveness_interval", expected_type=float)
+        )
+        
+        set_cpu_accounting(self.config.get(DAEMON_CONFIG_ID, "cpu_accounting", expected_type=bool))
+        
+        self.tracer = get_tracer()
+        if self.config.get(DAEMON_CONFIG_ID, "tracing_enabled", expected_type=bool):
+            self.tracer.set_exporter(JsonLinesSpanExporter(
+                self.config.get(DAEMON_CONFIG_ID, "tracing_file", expected_type=str)
+            ))
+        
         # Daemon state
         self._running = False
         self._shutdown_event = asyncio.Event()
@@ -100,10 +192,11 @@ class UniversalDaemon:
         # Load modules
         logger.info("Loading modules in dependency order...")
         try:
-            results = await self.loader.load_modules(
-                parallel=parallel,
-                security_context=self.security_context
-            )
+            with self.tracer.span("daemon.load_modules"):
+                results = await self.loader.load_modules(
+                    parallel=parallel,
+                    security_context=self.security_context
+                )
             
             # Check results
             failed = [mid for mid, success in results.items() if not success]
@@ -143,7 +236,12 @@ class UniversalDaemon:
         """
         logger.info("Starting modules...")
         try:
-            results = await self.loader.start_modules()
+            # Watch the loop before module start() runs - a blocking start
+            # is the most common stall
+            await self._start_loop_monitor()
+            
+            with self.tracer.span("daemon.start_modules"):
+                results = await self.loader.start_modules()
             
             failed = [mid for mid, success in results.items() if not success]
             
@@ -154,6 +252,13 @@ class UniversalDaemon:
             
             logger.info(f"{len(results) - len(failed)}/{len(results)} modules running")
             
+            await self._start_metrics_exporter()
+            await self._start_resource_accountant()
+            await self.health.start()
+            await self.feed.start()
+            await self._start_control_server()
+            await self._start_liveness_stamp()
+            
             self._running = True
             return len(failed) == 0
             
@@ -233,6 +338,19 @@ class UniversalDaemon:
         except Exception as e:
             logger.error(f"Shutdown error: {e}", exc_info=True)
         finally:
+            await self.liveness.stop()
+            await self.feed.stop()
+            await self.control.stop()
+            await self.health.stop()
+            await self._stop_resource_accountant()
+            await self._stop_metrics_exporter()
+            await self._stop_loop_monitor()
+            self.loader.timers.close()
+            self.loader.bus.close()
+            self.loader.rpc.close()
+            self.profiler.stop(timeout=0)
+            self.tracer.shutdown()
+            self.shared_metrics.close()
             self._running = False
             self._shutdown_event.set()
     
@@ -266,19 +384,23 @@ class UniversalDaemon:
         
         try:
             if strategy == "graceful":
-                # Stop -> Unload -> Load -> Start
-                await self.loader.lifecycle.stop_module(module_id)
-                await self.loader.lifecycle.unload_module(module_id)
-                
-                context = {
-                    "config": self.config,
-                    "registry": self.loader.registry,
-                }
-                
-                await self.loader.lifecycle.load_single_module(
-                    module_id, context, self.security_context
-                )
-                await self.loader.lifecycle.start_module(module_id)
+                # Stop -> Unload -> Load -> Start, as one trace
+                with self.tracer.span("daemon.reload", {
+                    "nexus.module.id": module_id,
+                    "nexus.reload.strategy": strategy
+                }):
+                    await self.loader.lifecycle.stop_module(module_id)
+                    await self.loader.lifecycle.unload_module(module_id)
+                    
+                    context = {
+                        "config": self.config,
+                        "registry": self.loader.registry,
+                    }
+                    
+                    await self.loader.lifecycle.load_single_module(
+                        module_id, context, self.security_context
+                    )
+                    await self.loader.lifecycle.start_module(module_id)
             
             else:
                 logger.error(f"Unknown reload strategy: {strategy}")
@@ -291,42 +413,20 @@ class UniversalDaemon:
             logger.error(f"Failed to reload {module_id}: {e}", exc_info=True)
             return False
     
-    async def get_status(self) -> Dict[str, Any]:
+    async def get_status(self, max_age: Optional[float] = None) -> Dict[str, Any]:
         """
         Get daemon status with health checks.
+        
+        Args:
+            max_age: Accept cached health results up to this many seconds
+                old (default: health_max_age from config, 0 forces fresh
+                checks). Stale modules are checked concurrently under one
+                health_timeout deadline.
         """
         loader_status = self.loader.get_status()
         
         # Collect health from all modules
-        health_checks = {}
-        for module_id in list(self.loader.registry._instances.keys()):
-            instance = self.loader.registry.get_instance(module_id)
-            if not instance:
-                continue
-                
-            try:
-                health = await asyncio.wait_for(
-                    instance.health(),
-                    timeout=5.0
-                )
-                health_checks[module_id] = health
-            except asyncio.TimeoutError:
-                health_checks[module_id] = {
-                    "status": "unhealthy",
-                    "error": "health check timeout"
-                }
-            except Exception as e:
-                health_checks[module_id] = {
-                    "status": "unhealthy",
-                    "error": str(e)
-                }
-        
-        # Aggregate health statistics
-        total_modules = len(health_checks)
-        healthy_count = sum(
-            1 for h in health_checks.values()
-            if h.get("status") == "healthy"
-        )
+        health_checks = await self.health.check_all(max_age=max_age)
         
         return {
             "running": self._running,
@@ -337,30 +437,388 @@ class UniversalDaemon:
             "modules": loader_status,
             "health": {
                 "checks": health_checks,
-                "statistics": {
-                    "total": total_modules,
-                    "healthy": healthy_count,
-                    "degraded": sum(
-                        1 for h in health_checks.values()
-                        if h.get("status") == "degraded"
-                    ),
-                    "unhealthy": total_modules - healthy_count
-                }
+                "statistics": self.loader.health_table.statistics()
+            }
+        }
+    
+    async def get_module_status(self, module_id: str, max_age: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Status of a single module.
+        
+        Raises:
+            ValueError: Unknown module
+        """
+        instance = self.loader.get_module(module_id)
+        if not instance:
+            raise ValueError(f"Module {module_id} not found")
+        
+        if max_age is None:
+            max_age = self.health.max_age
+        health = self.health.cached(module_id)
+        if health is None or health["age_seconds"] > max_age:
+            health = (await self.health.check_all(max_age=max_age)).get(module_id)
+        
+        return {
+            "module_id": module_id,
+            "state": instance.state.value,
+            "uptime_seconds": instance.uptime_seconds,
+            "resource_usage": dict(instance._resource_usage),
+            "health": health
+        }
+    
+    def check_liveness(self) -> Dict[str, Any]:
+        """Liveness probe - answering at all means the loop is alive"""
+        return {
+            "live": True,
+            "timestamp": time.time(),
+            "daemon_running": self._running
+        }
+    
+    def check_readiness(self) -> Dict[str, Any]:
+        """Readiness probe from the push health table - O(1)"""
+        stats = self.loader.health_table.statistics()
+        total = stats["total"]
+        
+        return {
+            "ready": self.is_ready(),
+            "timestamp": time.time(),
+            "details": {
+                "total_modules": total,
+                "healthy_modules": stats["healthy"],
+                "unhealthy_modules": stats["unhealthy"],
+                "health_ratio": round(stats["healthy"] / total, 2) if total else 0.0
             }
         }
     
+    def check_critical_modules(self) -> Dict[str, Any]:
+        """Readiness of required modules only"""
+        table = self.loader.health_table
+        critical = {}
+        for manifest in self.loader.registry.get_all_manifests():
+            if manifest.required:
+                entry = table.get(manifest.id)
+                critical[manifest.id] = bool(entry and entry["ready"])
+        
+        return {
+            "ready": self._running and all(critical.values()),
+            "timestamp": time.time(),
+            "modules": critical
+        }
+    
+    def get_health_summary(self) -> Dict[str, Any]:
+        """
+        Aggregate health from the push table - O(1), calls no module.
+        
+        Returns:
+            {"total", "healthy", "degraded", "unhealthy", "ready",
+             "by_state": {...}, "all_ready": bool}
+        """
+        table = self.loader.health_table
+        summary = table.statistics()
+        summary["all_ready"] = self._running and table.is_ready()
+        return summary
+    
+    def is_ready(self) -> bool:
+        """Readiness probe - O(1), calls no module"""
+        return self._running and self.loader.health_table.is_ready()
+    
+    def subscribe_health(self, listener: HealthListener):
+        """
+        Notify listener(module_id, old, new) on every health change.
+        
+        Returns:
+            Callable that removes the subscription
+        """
+        return self.loader.health_table.subscribe(listener)
+    
+    def subscribe_status(self, metrics: bool = True, interval: float = 0.0) -> FeedSubscription:
+        """
+        Stream status changes: a snapshot, then coalesced delta batches.
+        
+        Iterate the returned subscription with `async for`; call close()
+        when done.
+        """
+        return self.feed.subscribe(metrics=metrics, interval=interval)
+    
+    def start_profiling(
+        self,
+        duration: float = 30.0,
+        rate: Optional[float] = None,
+        output: Optional[str] = None
+    ) -> Path:
+        """
+        Start an on-demand sampling profile of all daemon threads.
+        
+        Args:
+            duration: Seconds to sample for
+            rate: Samples per second (default: profile_rate from config)
+            output: Collapsed-stack output file (default: a timestamped
+                file under profile_dir)
+        
+        Returns:
+            Path the collapsed stacks will be written to
+        """
+        if rate is None:
+            rate = self.config.get(DAEMON_CONFIG_ID, "profile_rate", expected_type=float)
+        
+        if output is None:
+            profile_dir = self.config.get(DAEMON_CONFIG_ID, "profile_dir", expected_type=str)
+            output = Path(profile_dir) / f"nexus-{time.strftime('%Y%m%d-%H%M%S')}.folded"
+        
+        self.profiler.start(duration=duration, rate=rate, output=Path(output))
+        return self.profiler.output
+    
+    async def stop_profiling(self) -> Dict[str, Any]:
+        """
+        Stop the running profile early and return its summary.
+        """
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.profiler.stop)
+        
+        return {
+            "output": str(self.profiler.output) if self.profiler.output else None,
+            "samples": self.profiler.samples,
+            "modules": self.profiler.by_module()
+        }
+    
     async def export_metrics(self) -> str:
         """
         Export all module metrics in Prometheus format.
+        
+        Each module's block is cached by its collector and only
+        re-rendered when one of its metrics changed.
         """
         lines = []
+        families = set()
         
-        for module_id in list(self.loader.registry._instances.keys()):
-            instance = self.loader.registry.get_instance(module_id)
-            if instance:
-                lines.append(instance.metrics.export_prometheus())
+        for collector in self._metric_collectors():
+            block = collector.export_prometheus()
+            if not block:
+                continue
+            # A family emitted twice makes Prometheus reject the whole scrape
+            names = {line.split(" ", 3)[2] for line in block.split("\n") if line.startswith("# TYPE ")}
+            duplicates = names & families
+            if duplicates:
+                if collector.module_id not in self._metric_conflicts:
+                    self._metric_conflicts.add(collector.module_id)
+                    logger.error(
+                        f"Skipping metrics of {collector.module_id}: already exported "
+                        f"{', '.join(sorted(duplicates))}"
+                    )
+                continue
+            families |= names
+            lines.append(block)
         
         return "\n".join(lines)
+    
+    def _metric_collectors(self) -> List[MetricsCollector]:
+        """Daemon and in-process module collectors plus merged worker-process metrics"""
+        collectors = [self.metrics, self.loader.bus.metrics, self.loader.rpc.metrics]
+        # Worker-process modules report through shared_metrics instead
+        collectors.extend(
+            instance.metrics for instance in self.loader.registry.instances()
+            if not isinstance(instance, ProcessModuleProxy)
+        )
+        collectors.extend(self.shared_metrics.collectors())
+        return collectors
+    
+    async def _start_metrics_exporter(self):
+        """Start the /metrics HTTP endpoint if enabled in config"""
+        if self.metrics_exporter or not self.config.get(
+            DAEMON_CONFIG_ID, "metrics_enabled", expected_type=bool
+        ):
+            return
+        
+        exporter = PrometheusExporter(
+            self._metric_collectors,
+            host=self.config.get(DAEMON_CONFIG_ID, "metrics_host", expected_type=str),
+            port=self.config.get(DAEMON_CONFIG_ID, "metrics_port", expected_type=int)
+        )
+        
+        try:
+            await exporter.start()
+            self.metrics_exporter = exporter
+        except OSError as e:
+            logger.error(f"Failed to start metrics endpoint: {e}")
+    
+    async def _start_resource_accountant(self):
+        """Start per-module CPU/memory sampling"""
+        if self.resource_accountant:
+            return
+        
+        self.resource_accountant = ResourceAccountant(
+            self.loader.registry.instances,
+            interval=self.config.get(DAEMON_CONFIG_ID, "accounting_interval", expected_type=float),
+            memory=self.config.get(DAEMON_CONFIG_ID, "memory_accounting", expected_type=bool),
+            memory_frames=self.config.get(DAEMON_CONFIG_ID, "memory_frames", expected_type=int)
+        )
+        await self.resource_accountant.start()
+    
+    async def _stop_resource_accountant(self):
+        """Stop per-module resource sampling"""
+        if self.resource_accountant:
+            await self.resource_accountant.stop()
+            self.resource_accountant = None
+    
+    async def _start_control_server(self):
+        """Start the AEON control socket if enabled in config"""
+        if self.control.is_running or not self.config.get(
+            DAEMON_CONFIG_ID, "control_enabled", expected_type=bool
+        ):
+            return
+        
+        try:
+            await self.control.start()
+        except (OSError, RuntimeError) as e:
+            logger.error(f"Failed to start control socket: {e}")
+    
+    async def _start_liveness_stamp(self):
+        """Start refreshing the liveness stamp file"""
+        try:
+            await self.liveness.start()
+        except OSError as e:
+            logger.error(f"Failed to create liveness stamp: {e}")
+    
+    def _register_control_ops(self):
+        """Expose daemon operations on the control socket"""
+        control = self.control
+        
+        async def ping(params):
+            return {"pong": True, "timestamp": time.time()}
+        
+        async def get_status(params):
+            if params.get("module_id"):
+                return await self.get_module_status(params["module_id"], params.get("max_age"))
+            return await self.get_status(max_age=params.get("max_age"))
+        
+        async def check_liveness(params):
+            return self.check_liveness()
+        
+        async def check_readiness(params):
+            return self.check_readiness()
+        
+        async def check_critical_modules(params):
+            return self.check_critical_modules()
+        
+        async def get_metrics(params):
+            module_id = params.get("module_id")
+            if module_id:
+                instance = self.loader.get_module(module_id)
+                if not instance:
+                    raise ValueError(f"Module {module_id} not found")
+                return instance.metrics.export_prometheus()
+            return await self.export_metrics()
+        
+        async def reload_module(params):
+            self._require_permission("module.reload")
+            module_id = self._param(params, "module_id")
+            strategy = params.get("strategy", "graceful")
+            if not await self.reload_module(module_id, strategy):
+                raise RuntimeError(f"Reload of {module_id} failed")
+            return {"module_id": module_id, "reloaded": True, "strategy": strategy}
+        
+        async def start_module(params):
+            self._require_permission("module.start")
+            module_id = self._param(params, "module_id")
+            await self.loader.lifecycle.start_module(module_id)
+            return {"module_id": module_id, "state": self.loader.get_module(module_id).state.value}
+        
+        async def stop_module(params):
+            self._require_permission("module.stop")
+            module_id = self._param(params, "module_id")
+            await self.loader.lifecycle.stop_module(module_id, timeout=params.get("timeout", 30.0))
+            return {"module_id": module_id, "state": self.loader.get_module(module_id).state.value}
+        
+        async def configure(params):
+            self._require_permission("module.configure")
+            module_id = self._param(params, "module_id")
+            key = self._param(params, "key")
+            self.config.set_runtime_override(module_id, key, params.get("value"))
+            return {"module_id": module_id, "key": key, "value": params.get("value")}
+        
+        async def batch(params):
+            commands = self._param(params, "commands")
+            if not isinstance(commands, list):
+                raise ValueError("commands must be a list")
+            for command in commands:
+                if not isinstance(command, dict) or not command.get("op"):
+                    raise ValueError(f"Invalid batch command: {command!r}")
+                if command["op"] == "batch":
+                    raise ValueError("Batches cannot be nested")
+            
+            results = await run_batch(commands, control.dispatch, self._module_dependencies)
+            succeeded = sum(1 for result in results if result["success"])
+            return {"results": results, "succeeded": succeeded, "failed": len(results) - succeeded}
+        
+        async def subscribe(params):
+            subscription = self.feed.subscribe(
+                metrics=params.get("metrics", True),
+                interval=params.get("interval", 0.0)
+            )
+            try:
+                async for message in subscription:
+                    yield message
+            finally:
+                subscription.close()
+        
+        for handler in (
+            ping, get_status, check_liveness, check_readiness, check_critical_modules,
+            get_metrics, reload_module, start_module, stop_module, configure, batch
+        ):
+            control.register(handler.__name__, handler)
+        control.register_stream("subscribe", subscribe)
+    
+    def _require_permission(self, permission: str):
+        """Check a control command against the daemon's security context"""
+        if self.security_context and not self.security_context.has_permission(permission):
+            raise PermissionError(
+                f"Permission denied: {self.security_context.principal} lacks {permission}"
+            )
+    
+    def _module_dependencies(self, module_id: str) -> List[str]:
+        """Hard and soft dependencies of a module (for batch planning)"""
+        manifest = self.loader.registry.get_manifest(module_id)
+        if not manifest:
+            return []
+        return list(manifest.hard_deps) + list(manifest.soft_deps)
+    
+    @staticmethod
+    def _param(params: Dict[str, Any], name: str) -> Any:
+        if name not in params:
+            raise ValueError(f"Missing parameter: {name}")
+        return params[name]
+    
+    async def _start_loop_monitor(self):
+        """Start event-loop lag sampling and slow-callback attribution"""
+        if self.loop_monitor or not self.config.get(
+            DAEMON_CONFIG_ID, "loop_monitor_enabled", expected_type=bool
+        ):
+            return
+        
+        self.loop_monitor = LoopMonitor(
+            self.metrics,
+            self.loader.registry.instances,
+            interval=self.config.get(DAEMON_CONFIG_ID, "loop_lag_interval", expected_type=float),
+            slow_callback_threshold=self.config.get(
+                DAEMON_CONFIG_ID, "slow_callback_threshold", expected_type=float
+            ),
+            log_interval=self.config.get(
+                DAEMON_CONFIG_ID, "slow_callback_log_interval", expected_type=float
+            )
+        )
+        await self.loop_monitor.start()
+    
+    async def _stop_loop_monitor(self):
+        """Stop event-loop monitoring"""
+        if self.loop_monitor:
+            await self.loop_monitor.stop()
+            self.loop_monitor = None
+    
+    async def _stop_metrics_exporter(self):
+        """Stop the /metrics HTTP endpoint"""
+        if self.metrics_exporter:
+            await self.metrics_exporter.stop()
+            self.metrics_exporter = None
 
 
 # Convenience function for simple daemon startup
@@ -49,7 +49,8 @@ async def main():
             "module.unload",
             "module.start",
             "module.stop",
-            "heartbeat.send"
+            "heartbeat.send",
+            "heartbeat.receive"
         ]
     )
     
@@ -0,0 +1,311 @@
+"""
+NEXUS v2 - Phi-Accrual Failure Detector
+Suspicion levels for thousands of heartbeat peers.
+
+Per peer we keep an exponentially weighted mean and variance of the
+heartbeat inter-arrival time. phi is the (logistic-approximated) normal
+tail probability of the current silence, on a -log10 scale:
+    
+    phi(t) = -log10(1 - F((t - mean) / std))
+
+so phi = 1 means a 10% chance the peer is still alive and just late,
+phi = 8 means 1e-8.
+
+State lives in parallel array columns indexed by a per-peer slot, not
+in per-peer objects: ~60 bytes per peer and no per-beat allocation.
+
+phi is monotonic in the silence t, so "phi >= threshold" is the same as
+"now >= suspect_at", with suspect_at = last + mean + y * std and y the
+threshold solved once. suspect_at is refreshed on each beat. A tick then
+only compares one column against now, instead of evaluating exp/log for
+every peer. phi itself is computed on demand (phi(), snapshot()).
+"""
+
+import math
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+
+DEFAULT_THRESHOLD = 8.0
+
+# Logistic approximation of the normal CDF: F(y) = 1 / (1 + exp(-g(y)))
+_G1 = 1.5976
+_G3 = 0.070566
+_LN10 = math.log(10.0)
+
+# A sequence number this far behind the last one is a restarted sender,
+# not a reordered or duplicated datagram (also without sent_at)
+SEQ_RESTART_WINDOW = 1024
+
+# (peer, suspected, phi)
+Change = Tuple[str, bool, float]
+
+
+def phi_value(elapsed: float, mean: float, std: float) -> float:
+    """phi for a peer silent for elapsed seconds"""
+    y = (elapsed - mean) / std
+    g = y * (_G1 + _G3 * y * y)
+    # -log10(1 - F(y)) = log10(1 + exp(g)), arranged so exp() cannot overflow
+    if g > 0:
+        return g / _LN10 + math.log1p(math.exp(-g)) / _LN10
+    return math.log1p(math.exp(g)) / _LN10
+
+
+def threshold_to_sigma(threshold: float) -> float:
+    """Solve phi(y) = threshold for y (standard deviations past the mean)"""
+    # 1 - F(y) = 10**-threshold  <=>  g(y) = ln((1 - p) / p)
+    p = 10.0 ** -threshold
+    target = math.log((1.0 - p) / p)
+    y = target / _G1
+    for _ in range(50):
+        g = y * (_G1 + _G3 * y * y) - target
+        y -= g / (_G1 + 3 * _G3 * y * y)
+        if abs(g) < 1e-12:
+            break
+    return y
+
+
+class PhiAccrualDetector:
+    """
+    Column-store phi-accrual detector.
+    
+    Args:
+        expected_interval: Initial mean estimate for a new peer (seconds)
+        threshold: phi at which a peer becomes suspected
+        min_std: Floor for the standard deviation, so a perfectly regular
+            sender is not suspected the moment it is slightly late
+        acceptable_pause: Extra silence tolerated on top of the mean
+        alpha: EWMA weight of a new inter-arrival sample
+        max_peers: Hard cap on tracked peers (new peers beyond it are ignored)
+    """
+    
+    def __init__(
+        self,
+        expected_interval: float = 1.0,
+        threshold: float = DEFAULT_THRESHOLD,
+        min_std: float = 0.1,
+        acceptable_pause: float = 0.0,
+        alpha: float = 0.1,
+        max_peers: int = 65536
+    ):
+        if expected_interval <= 0 or min_std <= 0:
+            raise ValueError("expected_interval and min_std must be > 0")
+        if not 0 < alpha <= 1:
+            raise ValueError("alpha must be in (0, 1]")
+        
+        self.expected_interval = expected_interval
+        self.threshold = threshold
+        self.min_std = min_std
+        self.acceptable_pause = acceptable_pause
+        self.alpha = alpha
+        self.max_peers = max_peers
+        self._sigma = threshold_to_sigma(threshold)
+        
+        self._slots: Dict[str, int] = {}
+        self._free: List[int] = []
+        self._peers: List[Optional[str]] = []
+        
+        # Columns, one entry per slot
+        self._last = array("d")
+        self._mean = array("d")
+        self._var = array("d")
+        self._suspect_at = array("d")
+        self._seq = array("Q")
+        self._sent = array("d")
+        self._beats = array("Q")
+        self._suspected = bytearray()
+        
+        self._suspected_count = 0
+        self._recovered: List[int] = []
+        self.rejected = 0
+    
+    def __len__(self) -> int:
+        return len(self._slots)
+    
+    def __contains__(self, peer: str) -> bool:
+        return peer in self._slots
+    
+    @property
+    def suspected_count(self) -> int:
+        return self._suspected_count
+    
+    def heartbeat(self, peer: str, seq: int, now: float, sent_at: float = 0.0) -> bool:
+        """
+        Record a beat received at now (monotonic seconds); sent_at is the
+        sender's clock from the beat.
+        
+        Returns False when the beat was ignored: a duplicate or reordered
+        sequence number, or a new peer beyond max_peers.
+        """
+        slot = self._slots.get(peer)
+        if slot is None:
+            return self._add(peer, seq, now, sent_at)
+        
+        # A lower sequence number is a duplicate or reordered datagram if
+        # it was sent before the last accepted beat. Sent after it, far
+        # behind it, or from a suspected peer, the sender has restarted.
+        last_seq = self._seq[slot]
+        restarted = False
+        if seq <= last_seq:
+            if (sent_at <= self._sent[slot] and seq > last_seq - SEQ_RESTART_WINDOW
+                    and not self._suspected[slot]):
+                return False
+            restarted = True
+        self._seq[slot] = seq
+        self._sent[slot] = sent_at
+        self._beats[slot] += 1
+        mean = self._mean[slot]
+        var = self._var[slot]
+        
+        if self._suspected[slot]:
+            # The outage is not an inter-arrival sample
+            self._suspected[slot] = 0
+            self._suspected_count -= 1
+            self._recovered.append(slot)
+        elif not restarted:
+            # EWMA of inter-arrival mean and variance (the gap around a
+            # restart is not a sample either)
+            alpha = self.alpha
+            diff = (now - self._last[slot]) - mean
+            incr = alpha * diff
+            mean += incr
+            var = (1.0 - alpha) * (var + diff * incr)
+            self._mean[slot] = mean
+            self._var[slot] = var
+        
+        # _allowance() inlined: this runs for every received beat
+        std = math.sqrt(var)
+        if std < self.min_std:
+            std = self.min_std
+        self._last[slot] = now
+        self._suspect_at[slot] = now + mean + self.acceptable_pause + self._sigma * std
+        return True
+    
+    def evaluate(self, now: float) -> List[Change]:
+        """
+        One detector tick: peers that became suspected since the last
+        tick, and suspected peers that have beaten again.
+        """
+        flags = self._suspected
+        # The whole per-tick scan: one pass over a single column
+        due = [
+            slot for slot, at in enumerate(self._suspect_at)
+            if at <= now and not flags[slot]
+        ]
+        
+        changes: List[Change] = []
+        for slot in due:
+            peer = self._peers[slot]
+            if peer is None:
+                continue
+            flags[slot] = 1
+            self._suspected_count += 1
+            changes.append((peer, True, self._phi(slot, now)))
+        
+        for slot in self._recovered:
+            peer = self._peers[slot]
+            if peer is not None and not flags[slot]:
+                changes.append((peer, False, self._phi(slot, now)))
+        self._recovered.clear()
+        return changes
+    
+    def expire(self, now: float, ttl: float) -> List[str]:
+        """Forget suspected peers silent for more than ttl seconds"""
+        expired = [
+            peer for peer, slot in self._slots.items()
+            if self._suspected[slot] and now - self._last[slot] > ttl
+        ]
+        for peer in expired:
+            self.remove(peer)
+        return expired
+    
+    def remove(self, peer: str) -> bool:
+        slot = self._slots.pop(peer, None)
+        if slot is None:
+            return False
+        if self._suspected[slot]:
+            self._suspected[slot] = 0
+            self._suspected_count -= 1
+        self._peers[slot] = None
+        # A free slot never becomes due
+        self._suspect_at[slot] = math.inf
+        self._free.append(slot)
+        return True
+    
+    def phi(self, peer: str, now: float) -> Optional[float]:
+        slot = self._slots.get(peer)
+        return None if slot is None else self._phi(slot, now)
+    
+    def is_suspected(self, peer: str) -> bool:
+        slot = self._slots.get(peer)
+        return slot is not None and bool(self._suspected[slot])
+    
+    def suspected(self) -> List[str]:
+        return [peer for peer, slot in self._slots.items() if self._suspected[slot]]
+    
+    def snapshot(self, peer: str, now: float) -> Optional[Dict[str, float]]:
+        """Inter-arrival statistics and current phi for one peer"""
+        slot = self._slots.get(peer)
+        if slot is None:
+            return None
+        return {
+            "phi": self._phi(slot, now),
+            "suspected": bool(self._suspected[slot]),
+            "mean_interval": self._mean[slot],
+            "std_interval": self._std(self._var[slot]),
+            "silence": now - self._last[slot],
+            "beats": self._beats[slot],
+            "seq": self._seq[slot],
+        }
+    
+    # Internal
+    
+    def _add(self, peer: str, seq: int, now: float, sent_at: float) -> bool:
+        if len(self._slots) >= self.max_peers:
+            self.rejected += 1
+            return False
+        
+        mean = self.expected_interval
+        # Until real samples arrive, assume a spread of a quarter interval
+        var = (mean / 4) ** 2
+        suspect_at = now + self._allowance(mean, var)
+        
+        if self._free:
+            slot = self._free.pop()
+            self._peers[slot] = peer
+            self._last[slot] = now
+            self._mean[slot] = mean
+            self._var[slot] = var
+            self._suspect_at[slot] = suspect_at
+            self._seq[slot] = seq
+            self._sent[slot] = sent_at
+            self._beats[slot] = 1
+            self._suspected[slot] = 0
+        else:
+            slot = len(self._peers)
+            self._peers.append(peer)
+            self._last.append(now)
+            self._mean.append(mean)
+            self._var.append(var)
+            self._suspect_at.append(suspect_at)
+            self._seq.append(seq)
+            self._sent.append(sent_at)
+            self._beats.append(1)
+            self._suspected.append(0)
+        
+        self._slots[peer] = slot
+        return True
+    
+    def _std(self, var: float) -> float:
+        return max(math.sqrt(var), self.min_std)
+    
+    def _allowance(self, mean: float, var: float) -> float:
+        """Silence after which phi reaches the threshold"""
+        return mean + self.acceptable_pause + self._sigma * self._std(var)
+    
+    def _phi(self, slot: int, now: float) -> float:
+        return phi_value(
+            now - self._last[slot],
+            self._mean[slot] + self.acceptable_pause,
+            self._std(self._var[slot])
+        )
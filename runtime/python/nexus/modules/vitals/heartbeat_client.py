@@ -6,12 +6,26 @@ Example module showcasing v2 features:
 - Structured logging
 - Operation tracking
 - State persistence
+- Drift-free scheduling on monotonic deadlines
+- UDP / TCP / Unix socket targets that never block the loop
 """
 
 import asyncio
-from typing import Dict, Any
+import random
+import socket
+import time
+from typing import Dict, Any, List
 from nexus_v2.core import BaseModule, ModuleManifest, ModuleState
 
+from .protocol import encode_beat
+from .transport import HeartbeatSender, OVERFLOW_POLICIES, parse_target
+
+
+# Per-beat scheduling lateness, 0.5ms .. 1s
+LATENESS_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+MISSED_BEAT_POLICIES = ("skip", "burst")
+
 
 class HeartbeatClient(BaseModule):
     """
@@ -39,7 +53,15 @@ class HeartbeatClient(BaseModule):
             soft_deps=[],
             config_keys={
                 "interval_ms": 1000,
+                "jitter_ms": 0,
+                "missed_beat_policy": "skip",
+                "max_burst": 3,
                 "target": "console",
+                "targets": [],
+                "sender_id": "",
+                "send_queue_size": 16,
+                "overflow_policy": "coalesce",
+                "reconnect_max_s": 30,
                 "enabled": True,
             },
             resources={
@@ -63,8 +85,30 @@ class HeartbeatClient(BaseModule):
         self._interval_ms = 1000
         self._target = "console"
         self._enabled = True
+        self._jitter_ms = 0
+        self._missed_beat_policy = "skip"
+        self._max_burst = 3
+        self._targets: List[str] = []
+        self._sender_id = ""
+        self._send_queue_size = 16
+        self._overflow_policy = "coalesce"
+        self._reconnect_max_s = 30
+        self._sender = None
         self._heartbeat_task = None
         self._heartbeat_count = 0
+        self._missed_beats = 0
+        
+        # v2: Pre-bound metric handles for the per-beat hot path
+        self._sent_counter = self.metrics.counter("heartbeats_sent_total")
+        self._count_gauge = self.metrics.gauge_handle("heartbeat_count")
+        self._missed_counter = self.metrics.counter("heartbeats_missed_total")
+        self._dropped_counter = self.metrics.counter("heartbeats_dropped_total")
+        self.metrics.configure_histogram(
+            "heartbeat_lateness_seconds",
+            buckets=LATENESS_BUCKETS,
+            quantiles=(0.5, 0.99)
+        )
+        self._lateness = self.metrics.histogram_handle("heartbeat_lateness_seconds")
     
     async def init(self, context: Dict[str, Any]):
         """
@@ -101,6 +145,64 @@ class HeartbeatClient(BaseModule):
                 expected_type=bool
             )
             
+            self._jitter_ms = config.get(
+                self.manifest.id,
+                "jitter_ms",
+                default=0,
+                expected_type=int
+            )
+            
+            self._missed_beat_policy = config.get(
+                self.manifest.id,
+                "missed_beat_policy",
+                default="skip",
+                expected_type=str
+            )
+            
+            self._max_burst = config.get(
+                self.manifest.id,
+                "max_burst",
+                default=3,
+                expected_type=int
+            )
+            
+            self._targets = list(config.get(
+                self.manifest.id,
+                "targets",
+                default=[],
+                expected_type=list
+            ))
+            if self._target != "console":
+                self._targets.insert(0, self._target)
+            
+            self._sender_id = config.get(
+                self.manifest.id,
+                "sender_id",
+                default="",
+                expected_type=str
+            ) or socket.gethostname()
+            
+            self._send_queue_size = config.get(
+                self.manifest.id,
+                "send_queue_size",
+                default=16,
+                expected_type=int
+            )
+            
+            self._overflow_policy = config.get(
+                self.manifest.id,
+                "overflow_policy",
+                default="coalesce",
+                expected_type=str
+            )
+            
+            self._reconnect_max_s = config.get(
+                self.manifest.id,
+                "reconnect_max_s",
+                default=30,
+                expected_type=int
+            )
+            
             # Validate configuration
             if self._interval_ms < 100:
                 raise ValueError("interval_ms must be >= 100")
@@ -108,6 +210,24 @@ class HeartbeatClient(BaseModule):
             if self._interval_ms > 60000:
                 raise ValueError("interval_ms must be <= 60000")
             
+            if not 0 <= self._jitter_ms < self._interval_ms // 2:
+                raise ValueError("jitter_ms must be >= 0 and < interval_ms / 2")
+            
+            if self._missed_beat_policy not in MISSED_BEAT_POLICIES:
+                raise ValueError(f"missed_beat_policy must be one of {MISSED_BEAT_POLICIES}")
+            
+            if self._max_burst < 1:
+                raise ValueError("max_burst must be >= 1")
+            
+            for target in self._targets:
+                parse_target(target)
+            
+            if self._send_queue_size < 1:
+                raise ValueError("send_queue_size must be >= 1")
+            
+            if self._overflow_policy not in OVERFLOW_POLICIES:
+                raise ValueError(f"overflow_policy must be one of {OVERFLOW_POLICIES}")
+            
             # v2: Restore state if available
             if 'persisted_state' in context:
                 state = context['persisted_state']
@@ -121,7 +241,10 @@ class HeartbeatClient(BaseModule):
                 "Configuration loaded",
                 extra={
                     "interval_ms": self._interval_ms,
+                    "jitter_ms": self._jitter_ms,
+                    "missed_beat_policy": self._missed_beat_policy,
                     "target": self._target,
+                    "targets": self._targets,
                     "enabled": self._enabled
                 }
             )
@@ -141,8 +264,15 @@ class HeartbeatClient(BaseModule):
         try:
             # v2: Track operation with metrics
             async with self._track_operation("load"):
-                # In a real module: open sockets, connect to databases, etc.
-                await asyncio.sleep(0.01)  # Simulate resource preparation
+                if self._targets:
+                    self._sender = HeartbeatSender(
+                        self._targets,
+                        metrics=self.metrics,
+                        spawn=self._spawn_background_task,
+                        queue_size=self._send_queue_size,
+                        overflow=self._overflow_policy,
+                        reconnect_max=float(self._reconnect_max_s)
+                    )
             
             self.logger.info("Resources prepared")
             
@@ -167,10 +297,15 @@ class HeartbeatClient(BaseModule):
             
             # v2: Track operation
             async with self._track_operation("start"):
+                # Sockets resolve and connect here; stream targets keep
+                # reconnecting in the background if the receiver is down
+                if self._sender:
+                    await self._sender.open()
+                
                 # Start heartbeat loop
                 self._heartbeat_task = self._spawn_background_task(
                     self._heartbeat_loop(),
-                    name="heartbeat_loop"
+                    name=f"{self.manifest.id}_heartbeat_loop"
                 )
             
             self._set_state(ModuleState.STARTED)
@@ -202,6 +337,8 @@ class HeartbeatClient(BaseModule):
             async with self._track_operation("stop"):
                 # Cancel background tasks
                 await self._cancel_background_tasks(timeout=5.0)
+                if self._sender:
+                    await self._sender.close()
             
             self._set_state(ModuleState.STOPPED)
             
@@ -226,6 +363,7 @@ class HeartbeatClient(BaseModule):
             # v2: Idempotent cleanup
             if self._heartbeat_task:
                 self._heartbeat_task = None
+            self._sender = None
             
             # Note: Don't reset _heartbeat_count - will be saved to state
             
@@ -254,8 +392,11 @@ class HeartbeatClient(BaseModule):
             "details": {
                 "heartbeat_count": self._heartbeat_count,
                 "interval_ms": self._interval_ms,
+                "missed_beats": self._missed_beats,
+                "lateness_p99_seconds": self._lateness.histogram.quantile(0.99),
                 "uptime_seconds": self.uptime_seconds,
                 "target": self._target,
+                "targets": self._sender.status() if self._sender else {},
                 # v2: Resource usage
                 "resource_usage": self._resource_usage
             }
@@ -266,14 +407,54 @@ class HeartbeatClient(BaseModule):
     async def _heartbeat_loop(self):
         """
         Main heartbeat loop with metrics.
+        
+        Beats are scheduled on a fixed grid of loop.time() deadlines, so
+        send time and loop lag delay a beat without shifting the ones
+        after it. Jitter offsets each beat within its slot, never the
+        grid. When the loop falls a whole interval or more behind, the
+        overdue beats are counted as missed and either dropped ("skip")
+        or sent back-to-back, up to max_burst ("burst").
         """
+        loop = asyncio.get_running_loop()
+        interval = self._interval_ms / 1000.0
+        jitter = self._jitter_ms / 1000.0
+        next_beat = loop.time()
+        backlog = 0
+        
         try:
             while True:
+                # Wait for this beat's deadline
+                deadline = next_beat
+                if jitter and not backlog:
+                    deadline += random.uniform(0.0, jitter)
+                delay = deadline - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                self._lateness.observe(max(0.0, loop.time() - deadline))
+                
                 # Send heartbeat
                 await self._send_heartbeat()
+                next_beat += interval
                 
-                # Wait for next interval
-                await asyncio.sleep(self._interval_ms / 1000.0)
+                if backlog:
+                    backlog -= 1
+                    continue
+                
+                # Missed-beat detection: whole intervals already overdue
+                missed = int((loop.time() - next_beat) // interval)
+                if missed > 0:
+                    self._missed_beats += missed
+                    self._missed_counter.inc(missed)
+                    
+                    backlog = min(missed, self._max_burst) if self._missed_beat_policy == "burst" else 0
+                    dropped = missed - backlog
+                    next_beat += dropped * interval
+                    self._dropped_counter.inc(dropped)
+                    self.logger.warning(
+                        f"Missed {missed} heartbeats ({self._missed_beat_policy}: "
+                        f"{backlog} sent late, {dropped} dropped)",
+                        extra={"missed_beats": missed}
+                    )
                 
         except asyncio.CancelledError:
             self.logger.info("Heartbeat loop cancelled")
@@ -294,14 +475,18 @@ class HeartbeatClient(BaseModule):
             self._heartbeat_count += 1
             
             # v2: Increment counter metric
-            self.metrics.increment("heartbeats_sent_total")
+            self._sent_counter.inc()
             
             # v2: Update gauge metrics
-            self.metrics.gauge("heartbeat_count", float(self._heartbeat_count))
+            self._count_gauge.set(float(self._heartbeat_count))
             
             # v2: Track resource usage
             self._resource_usage["requests_total"] += 1
             
+            if self._sender:
+                # Never awaits: full queues drop or coalesce instead
+                self._sender.send(encode_beat(self._sender_id, self._heartbeat_count, time.time()))
+            
             if self._target == "console":
                 # For demonstration, print every 10th
                 if self._heartbeat_count % 10 == 0:
@@ -312,6 +497,3 @@ class HeartbeatClient(BaseModule):
                             "interval_ms": self._interval_ms
                         }
                     )
-            else:
-                # In production: send to actual target (socket, API, etc.)
-                pass
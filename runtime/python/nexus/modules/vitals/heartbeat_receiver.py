@@ -0,0 +1,434 @@
+"""
+NEXUS v2 - Heartbeat Receiver Module
+Counterpart to the heartbeat client:
+- UDP / TCP / Unix socket ingest, drained in batches
+- Phi-accrual failure detection for thousands of peers
+- Suspicion change events for subscribers
+- Metrics and health details
+"""
+
+import asyncio
+import time
+from typing import Any, Callable, Dict, List
+from nexus_v2.core import BaseModule, ModuleManifest, ModuleState
+
+from .detector import PhiAccrualDetector
+from .protocol import Beat
+from .transport import HeartbeatListener
+
+
+# Suspicion change event: {"type", "peer", "phi", "timestamp"}
+SuspicionListener = Callable[[Dict[str, Any]], None]
+
+# Bus topic carrying the same events
+SUSPICION_TOPIC = "vitals.peer.suspicion"
+
+# Peers named individually in log lines and health details
+MAX_LISTED_PEERS = 20
+
+
+class HeartbeatReceiver(BaseModule):
+    """
+    Heartbeat receiver - tracks liveness of heartbeat senders.
+    
+    Every beat updates the sender's inter-arrival statistics; a timer
+    tick evaluates all peers at once and publishes the ones whose
+    suspicion changed ("suspected" / "recovered"), and long-suspected
+    peers are eventually forgotten ("expired").
+    """
+    
+    @classmethod
+    def get_manifest(cls) -> ModuleManifest:
+        """Define module manifest with v2 security metadata"""
+        return ModuleManifest(
+            id="vitals/heartbeat-receiver",
+            group="vitals",
+            version="2.0.0",
+            description="Heartbeat receiver with phi-accrual failure detection",
+            required=False,
+            provides=["vitals.heartbeat.receiver", SUSPICION_TOPIC],
+            consumes=[],
+            hard_deps=[],
+            soft_deps=[],
+            config_keys={
+                "listen": "udp://127.0.0.1:7400",
+                "expected_interval_ms": 1000,
+                "phi_threshold": 8.0,
+                "min_std_ms": 100,
+                "acceptable_pause_ms": 0,
+                "evaluate_interval_ms": 100,
+                "peer_ttl_s": 300,
+                "max_peers": 65536,
+                "enabled": True,
+            },
+            resources={
+                "threads": 1,
+                "memory_mb": 32,
+            },
+            hot_unload_allowed=True,
+            hot_unload_reason="",
+            # v2: Security metadata
+            required_permissions=["heartbeat.receive"],
+            sensitive=False,
+            # v2: Operational metadata
+            author="NEXUS Project",
+            license="MIT"
+        )
+    
+    def __init__(self, manifest: ModuleManifest):
+        super().__init__(manifest)
+        
+        # Module state
+        self._listen = "udp://127.0.0.1:7400"
+        self._expected_interval_ms = 1000
+        self._phi_threshold = 8.0
+        self._min_std_ms = 100
+        self._acceptable_pause_ms = 0
+        self._evaluate_interval_ms = 100
+        self._peer_ttl_s = 300
+        self._max_peers = 65536
+        self._enabled = True
+        self._detector = None
+        self._listener = None
+        self._listeners: List[SuspicionListener] = []
+        self._last_evaluate_seconds = 0.0
+        
+        # v2: Pre-bound metric handles for the per-tick hot path
+        self._peers_gauge = self.metrics.gauge_handle("peers")
+        self._suspected_gauge = self.metrics.gauge_handle("peers_suspected")
+        self._suspicion_counter = self.metrics.counter("suspicion_changes_total")
+        self._ignored_counter = self.metrics.counter("heartbeats_ignored_total")
+    
+    async def init(self, context: Dict[str, Any]):
+        """
+        Initialize module with v2 improvements.
+        """
+        try:
+            config = context["config"]
+            
+            self.logger.info(
+                "Initializing heartbeat receiver",
+                extra={"module_id": self.manifest.id}
+            )
+            
+            # Load configuration (type-safe)
+            self._listen = config.get(
+                self.manifest.id,
+                "listen",
+                default="udp://127.0.0.1:7400",
+                expected_type=str
+            )
+            
+            self._expected_interval_ms = config.get(
+                self.manifest.id,
+                "expected_interval_ms",
+                default=1000,
+                expected_type=int
+            )
+            
+            self._phi_threshold = config.get(
+                self.manifest.id,
+                "phi_threshold",
+                default=8.0,
+                expected_type=float
+            )
+            
+            self._min_std_ms = config.get(
+                self.manifest.id,
+                "min_std_ms",
+                default=100,
+                expected_type=int
+            )
+            
+            self._acceptable_pause_ms = config.get(
+                self.manifest.id,
+                "acceptable_pause_ms",
+                default=0,
+                expected_type=int
+            )
+            
+            self._evaluate_interval_ms = config.get(
+                self.manifest.id,
+                "evaluate_interval_ms",
+                default=100,
+                expected_type=int
+            )
+            
+            self._peer_ttl_s = config.get(
+                self.manifest.id,
+                "peer_ttl_s",
+                default=300,
+                expected_type=int
+            )
+            
+            self._max_peers = config.get(
+                self.manifest.id,
+                "max_peers",
+                default=65536,
+                expected_type=int
+            )
+            
+            self._enabled = config.get(
+                self.manifest.id,
+                "enabled",
+                default=True,
+                expected_type=bool
+            )
+            
+            # Validate configuration
+            if self._expected_interval_ms < 10:
+                raise ValueError("expected_interval_ms must be >= 10")
+            
+            if self._phi_threshold <= 0:
+                raise ValueError("phi_threshold must be > 0")
+            
+            if self._min_std_ms < 1:
+                raise ValueError("min_std_ms must be >= 1")
+            
+            if self._acceptable_pause_ms < 0:
+                raise ValueError("acceptable_pause_ms must be >= 0")
+            
+            if self._evaluate_interval_ms < 10:
+                raise ValueError("evaluate_interval_ms must be >= 10")
+            
+            if self._max_peers < 1:
+                raise ValueError("max_peers must be >= 1")
+            
+            self._detector = PhiAccrualDetector(
+                expected_interval=self._expected_interval_ms / 1000.0,
+                threshold=self._phi_threshold,
+                min_std=self._min_std_ms / 1000.0,
+                acceptable_pause=self._acceptable_pause_ms / 1000.0,
+                max_peers=self._max_peers
+            )
+            self._listener = HeartbeatListener(self._listen, self._on_beats, metrics=self.metrics)
+            
+            self.logger.info(
+                "Configuration loaded",
+                extra={
+                    "listen": self._listen,
+                    "expected_interval_ms": self._expected_interval_ms,
+                    "phi_threshold": self._phi_threshold,
+                    "enabled": self._enabled
+                }
+            )
+            
+            self._set_state(ModuleState.LOADED)
+        
+        except Exception as e:
+            self.logger.error(f"Init failed: {e}", exc_info=True)
+            self._last_error = e
+            self._set_state(ModuleState.FAILED)
+            raise  # v2: Always raise exceptions
+    
+    async def load(self, context: Dict[str, Any]):
+        """
+        Load module - bind the listening socket.
+        """
+        try:
+            async with self._track_operation("load"):
+                # Bind now so an address conflict fails the load, not the start
+                await self._listener.open()
+            
+            self.logger.info(f"Listening for heartbeats on {self._listen}")
+        
+        except Exception as e:
+            self.logger.error(f"Load failed: {e}", exc_info=True)
+            self._last_error = e
+            self._set_state(ModuleState.FAILED)
+            raise
+    
+    async def start(self):
+        """
+        Start module - begin ingest and detection.
+        """
+        try:
+            if not self._enabled:
+                self.logger.warning("Module disabled in config, not starting")
+                raise RuntimeError("Module disabled")
+            
+            # v2: Check permission
+            if self.security_context:
+                self._require_permission("heartbeat.receive")
+            
+            async with self._track_operation("start"):
+                await self._listener.start()
+                self._call_every(self._evaluate_interval_ms / 1000.0, self._evaluate)
+                if self._peer_ttl_s > 0:
+                    self._call_every(max(1.0, self._peer_ttl_s / 10), self._expire)
+                if self.rpc_router is not None:
+                    self._serve("vitals.heartbeat.receiver", "peer_status", self.peer_status)
+            
+            self._set_state(ModuleState.STARTED)
+            self.metrics.gauge("enabled", 1.0)
+            self.logger.info("Heartbeat receiver started")
+        
+        except PermissionError as e:
+            self.logger.error(f"Permission denied: {e}")
+            self._last_error = e
+            self._set_state(ModuleState.FAILED)
+            raise
+        except Exception as e:
+            self.logger.error(f"Start failed: {e}", exc_info=True)
+            self._last_error = e
+            self._set_state(ModuleState.FAILED)
+            raise
+    
+    async def stop(self):
+        """
+        Stop module - stop ingest; peer statistics are kept.
+        """
+        try:
+            async with self._track_operation("stop"):
+                # The loader cancels our timers after stop()
+                await self._listener.close()
+                await self._cancel_background_tasks(timeout=5.0)
+            
+            self._set_state(ModuleState.STOPPED)
+            self.metrics.gauge("enabled", 0.0)
+            self.logger.info(
+                f"Stopped ({len(self._detector)} peers tracked)",
+                extra={"peers": len(self._detector)}
+            )
+        
+        except Exception as e:
+            self.logger.error(f"Stop failed: {e}", exc_info=True)
+            self._last_error = e
+            raise
+    
+    async def unload(self):
+        """
+        Unload module - release all resources.
+        """
+        try:
+            # v2: Idempotent cleanup
+            if self._listener:
+                await self._listener.close()
+            self._listeners.clear()
+            
+            self._set_state(ModuleState.UNLOADED)
+            self.logger.info("Unloaded, resources released")
+        
+        except Exception as e:
+            self.logger.error(f"Unload failed: {e}", exc_info=True)
+            self._last_error = e
+            raise
+    
+    async def health(self) -> Dict[str, Any]:
+        """
+        Health check with detector statistics.
+        """
+        started = self.state == ModuleState.STARTED
+        detector = self._detector
+        suspected = detector.suspected() if detector else []
+        
+        return {
+            "status": "healthy" if started else "degraded",
+            "ready": started,
+            "live": started,
+            "details": {
+                "listen": self._listen,
+                "peers": len(detector) if detector else 0,
+                "peers_suspected": len(suspected),
+                "suspected_peers": suspected[:MAX_LISTED_PEERS],
+                "peers_rejected": detector.rejected if detector else 0,
+                "heartbeats_received": self._listener.received if self._listener else 0,
+                "heartbeats_invalid": self._listener.invalid if self._listener else 0,
+                "evaluate_seconds": self._last_evaluate_seconds,
+                "uptime_seconds": self.uptime_seconds,
+                # v2: Resource usage
+                "resource_usage": self._resource_usage
+            }
+        }
+    
+    # Public API
+    
+    def subscribe(self, listener: SuspicionListener) -> Callable[[], None]:
+        """
+        Register for suspicion changes; returns an unsubscribe callable.
+        Other modules can consume the SUSPICION_TOPIC bus topic instead.
+        
+        Listeners run synchronously on the event loop, once per change:
+            {"type": "suspected" | "recovered" | "expired",
+             "peer": str, "phi": float | None, "timestamp": float}
+        """
+        self._listeners.append(listener)
+        
+        def unsubscribe():
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+        
+        return unsubscribe
+    
+    def peer_status(self, peer: str) -> Dict[str, Any]:
+        """Inter-arrival statistics and phi for one peer (empty if unknown)"""
+        if not self._detector:
+            return {}
+        return self._detector.snapshot(peer, asyncio.get_running_loop().time()) or {}
+    
+    # Private methods
+    
+    def _on_beats(self, beats: List[Beat], now: float):
+        """Listener handler: one call per socket wake-up"""
+        heartbeat = self._detector.heartbeat
+        ignored = 0
+        for sender, seq, sent_at in beats:
+            if not heartbeat(sender, seq, now, sent_at):
+                ignored += 1
+        if ignored:
+            self._ignored_counter.inc(ignored)
+        self._resource_usage["requests_total"] += len(beats)
+    
+    def _evaluate(self):
+        """Detector tick: publish suspicion changes"""
+        started = time.perf_counter()
+        changes = self._detector.evaluate(asyncio.get_running_loop().time())
+        self._last_evaluate_seconds = time.perf_counter() - started
+        
+        self._peers_gauge.set(float(len(self._detector)))
+        self._suspected_gauge.set(float(self._detector.suspected_count))
+        if not changes:
+            return
+        
+        self._suspicion_counter.inc(len(changes))
+        timestamp = time.time()
+        suspected = [peer for peer, is_suspected, _ in changes if is_suspected]
+        recovered = [peer for peer, is_suspected, _ in changes if not is_suspected]
+        if suspected:
+            self.logger.warning(
+                f"{len(suspected)} peer(s) suspected: {', '.join(suspected[:MAX_LISTED_PEERS])}",
+                extra={"peers_suspected": len(suspected)}
+            )
+        if recovered:
+            self.logger.info(
+                f"{len(recovered)} peer(s) recovered: {', '.join(recovered[:MAX_LISTED_PEERS])}",
+                extra={"peers_recovered": len(recovered)}
+            )
+        
+        for peer, is_suspected, phi in changes:
+            self._notify({
+                "type": "suspected" if is_suspected else "recovered",
+                "peer": peer,
+                "phi": phi,
+                "timestamp": timestamp,
+            })
+    
+    def _expire(self):
+        """Forget peers that have been silent for longer than peer_ttl_s"""
+        expired = self._detector.expire(asyncio.get_running_loop().time(), float(self._peer_ttl_s))
+        if not expired:
+            return
+        
+        self.logger.info(f"Forgot {len(expired)} silent peer(s)")
+        timestamp = time.time()
+        for peer in expired:
+            self._notify({"type": "expired", "peer": peer, "phi": None, "timestamp": timestamp})
+    
+    def _notify(self, event: Dict[str, Any]):
+        if self.message_bus is not None:
+            self._publish(SUSPICION_TOPIC, event)
+        for listener in list(self._listeners):
+            try:
+                listener(event)
+            except Exception as e:
+                self.logger.error(f"Suspicion listener failed: {e}", exc_info=True)
@@ -0,0 +1,57 @@
+"""
+NEXUS v2 - Heartbeat Wire Format
+Shared by the heartbeat client and receiver.
+
+A beat is a fixed header followed by the UTF-8 sender id:
+
+    magic "NXHB" | version u8 | pad u8 | id length u16 | seq u64 | sent_at f64 | id
+
+Frames are self-delimiting, so the same bytes work as one UDP datagram
+or concatenated on a TCP / Unix stream.
+"""
+
+import struct
+from typing import Optional, Tuple
+
+HEADER = struct.Struct("<4sBxHQd")
+MAGIC = b"NXHB"
+VERSION = 1
+MAX_SENDER_ID = 255
+
+Beat = Tuple[str, int, float]
+
+
+def encode_beat(sender_id: str, seq: int, sent_at: float) -> bytes:
+    """Serialize one heartbeat"""
+    sender = sender_id.encode("utf-8")
+    if len(sender) > MAX_SENDER_ID:
+        raise ValueError(f"Sender id longer than {MAX_SENDER_ID} bytes: {sender_id!r}")
+    return HEADER.pack(MAGIC, VERSION, len(sender), seq, sent_at) + sender
+
+
+def decode_beat(data: bytes, offset: int = 0) -> Tuple[Optional[Beat], int]:
+    """
+    Parse one heartbeat starting at offset.
+    
+    Returns:
+        (beat or None, offset of the next frame). beat is None when the
+        frame is invalid; the next offset is then len(data) - callers
+        should drop the rest of the buffer (datagram) or the connection
+        (stream). When the buffer ends mid-frame, returns (None, offset)
+        unchanged so a stream reader can wait for more bytes.
+    """
+    end = offset + HEADER.size
+    if len(data) < end:
+        return None, offset
+    
+    magic, version, length, seq, sent_at = HEADER.unpack_from(data, offset)
+    if magic != MAGIC or version != VERSION:
+        return None, len(data)
+    if len(data) < end + length:
+        return None, offset
+    
+    try:
+        sender = data[end:end + length].decode("utf-8")
+    except UnicodeDecodeError:
+        return None, len(data)
+    return (sender, seq, sent_at), end + length
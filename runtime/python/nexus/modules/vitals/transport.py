@@ -0,0 +1,473 @@
+"""
+NEXUS v2 - Heartbeat Transports
+Network targets for the heartbeat client, and the matching listener for
+the receiver.
+
+Targets are URLs:
+
+    udp://host:port     datagram per beat
+    tcp://host:port     persistent stream connection
+    unix:///path        persistent Unix stream connection
+
+send() never awaits, so a slow or unreachable receiver cannot stall the
+event loop:
+
+- UDP destinations share one socket per address family, resolved once
+  at open(). Each beat goes out in a single synchronous pass over all
+  destinations. If the socket buffer backs up past udp_buffer_limit,
+  the beat is dropped.
+- Stream destinations hold one connection each, with a writer task that
+  reconnects with jittered exponential backoff. Beats wait in a bounded
+  queue. Everything queued while the previous write drained goes out in
+  one write. When the queue is full, the overflow policy either drops
+  the new beat ("drop") or replaces the queued beats with it
+  ("coalesce" - a newer beat supersedes older ones).
+
+HeartbeatListener is the receiving side. UDP is read straight from a
+non-blocking socket on loop.add_reader, draining every queued datagram
+per wake-up, so a burst of beats costs one loop iteration rather than
+one protocol callback each. All beats from one wake-up go to the handler
+together, stamped with a single arrival time.
+"""
+
+import asyncio
+import logging
+import os
+import random
+import socket
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from .protocol import Beat, decode_beat
+
+
+logger = logging.getLogger(__name__)
+
+OVERFLOW_POLICIES = ("drop", "coalesce")
+TARGET_SCHEMES = ("udp", "tcp", "unix")
+
+# Datagrams read per wake-up before yielding back to the loop
+MAX_DATAGRAMS_PER_WAKEUP = 512
+UDP_RECEIVE_BUFFER = 4 * 1024 * 1024
+
+BeatHandler = Callable[[List[Beat], float], None]
+
+
+def parse_target(target: str) -> Tuple[str, Any]:
+    """
+    Split a target URL into (scheme, address).
+    
+    Raises:
+        ValueError: Unsupported scheme or missing host/port/path
+    """
+    parts = urlsplit(target)
+    scheme = parts.scheme.lower()
+    if scheme not in TARGET_SCHEMES:
+        raise ValueError(f"Unsupported heartbeat target {target!r} (expected {', '.join(TARGET_SCHEMES)})")
+    
+    if scheme == "unix":
+        path = parts.path or parts.netloc
+        if not path:
+            raise ValueError(f"Missing socket path in {target!r}")
+        return scheme, path
+    
+    if not parts.hostname or parts.port is None:
+        raise ValueError(f"Missing host or port in {target!r}")
+    return scheme, (parts.hostname, parts.port)
+
+
+def backoff_delay(attempt: int, base: float = 0.1, maximum: float = 30.0) -> float:
+    """Exponential backoff with equal jitter: uniform in [delay/2, delay]"""
+    delay = min(maximum, base * (2 ** min(attempt, 30)))
+    return delay * random.uniform(0.5, 1.0)
+
+
+class _StreamDestination:
+    """One persistent TCP / Unix connection with a bounded send queue"""
+    
+    def __init__(self, target: str, scheme: str, address: Any, sender: "HeartbeatSender"):
+        self.target = target
+        self.scheme = scheme
+        self.address = address
+        self.connected = False
+        self.dropped = 0
+        self.coalesced = 0
+        
+        self._sender = sender
+        self._pending: Deque[bytes] = deque()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+    
+    def offer(self, frame: bytes):
+        """Queue a beat without blocking, applying the overflow policy"""
+        if len(self._pending) >= self._sender.queue_size:
+            if self._sender.overflow == "coalesce":
+                self.coalesced += len(self._pending)
+                self._sender._count("heartbeat_send_coalesced_total", self.target, len(self._pending))
+                self._pending.clear()
+            else:
+                self.dropped += 1
+                self._sender._count("heartbeat_send_dropped_total", self.target)
+                return
+        self._pending.append(frame)
+        self._wakeup.set()
+    
+    @property
+    def queued(self) -> int:
+        return len(self._pending)
+    
+    def start(self, spawn: Callable):
+        self._task = spawn(self._run(), name=f"heartbeat_target_{self.target}")
+    
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+    
+    async def _connect(self):
+        if self.scheme == "unix":
+            return await asyncio.open_unix_connection(self.address)
+        host, port = self.address
+        return await asyncio.open_connection(host, port)
+    
+    async def _run(self):
+        attempt = 0
+        while True:
+            writer = None
+            try:
+                _, writer = await asyncio.wait_for(self._connect(), self._sender.connect_timeout)
+                self.connected = True
+                if attempt:
+                    logger.info(f"Heartbeat target {self.target} reconnected")
+                attempt = 0
+                
+                while True:
+                    while not self._pending:
+                        self._wakeup.clear()
+                        await self._wakeup.wait()
+                    
+                    # Everything queued since the last write goes out in one
+                    batch = b"".join(self._pending)
+                    self._pending.clear()
+                    writer.write(batch)
+                    await writer.drain()
+            
+            except asyncio.CancelledError:
+                raise
+            except (OSError, asyncio.TimeoutError) as e:
+                self._sender._count("heartbeat_send_errors_total", self.target)
+                if attempt == 0:
+                    logger.warning(f"Heartbeat target {self.target} unavailable: {e!r}")
+            finally:
+                self.connected = False
+                if writer is not None:
+                    writer.close()
+            
+            self._sender._count("heartbeat_reconnects_total", self.target)
+            await asyncio.sleep(backoff_delay(attempt, maximum=self._sender.reconnect_max))
+            attempt += 1
+
+
+class _DatagramProtocol(asyncio.DatagramProtocol):
+    """Send-only endpoint; errors are counted, never raised into send()"""
+    
+    def __init__(self, sender: "HeartbeatSender"):
+        self._sender = sender
+    
+    def error_received(self, exc):
+        # e.g. ICMP port unreachable reported on a later sendto()
+        self._sender._count("heartbeat_send_errors_total", "udp")
+
+
+class HeartbeatSender:
+    """
+    Fan-out of encoded beats to network targets.
+    
+    Args:
+        targets: Target URLs (see module docstring)
+        metrics: MetricsCollector for per-target counters (optional)
+        spawn: Task factory for stream writers, e.g. a module's
+            _spawn_background_task (default asyncio.create_task)
+        queue_size: Max beats queued per stream destination
+        overflow: "drop" or "coalesce" when a queue is full
+        reconnect_max: Backoff ceiling in seconds
+        udp_buffer_limit: Bytes buffered in a UDP transport before beats
+            are dropped
+    """
+    
+    def __init__(
+        self,
+        targets: List[str],
+        metrics=None,
+        spawn: Optional[Callable] = None,
+        queue_size: int = 16,
+        overflow: str = "coalesce",
+        reconnect_max: float = 30.0,
+        connect_timeout: float = 5.0,
+        udp_buffer_limit: int = 64 * 1024
+    ):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"overflow must be one of {OVERFLOW_POLICIES}")
+        if queue_size < 1:
+            raise ValueError("queue_size must be >= 1")
+        
+        self.queue_size = queue_size
+        self.overflow = overflow
+        self.reconnect_max = reconnect_max
+        self.connect_timeout = connect_timeout
+        self.udp_buffer_limit = udp_buffer_limit
+        
+        self._metrics = metrics
+        self._spawn = spawn or (lambda coro, name=None: asyncio.create_task(coro, name=name))
+        self._counters: Dict[Tuple[str, str], Any] = {}
+        
+        self._udp_targets: List[Tuple[str, Tuple[str, int]]] = []
+        self._streams: List[_StreamDestination] = []
+        for target in targets:
+            scheme, address = parse_target(target)
+            if scheme == "udp":
+                self._udp_targets.append((target, address))
+            else:
+                self._streams.append(_StreamDestination(target, scheme, address, self))
+        
+        # address family -> (transport, resolved destination addresses)
+        self._udp: Dict[int, Tuple[asyncio.DatagramTransport, List[Any]]] = {}
+        self.udp_dropped = 0
+    
+    @property
+    def targets(self) -> List[str]:
+        return [target for target, _ in self._udp_targets] + [dest.target for dest in self._streams]
+    
+    async def open(self):
+        """Resolve UDP targets, open the shared sockets and start stream writers"""
+        loop = asyncio.get_running_loop()
+        resolved: Dict[int, List[Any]] = {}
+        
+        for target, (host, port) in self._udp_targets:
+            try:
+                infos = await loop.getaddrinfo(host, port, type=socket.SOCK_DGRAM)
+            except OSError as e:
+                logger.error(f"Cannot resolve heartbeat target {target}: {e}")
+                continue
+            family, _, _, _, sockaddr = infos[0]
+            resolved.setdefault(family, []).append(sockaddr)
+        
+        for family, addresses in resolved.items():
+            transport, _ = await loop.create_datagram_endpoint(
+                lambda: _DatagramProtocol(self), family=family
+            )
+            self._udp[family] = (transport, addresses)
+        
+        for destination in self._streams:
+            destination.start(self._spawn)
+    
+    async def close(self):
+        for destination in self._streams:
+            await destination.stop()
+        for transport, _ in self._udp.values():
+            transport.close()
+        self._udp.clear()
+    
+    def send(self, frame: bytes):
+        """Hand one beat to every target; never blocks"""
+        for transport, addresses in self._udp.values():
+            if transport.get_write_buffer_size() > self.udp_buffer_limit:
+                self.udp_dropped += len(addresses)
+                self._count("heartbeat_send_dropped_total", "udp", len(addresses))
+                continue
+            for address in addresses:
+                transport.sendto(frame, address)
+        
+        for destination in self._streams:
+            destination.offer(frame)
+    
+    def status(self) -> Dict[str, Any]:
+        """Per-target state for health details"""
+        status: Dict[str, Any] = {
+            target: {"transport": "udp", "open": bool(self._udp)}
+            for target, _ in self._udp_targets
+        }
+        for destination in self._streams:
+            status[destination.target] = {
+                "transport": destination.scheme,
+                "connected": destination.connected,
+                "queued": destination.queued,
+                "dropped": destination.dropped,
+                "coalesced": destination.coalesced,
+            }
+        return status
+    
+    def _count(self, name: str, target: str, amount: int = 1):
+        if self._metrics is None:
+            return
+        key = (name, target)
+        counter = self._counters.get(key)
+        if counter is None:
+            counter = self._counters[key] = self._metrics.counter(name, {"target": target})
+        counter.inc(amount)
+
+
+class HeartbeatListener:
+    """
+    Receives beats on one udp://, tcp:// or unix:// address.
+    
+    Args:
+        listen: Address URL (see parse_target)
+        handler: Called as handler(beats, now) with the beats decoded in
+            one wake-up and the loop.time() they were read at
+        metrics: MetricsCollector for receive counters (optional)
+    """
+    
+    def __init__(self, listen: str, handler: BeatHandler, metrics=None):
+        self.listen = listen
+        self.scheme, self.address = parse_target(listen)
+        self._handler = handler
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._sock: Optional[socket.socket] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._connections: set = set()
+        
+        self.received = 0
+        self.invalid = 0
+        self._received_counter = metrics.counter("heartbeats_received_total") if metrics else None
+        self._invalid_counter = metrics.counter("heartbeats_invalid_total") if metrics else None
+    
+    @property
+    def bound_address(self) -> Any:
+        """Actual local address (resolves port 0)"""
+        if self._sock is not None:
+            return self._sock.getsockname()
+        if self._server is not None and self._server.sockets:
+            return self._server.sockets[0].getsockname()
+        return None
+    
+    async def open(self):
+        """Bind the socket; beats are not read until start()"""
+        self._loop = asyncio.get_running_loop()
+        
+        if self.scheme == "udp":
+            host, port = self.address
+            infos = await self._loop.getaddrinfo(host, port, type=socket.SOCK_DGRAM)
+            family, _, _, _, sockaddr = infos[0]
+            sock = socket.socket(family, socket.SOCK_DGRAM)
+            try:
+                # Capped by net.core.rmem_max; bursts beyond it are lost
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, UDP_RECEIVE_BUFFER)
+                sock.setblocking(False)
+                sock.bind(sockaddr)
+            except OSError:
+                sock.close()
+                raise
+            self._sock = sock
+        
+        elif self.scheme == "tcp":
+            host, port = self.address
+            self._server = await asyncio.start_server(
+                self._serve_stream, host, port, start_serving=False
+            )
+        
+        else:
+            if os.path.exists(self.address):
+                os.unlink(self.address)
+            self._server = await asyncio.start_unix_server(
+                self._serve_stream, self.address, start_serving=False
+            )
+    
+    async def start(self):
+        if self._sock is not None:
+            self._loop.add_reader(self._sock.fileno(), self._drain_datagrams)
+        elif self._server is not None:
+            await self._server.start_serving()
+    
+    async def close(self):
+        if self._sock is not None:
+            self._loop.remove_reader(self._sock.fileno())
+            self._sock.close()
+            self._sock = None
+        
+        if self._server is not None:
+            self._server.close()
+            for writer in list(self._connections):
+                writer.close()
+            await self._server.wait_closed()
+            self._server = None
+            if self.scheme == "unix" and os.path.exists(self.address):
+                os.unlink(self.address)
+    
+    def _drain_datagrams(self):
+        sock = self._sock
+        beats: List[Beat] = []
+        invalid = 0
+        
+        for _ in range(MAX_DATAGRAMS_PER_WAKEUP):
+            try:
+                data = sock.recv(65535)
+            except (BlockingIOError, InterruptedError):
+                break
+            except OSError as e:
+                logger.warning(f"Heartbeat listener {self.listen} receive failed: {e}")
+                break
+            
+            offset = 0
+            while offset < len(data):
+                beat, offset = decode_beat(data, offset)
+                if beat is None:
+                    invalid += 1
+                    break
+                beats.append(beat)
+        
+        self._dispatch(beats, invalid)
+    
+    async def _serve_stream(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._connections.add(writer)
+        buffer = b""
+        try:
+            while True:
+                chunk = await reader.read(65536)
+                if not chunk:
+                    break
+                buffer += chunk
+                
+                beats: List[Beat] = []
+                offset = 0
+                while True:
+                    beat, next_offset = decode_beat(buffer, offset)
+                    if beat is None:
+                        # Unchanged offset: incomplete frame, wait for more
+                        invalid = next_offset != offset
+                        break
+                    beats.append(beat)
+                    offset = next_offset
+                
+                self._dispatch(beats, int(invalid))
+                if invalid:
+                    # Framing is lost; drop the connection
+                    break
+                buffer = buffer[offset:]
+        
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._connections.discard(writer)
+            writer.close()
+    
+    def _dispatch(self, beats: List[Beat], invalid: int):
+        if invalid:
+            self.invalid += invalid
+            if self._invalid_counter:
+                self._invalid_counter.inc(invalid)
+        if not beats:
+            return
+        
+        self.received += len(beats)
+        if self._received_counter:
+            self._received_counter.inc(len(beats))
+        try:
+            self._handler(beats, self._loop.time())
+        except Exception as e:
+            logger.error(f"Heartbeat handler failed: {e}", exc_info=True)